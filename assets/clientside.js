@@ -0,0 +1,94 @@
+/*
+ * Clientside callbacks for the PSE calculator (see ClientsideFunction(namespace='pse')).
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    pse: {
+        /*
+         * Orifice inputs: enables the area or diameter input, converts between
+         * them, and applies the reverse solution for the selected target tier
+         * and units. The solution (from calculate_reverse_area) holds every tier
+         * in every unit, so tier and unit switches are lookups.
+         */
+        orifice: function (inputType, diameter, diameterUnit, area, areaUnit, solution, targetTier,
+                           scales, ...scenario) {
+            const noUpdate = window.dash_clientside.no_update;
+            const triggered = (window.dash_clientside.callback_context.triggered || [])
+                .map(function (t) { return t.prop_id.split('.')[0]; });
+            const byArea = inputType !== 'diameter';
+            const round4 = function (value) { return Math.round(value * 1e4) / 1e4; };
+            let newArea = noUpdate;
+            let newDiameter = noUpdate;
+
+            // A solution only applies to the scenario it was solved for
+            const current = solution && JSON.stringify(solution.inputs) === JSON.stringify(scenario)
+                ? solution.tiers[targetTier] : null;
+            // True while the fields still show a solved value rather than a typed one
+            const showsSolution = current && Object.values(solution.tiers).some(function (tier) {
+                return Object.values(tier.area).some(function (v) { return round4(v) === area; }) ||
+                    Object.values(tier.diameter).some(function (v) { return round4(v) === diameter; });
+            });
+            const solved = triggered.includes('reverse-solution-store') ||
+                triggered.includes('target-tier-dropdown') ||
+                ((triggered.includes('area-unit') || triggered.includes('diameter-unit')) && showsSolution);
+
+            if (solved && current && current.area[areaUnit] !== undefined &&
+                    current.diameter[diameterUnit] !== undefined) {
+                newArea = round4(current.area[areaUnit]);
+                newDiameter = round4(current.diameter[diameterUnit]);
+            } else if ((triggered.includes('diameter') || triggered.includes('diameter-unit')) && !byArea) {
+                if (diameter !== null && diameter > 0) {
+                    const diameterM = diameter * scales.length[diameterUnit];
+                    newArea = round4(Math.PI * Math.pow(diameterM / 2, 2) / scales.area[areaUnit]);
+                }
+            } else if ((triggered.includes('area') || triggered.includes('area-unit')) && byArea) {
+                if (area !== null && area > 0) {
+                    const areaM2 = area * scales.area[areaUnit];
+                    newDiameter = round4(2 * Math.sqrt(areaM2 / Math.PI) / scales.length[diameterUnit]);
+                }
+            }
+            return [!byArea, !byArea, byArea, byArea, newArea, newDiameter];
+        },
+
+        /*
+         * Live mode: resolves to the scenario once the inputs have been still
+         * for the debounce delay. Every edit supersedes the pending one, so a
+         * burst of keystrokes sends a single request.
+         */
+        liveRequest: function (live, ...args) {
+            const dc = window.dash_clientside;
+            const delay = args.pop();
+            const token = (dc.pse._liveToken || 0) + 1;
+            dc.pse._liveToken = token;
+            if (!live) {
+                return null;
+            }
+            const switchedOn = (dc.callback_context.triggered || [])
+                .some(function (t) { return t.prop_id === 'live-mode.checked'; });
+            return new Promise(function (resolve) {
+                setTimeout(function () {
+                    resolve(dc.pse._liveToken === token ? args : dc.no_update);
+                }, switchedOn ? 0 : delay);
+            });
+        },
+
+        /*
+         * Results panel: maps the results display ({component id: {prop: value}})
+         * onto the callback's targeted outputs, leaving every prop that is
+         * unchanged since the last update untouched. The first call sees the
+         * panel as rendered by the layout.
+         */
+        results: function (display) {
+            const dc = window.dash_clientside;
+            const applied = dc.pse._resultsApplied;
+            dc.pse._resultsApplied = display;
+            return dc.callback_context.outputs_list.map(function (output) {
+                const value = (display[output.id] || {})[output.property];
+                if (!applied || value === undefined ||
+                        JSON.stringify((applied[output.id] || {})[output.property]) === JSON.stringify(value)) {
+                    return dc.no_update;
+                }
+                return value;
+            });
+        }
+    }
+});
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Async (ASGI) calculation API for integrations that send many small requests.
+
+    POST /api/v1/calculate   one scenario            -> {"scenario", "inputs", "results"}
+    POST /api/v1/batch       {"scenarios": [...]}    -> {"results": [...]}
+    GET  /api/v1/health
+
+Scenarios use the saved-calculation input fields (gas, release_type, site, p0,
+p0_unit, p2, p2_unit, t0, t0_unit, area, area_unit, duration, duration_unit, cd)
+and results are those of calculation_store.compute_results.
+
+Concurrent /calculate requests are coalesced into one vectorized
+compute_results call every few milliseconds, so thousands of in-flight
+requests cost a handful of numpy passes. Nothing is computed on the event
+loop: coalesced calculations and small batches run in a thread pool, large
+batches in a (spawned) process pool.
+
+Every scenario is checked before it is queued: a known gas, units of the right
+dimension, finite numbers, positive area, duration, Cd and temperature, and P0
+above P2. /calculate answers 422 for a bad scenario; /batch reports it as that
+row's {"error": "Invalid inputs", "detail": ...} and calculates the rest. A
+calculation with non-finite results is an error, never bare NaN, and an
+unexpected failure is a JSON 500.
+
+`application` is a plain ASGI app with no dependencies. When asgiref is
+installed, every other path is passed to the Dash server, so one process can
+serve both:
+
+    uvicorn async_api:application --port 8053
+    gunicorn -k uvicorn.workers.UvicornWorker async_api:application
+
+Deployed as its own service (the `api` process in the Procfile and
+render.yaml) with PSE_API_ONLY=1, beside the gunicorn Dash server.
+"""
+
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from calculation_store import (
+    NUMERIC_INPUTS, RESULT_FIELDS, TEXT_INPUTS, UNIT_INPUTS, compute_results, normalize_record,
+)
+from pse_engine import gas_data
+from unit_conversions import UNIT_ALIASES, UNIT_DIMENSION, to_si
+
+API_PREFIX = '/api/v1'
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+MAX_BATCH_SIZE = 200_000
+
+# Batches at least this large run in the process pool
+EXECUTOR_MIN_BATCH = 2_000
+
+# Coalescing window and size limit for single calculations
+BATCH_WINDOW_SECONDS = 0.002
+MAX_COALESCED = 4096
+
+REQUIRED_FIELDS = TEXT_INPUTS + NUMERIC_INPUTS + UNIT_INPUTS + ['cd']
+
+# Dimension of each numeric input's unit
+INPUT_DIMENSIONS = {'p0': 'pressure', 'p2': 'pressure', 't0': 'temperature', 'area': 'area', 'duration': 'time'}
+
+_executor = None
+_thread_executor = None
+
+
+class ApiError(Exception):
+    """Request error reported to the client as JSON with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+def executor():
+    """Process pool for large batches, created on first use"""
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that already runs event-loop and pool threads is unsafe
+        _executor = ProcessPoolExecutor(max_workers=int(os.environ.get('PSE_API_PROCESSES', os.cpu_count() or 1)),
+                                        mp_context=multiprocessing.get_context('spawn'))
+    return _executor
+
+
+def thread_executor():
+    """Thread pool for coalesced calculations and small batches, created on first use"""
+    global _thread_executor
+    if _thread_executor is None:
+        _thread_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('PSE_API_THREADS', 4)))
+    return _thread_executor
+
+
+def _number(value):
+    """Finite float of a JSON number or numeric string, else None"""
+    if isinstance(value, bool):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def scenario_error(scenario):
+    """Why a scenario cannot be calculated, or None when its inputs are usable"""
+    if not isinstance(scenario, dict):
+        return "Each scenario must be a JSON object"
+    missing = [field for field in REQUIRED_FIELDS if scenario.get(field) in (None, '')]
+    if missing:
+        return f"Missing fields: {', '.join(missing)}"
+    if not all(isinstance(scenario[field], str) for field in TEXT_INPUTS):
+        return f"{', '.join(TEXT_INPUTS)} must be strings"
+    if scenario['gas'] not in gas_data:
+        return f"Unknown gas: {scenario['gas']}"
+    si = {}
+    for key, dimension in INPUT_DIMENSIONS.items():
+        unit = scenario[f'{key}_unit']
+        unit = UNIT_ALIASES.get(unit, unit) if isinstance(unit, str) else None
+        if UNIT_DIMENSION.get(unit) != dimension:
+            return f"{key}_unit must be a {dimension} unit"
+        value = _number(scenario[key])
+        if value is None:
+            return f"{key} must be a finite number"
+        si[key] = float(to_si(value, unit))
+    cd = _number(scenario['cd'])
+    if cd is None or cd <= 0:
+        return "cd must be a positive number"
+    for key, label in (('area', "area"), ('duration', "duration"), ('t0', "absolute temperature"),
+                       ('p2', "absolute P2")):
+        if si[key] <= 0:
+            return f"{label} must be positive"
+    if not si['p0'] > si['p2']:
+        return "P0 must be greater than P2"
+    return None
+
+
+def validate_scenario(scenario):
+    """Normalized record for one scenario; raises ApiError when its inputs are unusable"""
+    error = scenario_error(scenario)
+    if error:
+        raise ApiError(422 if isinstance(scenario, dict) else 400, error)
+    return normalize_record(scenario)
+
+
+def checked_results(results):
+    """Results unchanged, or an error when any result is not a finite number"""
+    if 'error' in results or all(math.isfinite(results[field]) for field in RESULT_FIELDS):
+        return results
+    return {'engine_version': results.get('engine_version'), 'error': "Calculation did not give finite results"}
+
+
+def scenario_response(record, results):
+    """Response body for one calculated scenario"""
+    inputs = {key: record[key] for key in REQUIRED_FIELDS}
+    return {'scenario': record['scenario'], 'inputs': inputs, 'results': results}
+
+
+def calculate_batch(scenarios):
+    """Validate and calculate a list of scenarios; runs in the thread or process pool.
+
+    Invalid scenarios get an 'Invalid inputs' error in their own row.
+    """
+    responses = [None] * len(scenarios)
+    rows, records = [], []
+    for i, scenario in enumerate(scenarios):
+        error = scenario_error(scenario)
+        if error:
+            responses[i] = {'scenario': None, 'results': {'error': "Invalid inputs", 'detail': error}}
+        else:
+            rows.append(i)
+            records.append(normalize_record(scenario))
+    for i, record, result in zip(rows, records, compute_results(records)):
+        responses[i] = scenario_response(record, checked_results(result))
+    return responses
+
+
+class CalculationBatcher:
+    """Coalesces concurrent single calculations into one compute_results call"""
+
+    def __init__(self, window=BATCH_WINDOW_SECONDS, max_size=MAX_COALESCED):
+        self.window = window
+        self.max_size = max_size
+        self.pending = []
+        self.flush_handle = None
+        self.tasks = set()
+
+    async def calculate(self, record):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((record, future))
+        if len(self.pending) >= self.max_size:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(self.window, self.flush)
+        return await future
+
+    def flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        task = asyncio.get_running_loop().create_task(self.compute(pending))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def compute(self, pending):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(thread_executor(), compute_results,
+                                                 [record for record, _ in pending])
+        except Exception:
+            # Recalculate one by one, so a failure reaches only its own request
+            for record, future in pending:
+                try:
+                    result = (await loop.run_in_executor(thread_executor(), compute_results, [record]))[0]
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+
+_batcher = CalculationBatcher()
+
+
+async def handle_calculate(payload):
+    record = validate_scenario(payload)
+    results = checked_results(await _batcher.calculate(record))
+    if 'error' in results:
+        raise ApiError(422, results['error'])
+    return 200, scenario_response(record, results)
+
+
+async def handle_batch(payload):
+    scenarios = payload.get('scenarios') if isinstance(payload, dict) else None
+    if not isinstance(scenarios, list):
+        raise ApiError(400, "Expected {\"scenarios\": [...]}")
+    if len(scenarios) > MAX_BATCH_SIZE:
+        raise ApiError(413, f"At most {MAX_BATCH_SIZE} scenarios per batch")
+    pool = executor() if len(scenarios) >= EXECUTOR_MIN_BATCH else thread_executor()
+    results = await asyncio.get_running_loop().run_in_executor(pool, calculate_batch, scenarios)
+    return 200, {'results': results}
+
+
+async def handle_health(payload):
+    return 200, {'status': 'ok'}
+
+
+ROUTES = {
+    ('POST', f'{API_PREFIX}/calculate'): handle_calculate,
+    ('POST', f'{API_PREFIX}/batch'): handle_batch,
+    ('GET', f'{API_PREFIX}/health'): handle_health,
+}
+
+
+async def read_body(receive):
+    """Request body bytes, limited to MAX_BODY_BYTES"""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise ApiError(400, "Client disconnected")
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise ApiError(413, "Request body too large")
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def send_json(send, status, body):
+    try:
+        payload = json.dumps(body, separators=(',', ':'), allow_nan=False).encode()
+    except ValueError:
+        status, payload = 500, b'{"error":"Response contained a non-finite number"}'
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(payload)).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': payload})
+
+
+async def api(scope, receive, send):
+    """ASGI app serving the /api/v1 routes"""
+    handler = ROUTES.get((scope['method'], scope['path']))
+    try:
+        if handler is None:
+            known_path = any(path == scope['path'] for _, path in ROUTES)
+            raise ApiError(405 if known_path else 404, "Method not allowed" if known_path else "Not found")
+        payload = None
+        if scope['method'] == 'POST':
+            try:
+                payload = json.loads(await read_body(receive) or b'null')
+            except ValueError:
+                raise ApiError(400, "Request body is not valid JSON")
+        status, body = await handler(payload)
+    except ApiError as e:
+        status, body = e.status, {'error': e.message}
+    except Exception:
+        print(f"Error handling {scope['method']} {scope['path']}:\n{traceback.format_exc()}")
+        status, body = 500, {'error': "Internal server error"}
+    await send_json(send, status, body)
+
+
+async def lifespan(scope, receive, send):
+    """ASGI lifespan: shut the pools down with the server"""
+    global _executor, _thread_executor
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if _executor is not None:
+                _executor.shutdown(cancel_futures=True)
+                _executor = None
+            if _thread_executor is not None:
+                _thread_executor.shutdown(cancel_futures=True)
+                _thread_executor = None
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+def create_application(mount_dash=True):
+    """ASGI app: the API, plus the Dash server for other paths when asgiref is available"""
+    fallback = None
+    if mount_dash:
+        try:
+            from asgiref.wsgi import WsgiToAsgi
+        except ImportError:
+            print("asgiref is not installed; serving the API only")
+        else:
+            from pse_calculator_enbridge import server
+            fallback = WsgiToAsgi(server)
+
+    async def application(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await lifespan(scope, receive, send)
+        elif scope['type'] == 'http' and (scope['path'].startswith(API_PREFIX + '/') or fallback is None):
+            await api(scope, receive, send)
+        elif fallback is not None:
+            await fallback(scope, receive, send)
+
+    return application
+
+
+application = create_application(mount_dash=os.environ.get('PSE_API_ONLY', '').lower() not in ('1', 'true', 'on'))
+
+
+if __name__ == "__main__":
+    try:
+        import uvicorn
+    except ImportError:
+        print("Install uvicorn to run the async API: pip install uvicorn")
+    else:
+        uvicorn.run(application, host='0.0.0.0', port=int(os.environ.get('PORT', 8053)))
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Persistence for saved calculations, with cached results.
+
+Each saved record carries a 'results' dict computed by the engine and stamped
+with engine_version(). The stamp changes whenever the physics (ENGINE_VERSION),
+gas data or tier thresholds change, and recalculate_all() then recomputes every
+stale record in one vectorized batch.
+
+Records are content-addressed on disk: each distinct set of normalized inputs
+is stored once as a scenario (inputs + results) under its hash, and every saved
+calculation is a small metadata entry pointing at a scenario. Duplicate saves
+share one scenario and one computed result:
+
+    {"format": 2,
+     "sequence": 17,
+     "scenarios": {"<hash>": {"inputs": {...}, "results": {...}}},
+     "entries": [{"id": ..., "timestamp": ..., "user_name": ...,
+                  "calculation_title": ..., "scenario": "<hash>",
+                  "sequence": 15, "updated_at": "2025-07-04T21:46:27.048213Z"}],
+     "deleted": [{"id": ..., "sequence": 17, "updated_at": ...}]}
+
+Every save compares the new entries with the file on disk: added or changed
+entries (metadata, inputs or recomputed results) take the next value of the
+store's sequence counter and a UTC updated_at, and removed entries are kept as
+tombstones in 'deleted'. Export loaders use these as a change feed
+(see gas_loss_export.py); the sequence is the authoritative resume key.
+
+Writes hold an exclusive lock on CALCULATIONS_FILE + '.lock' (fcntl, where
+available) from reading the document on disk to replacing the file, so
+concurrent workers never interleave. The app saves through
+update_calculations_file, which merges one session's additions and deletions
+into the file on disk: entries saved meanwhile by other sessions are kept, not
+turned into tombstones. save_calculations_to_file replaces the whole store.
+
+Loads are read-only: stale results are recomputed in memory. The export feed
+calls refresh_store, which stamps a store that has no stamps yet and writes
+back results recomputed for a new engine version, once, so they get fresh
+sequence numbers.
+
+In memory (and in the calculations-store) records stay flat, with the scenario
+hash in 'scenario'. Legacy list-format files are still read.
+
+Run as a script to recalculate the whole store:
+    python calculation_store.py [--force]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import numpy as np
+
+from unit_conversions import UNIT_ALIASES, UNIT_DIMENSION, to_si_many
+from pse_engine import gas_data, gas_table, mass_flow_rate_batch, convert_flow_all_units
+from tier_classification import CRITERIA_UNITS, TIER_LABELS, TIER_THRESHOLDS_FILE, classify_tiers
+
+# File path for persistent storage
+CALCULATIONS_FILE = 'saved_calculations.json'
+
+# Bump when the flow equations or result fields change
+ENGINE_VERSION = 2
+
+STORE_FORMAT = 2
+
+# Per-entry metadata; everything else in a record belongs to its scenario
+METADATA_FIELDS = ['id', 'timestamp', 'user_name', 'calculation_title']
+
+# Scenario inputs, split by how they are normalized before hashing
+TEXT_INPUTS = ['gas', 'release_type', 'site']
+NUMERIC_INPUTS = ['p0', 'p2', 't0', 'area', 'duration']
+UNIT_INPUTS = ['p0_unit', 'p2_unit', 't0_unit', 'area_unit', 'duration_unit']
+
+# Numeric fields copied from convert_flow_all_units into each record's results
+RESULT_FIELDS = [
+    'flow_kgs', 'flow_lbs', 'flow_mscf', 'flow_stm3',
+    'total_kg', 'total_lb', 'total_mscf', 'total_stm3',
+]
+
+
+@lru_cache(maxsize=None)
+def engine_version():
+    """Version stamp covering the physics, gas data and tier thresholds"""
+    with open(TIER_THRESHOLDS_FILE, 'rb') as f:
+        thresholds = f.read()
+    digest = hashlib.sha1()
+    digest.update(json.dumps(gas_data, sort_keys=True).encode())
+    digest.update(thresholds)
+    return f"{ENGINE_VERSION}-{digest.hexdigest()[:12]}"
+
+
+def _numeric_column(records, key):
+    """Float array of a record field; NaN where missing or not numeric"""
+    values = np.empty(len(records), dtype=float)
+    for i, record in enumerate(records):
+        try:
+            values[i] = float(record.get(key))
+        except (TypeError, ValueError):
+            values[i] = np.nan
+    return values
+
+
+def _unit_column(records, key, dimension):
+    """Canonical unit names for a record field, and a mask of rows with a valid unit"""
+    units = [UNIT_ALIASES.get(record.get(key), record.get(key)) for record in records]
+    valid = np.array([UNIT_DIMENSION.get(unit) == dimension for unit in units], dtype=bool)
+    # Placeholder for invalid rows so the vectorized conversion can still run
+    fallback = next(iter(u for u, ok in zip(units, valid) if ok), None)
+    return [unit if ok else fallback for unit, ok in zip(units, valid)], valid
+
+
+def compute_results(records):
+    """Compute results for a list of saved records in one vectorized batch"""
+    n = len(records)
+    if n == 0:
+        return []
+
+    valid = np.ones(n, dtype=bool)
+    si = {}
+    for key, dimension in (('p0', 'pressure'), ('p2', 'pressure'), ('t0', 'temperature'),
+                           ('area', 'area'), ('duration', 'time')):
+        values = _numeric_column(records, key)
+        units, units_ok = _unit_column(records, f'{key}_unit', dimension)
+        valid &= units_ok & np.isfinite(values)
+        si[key] = to_si_many(np.where(units_ok, values, np.nan), units) if units_ok.any() else values
+
+    cd = _numeric_column(records, 'cd')
+    gases = [record.get('gas') for record in records]
+    known_gas = np.array([gas in gas_data for gas in gases], dtype=bool)
+    valid &= known_gas & np.isfinite(cd)
+
+    version = engine_version()
+    results = [{'engine_version': version, 'error': 'Invalid inputs'} for _ in range(n)]
+    rows = np.flatnonzero(valid)
+    if rows.size == 0:
+        return results
+
+    row_gases = [gases[i] for i in rows]
+    table = gas_table()
+    gas_idx = np.fromiter((table['index'][g] for g in row_gases), dtype=np.intp, count=rows.size)
+    gamma = table['gamma'][gas_idx]
+    P0, P2 = si['p0'][rows], si['p2'][rows]
+    duration_seconds = si['duration'][rows]
+
+    mdot = mass_flow_rate_batch(cd[rows], si['area'][rows], P0, P2, si['t0'][rows],
+                                gamma, table['R'][gas_idx])
+    outputs = convert_flow_all_units(mdot, row_gases, duration_seconds)
+    choked = P2 / P0 <= table['critical_ratio'][gas_idx]
+    tiers, criteria = classify_tiers(
+        outputs, duration_seconds,
+        np.array([records[i].get('site', '') for i in rows], dtype=str),
+        np.array([records[i].get('release_type', '') for i in rows], dtype=str),
+        table['fluid_class'][gas_idx],
+    )
+
+    columns = {field: outputs[field].tolist() for field in RESULT_FIELDS}
+    choked = choked.tolist()
+    tiers = tiers.tolist()
+    criteria = criteria.tolist()
+    for k, i in enumerate(rows.tolist()):
+        result = {'engine_version': version}
+        for field in RESULT_FIELDS:
+            result[field] = columns[field][k]
+        result['flow_status'] = "SONIC (CHOKED)" if choked[k] else "SUBSONIC"
+        result['release_tier'] = TIER_LABELS[tiers[k]]
+        # Unit of the threshold that set the tier (m³, MSCF or kg); None below every threshold
+        result['tier_criterion'] = CRITERIA_UNITS[criteria[k]] if criteria[k] >= 0 else None
+        results[i] = result
+    return results
+
+
+def normalize_inputs(record):
+    """Canonical scenario inputs of a record: floats for numbers, canonical unit names"""
+    inputs = {}
+    for key in TEXT_INPUTS:
+        inputs[key] = record.get(key)
+    for key in NUMERIC_INPUTS:
+        value = record.get(key)
+        try:
+            inputs[key] = float(value)
+        except (TypeError, ValueError):
+            inputs[key] = value
+    for key in UNIT_INPUTS:
+        unit = record.get(key)
+        inputs[key] = UNIT_ALIASES.get(unit, unit)
+    # The Cd dropdown value is a string, so keep it one
+    try:
+        inputs['cd'] = str(float(record.get('cd')))
+    except (TypeError, ValueError):
+        inputs['cd'] = record.get('cd')
+    return inputs
+
+
+def scenario_hash(inputs):
+    """Content hash of normalized scenario inputs"""
+    payload = json.dumps(inputs, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def normalize_record(record):
+    """Flat record with normalized inputs and its scenario hash"""
+    inputs = normalize_inputs(record)
+    normalized = {key: record.get(key) for key in METADATA_FIELDS}
+    normalized.update(inputs)
+    normalized['scenario'] = scenario_hash(inputs)
+    if 'results' in record:
+        normalized['results'] = record['results']
+    return normalized
+
+
+def is_stale(record):
+    """True when a record has no results or was computed by another engine version"""
+    results = record.get('results')
+    return not results or results.get('engine_version') != engine_version()
+
+
+def recalculate_all(records, force=False):
+    """Recompute results for stale records (or every record when force is set).
+
+    Records sharing a scenario hash are computed once and share the result dict.
+    Returns (records, number of records updated). Records are updated in place.
+    """
+    targets = [record for record in records if force or is_stale(record)]
+    # Prefer results already fresh for the same scenario, then compute each remaining scenario once
+    cache = {} if force else {
+        record['scenario']: record['results'] for record in records
+        if 'scenario' in record and not is_stale(record)
+    }
+    pending = {}
+    for record in targets:
+        key = record.get('scenario') or scenario_hash(normalize_inputs(record))
+        if key not in cache:
+            pending.setdefault(key, record)
+    for key, results in zip(pending, compute_results(list(pending.values()))):
+        cache[key] = results
+    for record in targets:
+        record['results'] = cache[record.get('scenario') or scenario_hash(normalize_inputs(record))]
+    return records, len(targets)
+
+
+def with_results(record, records=()):
+    """Normalize a new record and attach its results, reusing those of a stored duplicate"""
+    record = normalize_record(record)
+    for existing in records:
+        if existing.get('scenario') == record['scenario'] and not is_stale(existing):
+            record['results'] = existing['results']
+            return record
+    record['results'] = compute_results([record])[0]
+    return record
+
+
+def pack_store(records):
+    """Content-addressed file document from flat records"""
+    scenarios = {}
+    entries = []
+    for record in records:
+        if 'scenario' not in record:
+            record = normalize_record(record)
+        key = record['scenario']
+        if key not in scenarios:
+            scenarios[key] = {'inputs': normalize_inputs(record)}
+            if record.get('results'):
+                scenarios[key]['results'] = record['results']
+        entry = {field: record.get(field) for field in METADATA_FIELDS}
+        entry['scenario'] = key
+        entries.append(entry)
+    return {'format': STORE_FORMAT, 'scenarios': scenarios, 'entries': entries}
+
+
+def unpack_store(document):
+    """Flat records from a file document; accepts the legacy list format"""
+    if isinstance(document, list):
+        return [normalize_record(record) for record in document]
+    scenarios = document.get('scenarios', {})
+    records = []
+    for entry in document.get('entries', []):
+        scenario = scenarios.get(entry.get('scenario'), {})
+        record = dict(entry)
+        record.update(scenario.get('inputs', {}))
+        if 'results' in scenario:
+            # Shared with every other entry of the same scenario
+            record['results'] = scenario['results']
+        records.append(record)
+    return records
+
+
+def _entry_state(entry, scenarios):
+    """What a change to an entry is detected on: metadata, scenario and engine version"""
+    results = scenarios.get(entry.get('scenario'), {}).get('results') or {}
+    return [entry.get(field) for field in METADATA_FIELDS] + [entry.get('scenario'), results.get('engine_version')]
+
+
+def utc_now():
+    """Current UTC time as the ISO 8601 string (microseconds) used for updated_at"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def parse_utc(value):
+    """Aware datetime of an ISO 8601 time, read as UTC when it has no offset; raises ValueError"""
+    stamp = datetime.fromisoformat(value)
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return stamp
+
+
+def stamp_changes(document, previous=None):
+    """Assign sequence numbers and updated_at to entries changed since the previous document.
+
+    Unchanged entries keep their stamps; entries missing from document become
+    tombstones in 'deleted'. Returns document, updated in place.
+    """
+    if not isinstance(previous, dict):
+        previous = {}
+    sequence = previous.get('sequence', 0)
+    now = utc_now()
+    old_scenarios = previous.get('scenarios', {})
+    old_entries = {entry.get('id'): entry for entry in previous.get('entries', [])}
+    current_ids = set()
+    for entry in document['entries']:
+        current_ids.add(entry.get('id'))
+        old = old_entries.get(entry.get('id'))
+        if (old is not None and 'sequence' in old
+                and _entry_state(old, old_scenarios) == _entry_state(entry, document['scenarios'])):
+            entry['sequence'] = old['sequence']
+            entry['updated_at'] = old['updated_at']
+        else:
+            sequence += 1
+            entry['sequence'] = sequence
+            entry['updated_at'] = now
+    # Tombstones: earlier ones for ids not saved again, then entries removed by this save
+    deleted = [tomb for tomb in previous.get('deleted', []) if tomb.get('id') not in current_ids]
+    for entry_id, old in old_entries.items():
+        if entry_id not in current_ids:
+            sequence += 1
+            deleted.append({'id': entry_id, 'sequence': sequence, 'updated_at': now})
+    document['sequence'] = sequence
+    document['deleted'] = deleted
+    return document
+
+
+def is_stamped(document):
+    """True for a store document that carries change-feed sequence numbers"""
+    return isinstance(document, dict) and 'sequence' in document
+
+
+def read_store_document():
+    """The raw file document, or None when there is no readable store"""
+    try:
+        with open(CALCULATIONS_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@contextmanager
+def store_lock():
+    """Exclusive lock on the store across processes and threads (a no-op without fcntl)"""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{CALCULATIONS_FILE}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# Utility functions for data persistence
+def load_calculations_from_file():
+    """Load calculations from JSON file, refreshing stale results in memory only"""
+    try:
+        if os.path.exists(CALCULATIONS_FILE):
+            with open(CALCULATIONS_FILE, 'r') as f:
+                document = json.load(f)
+            data, _ = recalculate_all(unpack_store(document))
+            return data
+        return []
+    except Exception as e:
+        print(f"Error loading calculations: {e}")
+        return []
+
+
+def _write_document(document):
+    """Atomically replace the store file with document; the caller holds store_lock()"""
+    # Write a private temp file then rename, so readers never see a half-written file
+    fd, temp_file = tempfile.mkstemp(prefix=f"{os.path.basename(CALCULATIONS_FILE)}.", suffix='.tmp',
+                                     dir=os.path.dirname(os.path.abspath(CALCULATIONS_FILE)))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(document, f, indent=2)
+        os.chmod(temp_file, 0o644)
+        os.replace(temp_file, CALCULATIONS_FILE)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+
+
+def save_calculations_to_file(data):
+    """Replace the store with data in content-addressed form, stamping changed entries"""
+    try:
+        with store_lock():
+            _write_document(stamp_changes(pack_store(data), read_store_document()))
+        return True
+    except Exception as e:
+        print(f"Error saving calculations: {e}")
+        return False
+
+
+def update_calculations_file(added=(), deleted_ids=()):
+    """Merge added records and deleted ids into the store on disk.
+
+    Returns the merged records (with their change stamps), or None when the
+    file could not be written.
+    """
+    try:
+        with store_lock():
+            previous = read_store_document()
+            records, _ = recalculate_all(unpack_store(previous or []))
+            deleted_ids = set(deleted_ids)
+            known_ids = {record.get('id') for record in records}
+            records = ([record for record in records if record.get('id') not in deleted_ids]
+                       + [record for record in added if record.get('id') not in known_ids])
+            document = stamp_changes(pack_store(records), previous)
+            _write_document(document)
+        return unpack_store(document)
+    except Exception as e:
+        print(f"Error saving calculations: {e}")
+        return None
+
+
+def refresh_store(force=False):
+    """Stamp and recalculate the store on disk if needed.
+
+    Returns (document, number of records recalculated); document is None when
+    there is no readable store.
+
+    Writes only when the store has no change stamps or holds stale results
+    (every result with force), so repeated calls leave the file alone.
+    """
+    with store_lock():
+        document = read_store_document()
+        if document is None:
+            return None, 0
+        records, updated = recalculate_all(unpack_store(document), force=force)
+        if updated or not is_stamped(document):
+            document = stamp_changes(pack_store(records), document)
+            _write_document(document)
+        return document, updated
+
+
+if __name__ == "__main__":
+    force = '--force' in sys.argv[1:]
+    document, updated = refresh_store(force=force)
+    if document is None:
+        sys.exit(f"No readable store at {CALCULATIONS_FILE}")
+    records = unpack_store(document)
+    print(f"Recalculated {updated} of {len(records)} saved calculations (engine {engine_version()})")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Per-callback latency and payload-size instrumentation for the Dash app.
+
+instrument_callbacks(app) must run before any @app.callback is declared. It wraps
+every server-side callback to record wall time and error counts, and hooks the
+Flask app to record request/response bytes of each /_dash-update-component call.
+
+Metrics are served in Prometheus text format at /metrics, and each callback
+request is logged as one JSON line on the 'pse.callbacks' logger (INFO level).
+Set PSE_CALLBACK_METRICS=0 to disable the instrumentation entirely.
+
+Counters live in each worker process, so every series carries the worker's
+pid label and a scrape returns the numbers of the worker that served it.
+Each pid series is a valid counter on its own; aggregate across workers
+with sum by (callback), or run one worker (WEB_CONCURRENCY=1) for complete
+numbers on every scrape. /metrics requires 'Authorization: Bearer
+<PSE_METRICS_TOKEN>' when that variable is set, and is served only to
+loopback clients otherwise.
+
+Counters are shared by every thread of a worker, so updates and the /metrics
+snapshot hold one module lock.
+"""
+
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+import flask
+from dash.exceptions import PreventUpdate
+
+logger = logging.getLogger('pse.callbacks')
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Guards _stats and every CallbackStats counter
+_lock = threading.Lock()
+_stats = {}
+
+
+class CallbackStats:
+    """Counters for one callback"""
+    __slots__ = ('calls', 'errors', 'prevented', 'seconds_sum', 'buckets',
+                 'requests', 'input_bytes_sum', 'output_bytes_sum', 'output_bytes_max')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.prevented = 0
+        self.seconds_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.requests = 0
+        self.input_bytes_sum = 0
+        self.output_bytes_sum = 0
+        self.output_bytes_max = 0
+
+
+def metrics_enabled():
+    """Instrumentation is on unless PSE_CALLBACK_METRICS is 0/false/off"""
+    return os.environ.get('PSE_CALLBACK_METRICS', '1').lower() not in ('0', 'false', 'off')
+
+
+def metrics_authorized(request):
+    """True for a scrape with the PSE_METRICS_TOKEN bearer token, or from loopback when none is set"""
+    token = os.environ.get('PSE_METRICS_TOKEN')
+    if token:
+        return hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+
+def _get_stats(name):
+    stats = _stats.get(name)
+    if stats is None:
+        with _lock:
+            stats = _stats.setdefault(name, CallbackStats())
+    return stats
+
+
+def _timed(func, name):
+    """Wrap a callback function to record its latency and outcome"""
+    stats = _get_stats(name)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except PreventUpdate:
+            with _lock:
+                stats.prevented += 1
+            raise
+        except Exception:
+            with _lock:
+                stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            # Picked up by _record_payload once the response is serialized
+            flask.g.pse_callback = (name, elapsed)
+            bucket = bisect_left(LATENCY_BUCKETS, elapsed)
+            with _lock:
+                stats.calls += 1
+                stats.seconds_sum += elapsed
+                stats.buckets[bucket] += 1
+
+    return wrapper
+
+
+def _record_payload(response):
+    """Flask after_request hook: attribute payload sizes to the callback that ran"""
+    recorded = getattr(flask.g, 'pse_callback', None)
+    if recorded is None:
+        return response
+    name, seconds = recorded
+    stats = _get_stats(name)
+    input_bytes = flask.request.content_length or 0
+    output_bytes = response.calculate_content_length() or 0
+    with _lock:
+        stats.requests += 1
+        stats.input_bytes_sum += input_bytes
+        stats.output_bytes_sum += output_bytes
+        if output_bytes > stats.output_bytes_max:
+            stats.output_bytes_max = output_bytes
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({
+            'event': 'callback',
+            'callback': name,
+            'seconds': round(seconds, 6),
+            'status': response.status_code,
+            'input_bytes': input_bytes,
+            'output_bytes': output_bytes,
+        }))
+    return response
+
+
+def render_prometheus():
+    """All callback metrics in Prometheus text exposition format"""
+    with _lock:
+        return _render_prometheus()
+
+
+def _render_prometheus():
+    pid = os.getpid()
+    lines = [
+        '# HELP pse_callback_duration_seconds Wall time spent in Dash callback functions.',
+        '# TYPE pse_callback_duration_seconds histogram',
+    ]
+    snapshot = sorted(_stats.items())
+    labels = {name: f'callback="{name}",pid="{pid}"' for name, _ in snapshot}
+    for name, stats in snapshot:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+            cumulative += count
+            lines.append(f'pse_callback_duration_seconds_bucket{{{labels[name]},le="{bound}"}} {cumulative}')
+        lines.append(f'pse_callback_duration_seconds_bucket{{{labels[name]},le="+Inf"}} {stats.calls}')
+        lines.append(f'pse_callback_duration_seconds_sum{{{labels[name]}}} {stats.seconds_sum:.9f}')
+        lines.append(f'pse_callback_duration_seconds_count{{{labels[name]}}} {stats.calls}')
+
+    counters = (
+        ('pse_callback_errors_total', 'Callback invocations that raised an exception.', 'errors'),
+        ('pse_callback_prevented_total', 'Callback invocations that raised PreventUpdate.', 'prevented'),
+        ('pse_callback_requests_total', 'Callback HTTP requests with recorded payload sizes.', 'requests'),
+        ('pse_callback_input_bytes_total', 'Serialized callback request bytes.', 'input_bytes_sum'),
+        ('pse_callback_output_bytes_total', 'Serialized callback response bytes.', 'output_bytes_sum'),
+    )
+    for metric, help_text, field in counters:
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} counter')
+        for name, stats in snapshot:
+            lines.append(f'{metric}{{{labels[name]}}} {getattr(stats, field)}')
+
+    lines.append('# HELP pse_callback_output_bytes_max Largest serialized callback response seen.')
+    lines.append('# TYPE pse_callback_output_bytes_max gauge')
+    for name, stats in snapshot:
+        lines.append(f'pse_callback_output_bytes_max{{{labels[name]}}} {stats.output_bytes_max}')
+    return '\n'.join(lines) + '\n'
+
+
+def instrument_callbacks(app):
+    """Wrap app.callback so every callback declared afterwards is instrumented"""
+    if not metrics_enabled():
+        return app
+
+    register = app.callback
+
+    def callback(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+
+        def wrap(func):
+            decorator(_timed(func, func.__name__))
+            # Module-level names keep the plain function for direct calls
+            return func
+        return wrap
+
+    app.callback = callback
+    app.server.after_request(_record_payload)
+
+    @app.server.route('/metrics')
+    def metrics():
+        if not metrics_authorized(flask.request):
+            flask.abort(403)
+        return flask.Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    return app
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Side-by-side comparison of saved calculations: a table and bar charts of flow,
+total release and tier, computed for every selected calculation in one
+vectorized batch
+"""
+
+from dash import dcc
+import dash_mantine_components as dmc
+from dash_iconify import DashIconify
+
+from calculation_store import compute_results
+from tier_classification import TIER_COLORS, TIER_LABELS
+
+# Bar colours per tier label, matching the tier-badge-* styles
+TIER_BAR_COLORS = {"Tier 1": "#fa5252", "Tier 2": "#be4bdb", "Tier 3": "#51cf66", "N/A": "#868e96"}
+TIER_BADGE_COLORS = {TIER_LABELS[tier]: color for tier, color in TIER_COLORS.items()}
+
+# Charted results: (result field, chart title)
+CHART_FIELDS = [('flow_mscf', "Flow (MSCF/hr)"), ('total_mscf', "Total Release (MSCF)")]
+
+NUMBER_FORMAT = {"function": "params.value == null ? '' : d3.format(',.3f')(params.value)"}
+
+
+def comparison_rows(records):
+    """One row per record with freshly computed results, in selection order"""
+    rows = []
+    for i, (record, results) in enumerate(zip(records, compute_results(records)), 1):
+        rows.append({
+            'label': f"{i}. {record.get('calculation_title') or 'Untitled'}",
+            'gas': record.get('gas'),
+            'site': record.get('site'),
+            'release_type': record.get('release_type'),
+            'flow_kgs': results.get('flow_kgs'),
+            'flow_mscf': results.get('flow_mscf'),
+            'total_kg': results.get('total_kg'),
+            'total_mscf': results.get('total_mscf'),
+            'release_tier': results.get('release_tier'),
+            'flow_status': results.get('flow_status') or results.get('error'),
+        })
+    return rows
+
+
+def comparison_figure(rows):
+    """Bar charts of flow and total release, one bar per calculation coloured by tier"""
+    labels = [row['label'] for row in rows]
+    tiers = [tier for tier in TIER_BAR_COLORS if any(row['release_tier'] == tier for row in rows)]
+    data = []
+    for chart, (field, _) in enumerate(CHART_FIELDS, 1):
+        for tier in tiers:
+            tier_rows = [row for row in rows if row['release_tier'] == tier]
+            data.append({
+                'type': 'bar',
+                'x': [row['label'] for row in tier_rows],
+                'y': [row[field] for row in tier_rows],
+                'name': tier,
+                'legendgroup': tier,
+                'showlegend': chart == 1,
+                'marker': {'color': TIER_BAR_COLORS[tier]},
+                'xaxis': f'x{chart}',
+                'yaxis': f'y{chart}',
+                'hovertemplate': "%{x}<br>%{y:,.3f}<extra>" + tier + "</extra>",
+            })
+
+    # Charts stacked with a shared category order, the selection order
+    layout = {
+        'template': 'plotly_dark',
+        'paper_bgcolor': 'rgba(0,0,0,0)',
+        'plot_bgcolor': 'rgba(0,0,0,0)',
+        'height': 560,
+        'margin': {'l': 60, 'r': 20, 't': 40, 'b': 40},
+        'legend': {'orientation': 'h', 'y': 1.08},
+        'barmode': 'overlay',
+    }
+    for chart, (_, title) in enumerate(CHART_FIELDS, 1):
+        top = 1 - (chart - 1) * 0.55
+        layout[f'xaxis{chart}'] = {
+            'anchor': f'y{chart}', 'categoryorder': 'array', 'categoryarray': labels,
+            'showticklabels': len(labels) <= 30 and chart == len(CHART_FIELDS),
+        }
+        layout[f'yaxis{chart}'] = {'anchor': f'x{chart}', 'domain': [top - 0.45, top], 'title': {'text': title}}
+    return {'data': data, 'layout': layout}
+
+
+def create_comparison(records, dag):
+    """Comparison view for saved records: tier counts, bar charts and a table"""
+    if len(records) < 2:
+        return dmc.Alert(
+            "Select two or more calculations to compare.",
+            color="yellow",
+            icon=DashIconify(icon="tabler:info-circle", width=20)
+        )
+
+    rows = comparison_rows(records)
+    counts = {}
+    for row in rows:
+        counts[row['release_tier'] or "Error"] = counts.get(row['release_tier'] or "Error", 0) + 1
+
+    column_defs = [
+        {"headerName": "Calculation", "field": "label", "flex": 1, "minWidth": 180, "cellClassName": "ag-cell-value"},
+        {"headerName": "Gas", "field": "gas", "width": 120},
+        {"headerName": "Site", "field": "site", "width": 100},
+        {"headerName": "Release Type", "field": "release_type", "width": 130},
+        {"headerName": "Flow (kg/s)", "field": "flow_kgs", "width": 120, "valueFormatter": NUMBER_FORMAT},
+        {"headerName": "Flow (MSCF/hr)", "field": "flow_mscf", "width": 140, "valueFormatter": NUMBER_FORMAT},
+        {"headerName": "Total (kg)", "field": "total_kg", "width": 120, "valueFormatter": NUMBER_FORMAT},
+        {"headerName": "Total (MSCF)", "field": "total_mscf", "width": 130, "valueFormatter": NUMBER_FORMAT},
+        {"headerName": "Tier", "field": "release_tier", "width": 100},
+        {"headerName": "Flow Status", "field": "flow_status", "width": 150},
+    ]
+
+    return dmc.Stack(gap="md", children=[
+        dmc.Group(justify="space-between", children=[
+            dmc.Title("Comparison", order=5, className="section-title"),
+            dmc.Group(gap="xs", children=[
+                dmc.Badge(f"{count} {tier}", color=TIER_BADGE_COLORS.get(tier, "red"), variant="light")
+                for tier, count in counts.items()
+            ])
+        ]),
+        dcc.Graph(figure=comparison_figure(rows), config={'displaylogo': False}),
+        dag.AgGrid(
+            id='compare-table',
+            rowData=rows,
+            columnDefs=column_defs,
+            defaultColDef={"sortable": True, "resizable": True, "filter": True, "cellClassName": "ag-cell-small"},
+            className="ag-theme-alpine-dark ag-grid-full",
+            dashGridOptions={
+                "pagination": True,
+                "paginationPageSize": 10,
+                "domLayout": "autoHeight",
+                "rowHeight": 42,
+                "headerHeight": 48,
+                "enableCellTextSelection": True
+            }
+        )
+    ])
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Flow equations for the PSE calculator, in bracket or radical (√) notation.
+
+Both notations share one set of equation builders; only the square-root groups
+differ. Each style is rendered once per process into serialized JSON and a
+static HTML page, which register_equation_routes() serves under a fingerprinted
+URL with long-lived cache headers:
+
+    /equations/<fingerprint>/<style>.json
+    /equations/<fingerprint>/<style>.html
+
+The Information tab embeds the same cached trees as plain dicts.
+"""
+
+import hashlib
+import html as html_escape
+import json
+from functools import lru_cache
+
+from dash import html
+import plotly
+
+EQUATION_STYLES = ('bracket', 'sqrt')
+DEFAULT_STYLE = 'bracket'
+
+# Fingerprinted URLs never change content, so clients may cache them for a year
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def square_root(children, style):
+    """Square root of `children` in the given notation"""
+    if style == 'sqrt':
+        return html.Span([
+            html.Span("√"),
+            html.Span(children, className="sqrt-content")
+        ], className="sqrt")
+    return html.Span(
+        [html.Span("[", className="bracket")] + children +
+        [html.Span("]", className="bracket"), html.Sup("1/2")],
+        className="bracket-group"
+    )
+
+
+def fraction(numerator, denominator, className="frac"):
+    """Stacked fraction"""
+    return html.Span([
+        html.Span(numerator, className="frac-num"),
+        html.Span(denominator, className="frac-den")
+    ], className=className)
+
+
+def power_group(base, exp_num, exp_den, **sup_props):
+    """Parenthesized fraction raised to a fractional power"""
+    return html.Span([
+        html.Span("(", className="paren"),
+        base,
+        html.Span(")", className="paren"),
+        html.Sup([fraction(exp_num, exp_den, "frac frac-small")], **sup_props)
+    ], className="paren-group")
+
+
+def pressure_ratio():
+    """P2 over P1"""
+    return fraction(["P", html.Sub("2")], ["P", html.Sub("1")])
+
+
+def pressure_power(exp_num, exp_den):
+    """(P2/P1) raised to a fractional power"""
+    return power_group(pressure_ratio(), exp_num, exp_den)
+
+
+def create_sonic_flow_equation(style=DEFAULT_STYLE):
+    """Create HTML for sonic (choked) flow equation"""
+    return html.Div(
+        className="static-equation",
+        children=[
+            html.Span("ṁ", className="var-with-dot"),
+            html.Sub("choked"),
+            " = C",
+            html.Sub("d"),
+            " · A · P",
+            html.Sub("1"),
+            " · ",
+            square_root([
+                fraction("k · M", ["Z · R", html.Sub("g"), " · T", html.Sub("1")])
+            ], style),
+            " · ",
+            power_group(fraction("2", "k+1"), "k+1", "2(k-1)", className="complex-exp")
+        ]
+    )
+
+
+def create_subsonic_flow_equation(style=DEFAULT_STYLE):
+    """Create HTML for subsonic flow equation"""
+    return html.Div(
+        className="static-equation",
+        children=[
+            html.Span("ṁ", className="var-with-dot"),
+            " = C",
+            html.Sub("d"),
+            " · A · P",
+            html.Sub("1"),
+            " · ",
+            square_root([
+                fraction("2 · M", ["Z · R", html.Sub("g"), " · T", html.Sub("1")]),
+                " · ",
+                fraction("k", "k-1"),
+                " · ",
+                html.Span([
+                    html.Span("[", className="bracket"),
+                    pressure_power("2", "k"),
+                    " - ",
+                    pressure_power("k+1", "k"),
+                    html.Span("]", className="bracket")
+                ], className="bracket-group")
+            ], style)
+        ]
+    )
+
+
+def create_critical_pressure_equation(style=DEFAULT_STYLE):
+    """Create HTML for critical pressure ratio equation"""
+    return html.Div(
+        className="static-equation",
+        children=[
+            fraction(["P", html.Sub("choked")], ["P", html.Sub("1")]),
+            " = ",
+            power_group(fraction("2", "k+1"), "k", "k-1")
+        ]
+    )
+
+
+def create_sonic_simplified_equation(style=DEFAULT_STYLE):
+    """Create HTML for simplified sonic flow equation"""
+    return html.Div(
+        className="static-equation",
+        children=[
+            html.Span("ṁ", className="var-with-dot"),
+            html.Sub("choked"),
+            " = C",
+            html.Sub("d"),
+            " · A · P",
+            html.Sub("1"),
+            " · ",
+            square_root([fraction("γ", ["R · T", html.Sub("1")])], style),
+            " · K",
+            html.Sub("sonic")
+        ]
+    )
+
+
+def create_sonic_factor_equation(style=DEFAULT_STYLE):
+    """Create HTML for sonic factor equation"""
+    return html.Div(
+        className="static-equation-small",
+        children=[
+            "K",
+            html.Sub("sonic"),
+            " = ",
+            power_group(fraction("2", "γ+1"), "γ+1", "2(γ-1)")
+        ]
+    )
+
+
+def create_subsonic_simplified_equation(style=DEFAULT_STYLE):
+    """Create HTML for simplified subsonic flow equation"""
+    return html.Div(
+        className="static-equation",
+        children=[
+            html.Span("ṁ", className="var-with-dot"),
+            " = C",
+            html.Sub("d"),
+            " · A · P",
+            html.Sub("1"),
+            " · ",
+            square_root([fraction("2 · γ", ["(γ-1) · R · T", html.Sub("1")])], style),
+            " · ",
+            square_root([
+                pressure_power("2", "γ"),
+                " - ",
+                pressure_power("γ+1", "γ")
+            ], style)
+        ]
+    )
+
+
+def create_flow_condition_sonic(style=DEFAULT_STYLE):
+    """Create HTML for sonic flow condition"""
+    return html.Div(
+        className="static-equation-small",
+        children=[pressure_ratio(), " ≤ ", power_group(fraction("2", "γ+1"), "γ", "γ-1")]
+    )
+
+
+def create_flow_condition_subsonic(style=DEFAULT_STYLE):
+    """Create HTML for subsonic flow condition"""
+    return html.Div(
+        className="static-equation-small",
+        children=[pressure_ratio(), " > ", power_group(fraction("2", "γ+1"), "γ", "γ-1")]
+    )
+
+
+EQUATION_BUILDERS = {
+    'sonic_flow': create_sonic_flow_equation,
+    'subsonic_flow': create_subsonic_flow_equation,
+    'critical_pressure': create_critical_pressure_equation,
+    'sonic_simplified': create_sonic_simplified_equation,
+    'sonic_factor': create_sonic_factor_equation,
+    'subsonic_simplified': create_subsonic_simplified_equation,
+    'flow_condition_sonic': create_flow_condition_sonic,
+    'flow_condition_subsonic': create_flow_condition_subsonic,
+}
+
+
+# Variable definitions as Dash HTML components
+def create_variable_definition(symbol_html, description):
+    """Create a variable definition with proper HTML structure"""
+    return html.Span([symbol_html, f" = {description}"])
+
+
+def build_variable_definitions():
+    """Variable legend shared by both notations"""
+    return {
+        'mdot': create_variable_definition(html.Span([html.Span("ṁ", className="var-with-dot")]), "Mass flow rate (kg/s)"),
+        'cd': create_variable_definition(html.Span(["C", html.Sub("d")]), "Discharge coefficient"),
+        'area': create_variable_definition("A", "Orifice area (m²)"),
+        'p1': create_variable_definition(html.Span(["P", html.Sub("1")]), "Upstream pressure (Pa abs)"),
+        'p2': create_variable_definition(html.Span(["P", html.Sub("2")]), "Downstream pressure (Pa abs)"),
+        'gamma': create_variable_definition("k or γ", "Specific heat ratio"),
+        'mw': create_variable_definition("M", "Molecular weight (kg/kmol)"),
+        'z': create_variable_definition("Z", "Compressibility factor"),
+        'r': create_variable_definition("R", "Specific gas constant (J/kg·K)"),
+        't1': create_variable_definition(html.Span(["T", html.Sub("1")]), "Upstream temperature (K)"),
+    }
+
+
+def build_equations(style=DEFAULT_STYLE):
+    """Fresh Dash components for every equation in the given notation"""
+    if style not in EQUATION_STYLES:
+        raise ValueError(f"Unknown equation style '{style}', expected one of {EQUATION_STYLES}")
+    return {name: builder(style) for name, builder in EQUATION_BUILDERS.items()}
+
+
+@lru_cache(maxsize=None)
+def equations_json(style=DEFAULT_STYLE):
+    """Serialized equations and variable legend of one notation, built once per process"""
+    document = {
+        'style': style,
+        'equations': build_equations(style),
+        'variables': build_variable_definitions(),
+    }
+    return json.dumps(document, cls=plotly.utils.PlotlyJSONEncoder, ensure_ascii=False)
+
+
+@lru_cache(maxsize=None)
+def equation_trees(style=DEFAULT_STYLE):
+    """Equations and variable legend as plain JSON-ready dicts, usable as component children"""
+    return json.loads(equations_json(style))
+
+
+def render_html(node):
+    """Static HTML for a serialized Dash html component tree"""
+    if node is None:
+        return ''
+    if isinstance(node, (list, tuple)):
+        return ''.join(render_html(child) for child in node)
+    if not isinstance(node, dict):
+        return html_escape.escape(str(node))
+    props = node.get('props', {})
+    tag = node['type'].lower()
+    attrs = ''
+    if props.get('className'):
+        attrs += f' class="{html_escape.escape(props["className"])}"'
+    if props.get('id'):
+        attrs += f' id="{html_escape.escape(str(props["id"]))}"'
+    return f"<{tag}{attrs}>{render_html(props.get('children'))}</{tag}>"
+
+
+@lru_cache(maxsize=None)
+def equations_html(style=DEFAULT_STYLE):
+    """Standalone HTML page of one notation, styled by the app stylesheet"""
+    trees = equation_trees(style)
+    boxes = ''.join(
+        f'<div class="equation-box" id="eq-{name}">{render_html(tree)}</div>\n'
+        for name, tree in trees['equations'].items()
+    )
+    legend = ''.join(
+        f'<p class="variable-item">{render_html(tree)}</p>\n'
+        for tree in trees['variables'].values()
+    )
+    return (
+        '<!DOCTYPE html>\n<html class="theme-dark">\n<head>\n<meta charset="utf-8">\n'
+        '<title>PSE Calculator Equations</title>\n'
+        '<link rel="stylesheet" href="/assets/main.css">\n</head>\n<body>\n'
+        f'{boxes}<div class="variables-legend">\n{legend}</div>\n</body>\n</html>\n'
+    )
+
+
+@lru_cache(maxsize=None)
+def equations_fingerprint():
+    """Content hash of every rendered style; part of the static URLs"""
+    digest = hashlib.sha1()
+    for style in EQUATION_STYLES:
+        digest.update(equations_json(style).encode())
+    return digest.hexdigest()[:12]
+
+
+def equations_url(style=DEFAULT_STYLE, fmt='json'):
+    """Fingerprinted URL of the pre-rendered equations"""
+    return f"/equations/{equations_fingerprint()}/{style}.{fmt}"
+
+
+def register_equation_routes(server):
+    """Serve the pre-rendered equations from the Flask server"""
+    import flask
+
+    renderers = {
+        'json': (equations_json, 'application/json'),
+        'html': (equations_html, 'text/html'),
+    }
+
+    @server.route('/equations/<fingerprint>/<style>.<fmt>')
+    def static_equations(fingerprint, style, fmt):
+        if style not in EQUATION_STYLES or fmt not in renderers:
+            flask.abort(404)
+        if fingerprint != equations_fingerprint():
+            # Stale links from an older deployment get the current content
+            return flask.redirect(equations_url(style, fmt))
+        render, mimetype = renderers[fmt]
+        response = flask.Response(render(style), mimetype=mimetype)
+        response.headers['Cache-Control'] = CACHE_CONTROL
+        response.set_etag(f"{fingerprint}-{style}-{fmt}")
+        return response.make_conditional(flask.request)
+
+    return server
+
+
+if __name__ == "__main__":
+    for style in EQUATION_STYLES:
+        print(f"{style}: {len(equations_json(style))} bytes JSON, "
+              f"{len(equations_html(style))} bytes HTML -> {equations_url(style)}")
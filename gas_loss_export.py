@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Bulk export of saved calculations for the gas loss database, with a change feed.
+
+Each exported row is one saved calculation: its metadata, inputs, change stamps
+(sequence, updated_at) and computed release rates and volumes.
+
+    GET /export/calculations.csv        all saved calculations
+    GET /export/calculations.ndjson     (one JSON object per line)
+    GET /export/calculations.parquet    (pandas + pyarrow)
+    GET /export/changes?cursor=<n>&limit=<n>
+    GET /export/changes?since=<ISO timestamp>
+
+The bulk exports take the same cursor/since filters, so a loader can pull
+everything once and then only what changed. The change feed returns upserted
+rows and deleted ids in sequence order, plus the cursor to send next time.
+The cursor is the authoritative resume key: every change gets its own
+sequence number, while 'since' keeps only changes strictly after a time and
+is meant for a first pull, not for resuming:
+
+    {"cursor": 42, "has_more": false,
+     "changes": [{"op": "upsert", "sequence": 41, "updated_at": ..., "record": {...}},
+                 {"op": "delete", "sequence": 42, "updated_at": ..., "id": ...}]}
+
+Run as a script to write an export file:
+    python gas_loss_export.py --format csv --out gas_losses.csv [--cursor N | --since TIME]
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+
+from calculation_store import (
+    METADATA_FIELDS, NUMERIC_INPUTS, RESULT_FIELDS, TEXT_INPUTS,
+    parse_utc, refresh_store, unpack_store,
+)
+from pse_engine import gas_data
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+INPUT_COLUMNS = TEXT_INPUTS + [column for key in NUMERIC_INPUTS for column in (key, f'{key}_unit')] + ['cd']
+EXPORT_COLUMNS = (METADATA_FIELDS + ['sequence', 'updated_at', 'scenario'] + INPUT_COLUMNS
+                  + ['fluid_class', 'flow_status', 'release_tier', 'tier_criterion'] + RESULT_FIELDS + ['engine_version'])
+
+NUMERIC_COLUMNS = set(NUMERIC_INPUTS + RESULT_FIELDS + ['sequence'])
+
+DEFAULT_FEED_LIMIT = 1000
+MAX_FEED_LIMIT = 10000
+
+
+def export_row(record):
+    """Flat export row of a saved record"""
+    row = {column: record.get(column) for column in EXPORT_COLUMNS}
+    row['fluid_class'] = gas_data.get(record.get('gas'), {}).get('fluid_class')
+    results = record.get('results') or {}
+    for key in ['flow_status', 'release_tier', 'tier_criterion', 'engine_version'] + RESULT_FIELDS:
+        row[key] = results.get(key)
+    return row
+
+
+def load_feed():
+    """Records (with fresh results), tombstones and the current cursor of the store"""
+    # Stamps an unstamped store and sequences results recomputed for a new engine, once
+    document, _ = refresh_store()
+    if document is None:
+        return [], [], 0
+    return unpack_store(document), document.get('deleted', []), document.get('sequence', 0)
+
+
+def _changed(item, cursor, since):
+    """True when an entry or tombstone changed after the cursor or the since datetime"""
+    if cursor is not None and item.get('sequence', 0) <= cursor:
+        return False
+    # Compared as datetimes: stamps written before microseconds were kept have whole seconds
+    if since is not None and (not item.get('updated_at') or parse_utc(item['updated_at']) <= since):
+        return False
+    return True
+
+
+def export_rows(cursor=None, since=None):
+    """Export rows of saved calculations changed after cursor/since (all when both are None)"""
+    records, _, _ = load_feed()
+    records = [record for record in records if _changed(record, cursor, since)]
+    records.sort(key=lambda record: record.get('sequence', 0))
+    return [export_row(record) for record in records]
+
+
+def changes_since(cursor=None, since=None, limit=DEFAULT_FEED_LIMIT):
+    """Upserts and deletes after cursor/since in sequence order, at most limit of them"""
+    records, deleted, latest = load_feed()
+    changes = [
+        {'op': 'upsert', 'sequence': record.get('sequence', 0), 'updated_at': record.get('updated_at'),
+         'record': export_row(record)}
+        for record in records if _changed(record, cursor, since)
+    ]
+    changes += [
+        {'op': 'delete', 'sequence': tomb['sequence'], 'updated_at': tomb.get('updated_at'), 'id': tomb['id']}
+        for tomb in deleted if _changed(tomb, cursor, since)
+    ]
+    changes.sort(key=lambda change: change['sequence'])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    # Resume after the last change returned, or at the head when the feed is drained
+    next_cursor = changes[-1]['sequence'] if has_more else max(latest, cursor or 0)
+    return {'cursor': next_cursor, 'has_more': has_more, 'changes': changes}
+
+
+def iter_csv(rows):
+    """CSV text of the rows, one chunk per row"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_ndjson(rows):
+    """One JSON object per line"""
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def parquet_bytes(rows):
+    """Parquet file of the rows; raises ImportError without a parquet engine"""
+    import pandas as pd
+
+    frame = pd.DataFrame(rows, columns=EXPORT_COLUMNS)
+    for column in NUMERIC_COLUMNS:
+        frame[column] = pd.to_numeric(frame[column], errors='coerce')
+    buffer = io.BytesIO()
+    frame.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _parse_cursor(value):
+    """Integer cursor from a query/CLI value; raises ValueError"""
+    if value in (None, ''):
+        return None
+    cursor = int(value)
+    if cursor < 0:
+        raise ValueError("cursor must not be negative")
+    return cursor
+
+
+def _parse_since(value):
+    """UTC datetime from a query/CLI value; raises ValueError"""
+    if value in (None, ''):
+        return None
+    return parse_utc(value)
+
+
+def register_export_routes(server):
+    """Serve /export/calculations.<format> and /export/changes from the Flask server"""
+    import flask
+
+    def feed_filters():
+        try:
+            cursor = _parse_cursor(flask.request.args.get('cursor'))
+        except ValueError:
+            flask.abort(400, "cursor must be a non-negative integer")
+        try:
+            since = _parse_since(flask.request.args.get('since'))
+        except ValueError:
+            flask.abort(400, "since must be an ISO 8601 time")
+        return cursor, since
+
+    @server.route('/export/calculations.<fmt>')
+    def export_calculations(fmt):
+        if fmt not in EXPORT_FORMATS:
+            flask.abort(404)
+        rows = export_rows(*feed_filters())
+        if fmt == 'parquet':
+            try:
+                body = parquet_bytes(rows)
+            except ImportError:
+                flask.abort(501, "Parquet export needs pyarrow (pip install pyarrow)")
+        else:
+            body = iter_csv(rows) if fmt == 'csv' else iter_ndjson(rows)
+        response = flask.Response(body, mimetype=EXPORT_FORMATS[fmt])
+        response.headers['Content-Disposition'] = f'attachment; filename="gas_losses.{fmt}"'
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    @server.route('/export/changes')
+    def export_changes():
+        cursor, since = feed_filters()
+        try:
+            limit = min(int(flask.request.args.get('limit', DEFAULT_FEED_LIMIT)), MAX_FEED_LIMIT)
+        except ValueError:
+            flask.abort(400, "limit must be an integer")
+        response = flask.jsonify(changes_since(cursor, since, max(limit, 1)))
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export saved calculations for the gas loss database")
+    parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv')
+    parser.add_argument('--out', help="output file (default: gas_losses.<format>)")
+    parser.add_argument('--cursor', help="only entries changed after this sequence number")
+    parser.add_argument('--since', help="only entries changed after this UTC time (e.g. 2025-07-01T00:00:00Z)")
+    args = parser.parse_args()
+
+    rows = export_rows(_parse_cursor(args.cursor), _parse_since(args.since))
+    out = args.out or f"gas_losses.{args.format}"
+    if args.format == 'parquet':
+        try:
+            body = parquet_bytes(rows)
+        except ImportError as e:
+            sys.exit(f"Error exporting parquet: {e}")
+        with open(out, 'wb') as f:
+            f.write(body)
+    else:
+        chunks = iter_csv(rows) if args.format == 'csv' else iter_ndjson(rows)
+        with open(out, 'w', encoding='utf-8', newline='') as f:
+            f.writelines(chunks)
+    _, _, latest = load_feed()
+    print(f"Wrote {len(rows)} calculations to {out} (cursor {latest})")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Gunicorn settings for the PSE calculator.
+
+    gunicorn -c gunicorn.conf.py pse_calculator_enbridge:server
+
+The app is imported once in the master (preload_app). The master then moves
+every object it created out of the garbage collector's reach (gc.freeze)
+before forking, so workers share those pages copy-on-write instead of each
+rebuilding and dirtying its own copy. The layout and other lazy caches are
+built after the fork, by the /readyz warm-up or the first request that needs
+them (see health_checks.py).
+
+Worker and thread counts follow the CPUs available to the container and can
+be overridden with WEB_CONCURRENCY and PSE_THREADS. Every worker thread shares
+saved_calculations.json: saves take calculation_store's file lock and loads
+(the layout, /reports, the exports) never write, so they are safe to run
+concurrently.
+"""
+
+import gc
+import math
+import os
+
+# One BLAS thread per worker; the worker processes already use every CPU
+for _name in ('OPENBLAS_NUM_THREADS', 'OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(_name, '1')
+
+
+def available_cpus():
+    """CPUs this process may use, honouring affinity and a cgroup v2 CPU quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+
+preload_app = True
+workers = int(os.environ.get('WEB_CONCURRENCY', available_cpus() * 2 + 1))
+# Threads let a worker overlap slow clients and file I/O; callbacks release the GIL in numpy
+worker_class = 'gthread'
+threads = int(os.environ.get('PSE_THREADS', 4))
+
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then; they fork from the warmed master, so restarts are cheap
+max_requests = 5000
+max_requests_jitter = 500
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded and before workers are forked"""
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Preloaded app; forking {workers} workers x {threads} threads")
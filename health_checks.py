@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Health and readiness endpoints, and the warm-up that runs before a worker is ready.
+
+/healthz  liveness: the process is up and serving requests (always 200)
+/readyz   readiness: warm-up finished and saved calculations can be written;
+          503 with the failing checks otherwise
+
+warm_up(app) primes every lazily built cache so the first real requests to a
+new worker are as fast as later ones: gas coefficient and tier threshold
+tables, the engine version stamp, the pre-rendered equations, the Information
+tab, and the page, layout and callback graph (building the layout also loads
+the saved calculations store).
+
+It never runs at import: that would build the layout and import the grid and
+chart components in every process that imports the app, undoing their lazy
+loading. The first /readyz probe starts it in a background thread and is
+answered 503 until it finishes. Set PSE_WARMUP=0 to skip it.
+"""
+
+import os
+import threading
+import time
+
+import flask
+
+from startup_profile import profile_phase
+from pse_engine import gas_table
+from tier_classification import load_tier_thresholds
+import calculation_store
+from calculation_store import engine_version
+from equation_registry import EQUATION_STYLES, equations_html, equations_json, equations_fingerprint
+from offline_support import info_tab_response
+
+# Requests served in-process during warm-up; the first one makes Dash build the layout
+WARMUP_URLS = ['/', '/_dash-layout', '/_dash-dependencies']
+
+_state = {'ready': False, 'error': None, 'seconds': None, 'started': False}
+_lock = threading.Lock()
+
+
+def warmup_enabled():
+    """Warm-up runs unless PSE_WARMUP is 0/false/off"""
+    return os.environ.get('PSE_WARMUP', '1').lower() not in ('0', 'false', 'off')
+
+
+def warm_up(app):
+    """Prime the caches; returns True when the worker is ready"""
+    start = time.perf_counter()
+    try:
+        with profile_phase('warmup.tables'):
+            gas_table()
+            load_tier_thresholds()
+            engine_version()
+        with profile_phase('warmup.equations'):
+            for style in EQUATION_STYLES:
+                equations_json(style)
+                equations_html(style)
+            equations_fingerprint()
+        with profile_phase('warmup.info_tab'):
+            info_tab_response()
+        with profile_phase('warmup.app_shell'):
+            client = app.server.test_client()
+            for url in WARMUP_URLS:
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise RuntimeError(f"GET {url} returned {response.status_code}")
+    except Exception as e:
+        # Keep serving; /readyz reports the failure
+        _state['error'] = f"{type(e).__name__}: {e}"
+        print(f"Error warming up: {_state['error']}")
+        return False
+    _state['seconds'] = time.perf_counter() - start
+    _state['error'] = None
+    _state['ready'] = True
+    return True
+
+
+def start_warm_up(app):
+    """Run warm_up in a background thread, once per process"""
+    with _lock:
+        if _state['started']:
+            return
+        _state['started'] = True
+    threading.Thread(target=warm_up, args=(app,), name='pse-warmup', daemon=True).start()
+
+
+def readiness_checks():
+    """Name -> (ok, detail) for every readiness condition"""
+    if _state['ready']:
+        warmup = (True, f"{_state['seconds'] * 1000:.0f} ms")
+    elif not warmup_enabled():
+        warmup = (True, 'disabled')
+    else:
+        warmup = (False, _state['error'] or 'pending')
+    path = calculation_store.CALCULATIONS_FILE
+    if os.path.exists(path):
+        writable = os.access(path, os.W_OK)
+    else:
+        writable = os.access(os.path.dirname(os.path.abspath(path)), os.W_OK)
+    storage = (writable, path if writable else f"{path} is not writable")
+    return {'warmup': warmup, 'storage': storage}
+
+
+def register_health_endpoints(app):
+    """Serve /healthz and /readyz from app.server"""
+    @app.server.route('/healthz')
+    def healthz():
+        return flask.jsonify({'status': 'ok'})
+
+    @app.server.route('/readyz')
+    def readyz():
+        if warmup_enabled():
+            start_warm_up(app)
+        checks = readiness_checks()
+        ready = all(ok for ok, _ in checks.values())
+        body = {
+            'status': 'ready' if ready else 'not ready',
+            'checks': {name: {'ok': ok, 'detail': detail} for name, (ok, detail) in checks.items()},
+        }
+        response = flask.jsonify(body)
+        response.status_code = 200 if ready else 503
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    return app
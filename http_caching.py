@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Response compression and cache headers for the Dash server.
+
+install_http_caching(app) hooks app.server so that:
+
+- text responses (callback JSON, the index page, CSS, JS bundles, the manifest)
+  are compressed with brotli when the client accepts it, otherwise with gzip
+  (installs without the `brotli` package from requirements.txt use gzip only);
+- fingerprinted static files (/assets/...?m=<mtime>, as Dash links them, and the
+  versioned /_dash-component-suites bundles) get immutable one-year cache
+  headers. Compressed bodies of those are computed once and kept in memory.
+
+Non-fingerprinted assets keep Flask's default revalidation with ETags.
+Set PSE_HTTP_COMPRESSION=0 to turn compression off (e.g. behind a proxy that
+already compresses).
+"""
+
+import gzip
+import os
+import threading
+from collections import OrderedDict
+
+import flask
+from dash.fingerprint import check_fingerprint
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Bodies smaller than this are not worth the compression overhead
+MIN_COMPRESS_BYTES = 500
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'application/manifest+json',
+    'application/xml',
+    'image/svg+xml',
+    'text/css',
+    'text/html',
+    'text/javascript',
+    'text/plain',
+}
+
+# Compression levels: static bodies are compressed once, so they get the best ratio
+GZIP_LEVEL = {'dynamic': 6, 'static': 9}
+BROTLI_QUALITY = {'dynamic': 5, 'static': 11}
+
+# Compressed fingerprinted bodies, keyed by (path, query, encoding)
+STATIC_CACHE_SIZE = 128
+_static_cache = OrderedDict()
+_static_lock = threading.Lock()
+
+
+def compression_enabled():
+    """Compression is on unless PSE_HTTP_COMPRESSION is 0/false/off"""
+    return os.environ.get('PSE_HTTP_COMPRESSION', '1').lower() not in ('0', 'false', 'off')
+
+
+def available_encodings():
+    """Content encodings this server can produce, in order of preference"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compress(data, encoding, kind='dynamic'):
+    """Compress bytes with 'br' or 'gzip'"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY[kind])
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(data, compresslevel=GZIP_LEVEL[kind], mtime=0)
+
+
+def is_fingerprinted(request):
+    """True for URLs whose content never changes: Dash asset links and versioned bundles"""
+    path = request.path
+    if path.startswith('/assets/'):
+        return 'm' in request.args
+    if path.startswith('/_dash-component-suites/'):
+        return check_fingerprint(path)[1]
+    return False
+
+
+def _cached_body(key, data, encoding):
+    """Compressed static body, computed once per process"""
+    with _static_lock:
+        body = _static_cache.get(key)
+        if body is not None:
+            _static_cache.move_to_end(key)
+            return body
+    body = compress(data, encoding, 'static')
+    with _static_lock:
+        _static_cache[key] = body
+        if len(_static_cache) > STATIC_CACHE_SIZE:
+            _static_cache.popitem(last=False)
+    return body
+
+
+def _process_response(response):
+    """Flask after_request hook: cache headers, then compression"""
+    request = flask.request
+    fingerprinted = response.status_code == 200 and is_fingerprinted(request)
+    if fingerprinted:
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+
+    if (not compression_enabled()
+            or response.status_code != 200
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers
+            or request.method == 'HEAD'):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    # Files are sent as streams; read them so they can be compressed
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return response
+
+    if fingerprinted:
+        body = _cached_body((request.path, request.query_string, encoding), data, encoding)
+    else:
+        body = compress(data, encoding)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def install_http_caching(app):
+    """Compress responses and set cache headers on app.server"""
+    app.server.after_request(_process_response)
+    return app
@@ -0,0 +1,624 @@
+#!/usr/bin/env python3
+"""
+Information tab content: tiering thresholds, roles, equations, gas properties,
+equipment hole sizes and links
+"""
+
+import json
+from functools import lru_cache
+
+from dash import html
+import dash_mantine_components as dmc
+from dash_iconify import DashIconify
+import plotly
+
+from equation_registry import DEFAULT_STYLE, equation_trees
+from pse_engine import gas_data
+from tier_classification import (
+    FLUID_CLASSES, format_threshold, get_tier_entry, tier_fluid_classes, tier_release_types, tier_sites,
+)
+
+OR_STYLE = {"color": "var(--text-secondary)", "font-style": "italic"}
+
+
+def threshold_cell(criteria, note=None):
+    """Table cell listing a tier's criteria, e.g. '≥ 70 m³ or ≥ 2.47 MSCF or ≥ 50 kg'"""
+    children = []
+    for i, (unit, value) in enumerate(criteria.items()):
+        if i == 2:
+            children += [html.Br(), html.Span("or ", style=OR_STYLE)]
+        elif i:
+            children.append(html.Span(" or ", style=OR_STYLE))
+        children.append(format_threshold(value, unit))
+    if note:
+        children += [html.Br(), html.Small(note, style=OR_STYLE)]
+    return html.Td(children)
+
+
+def release_type_basis(entry):
+    """Column heading note and footnote for a release type's counting basis"""
+    if entry['window_seconds']:
+        minutes = f"{entry['window_seconds'] / 60:g}"
+        return f" {minutes} minutes )", f"uses {minutes}-minute rate threshold"
+    return None, "uses total volume threshold"
+
+
+def fluid_class_label(fluid_class, sites=None):
+    """First-column cell: the class, the sites it applies to when they differ, and its gases"""
+    label = FLUID_CLASSES[fluid_class] + (f" ({', '.join(sites)})" if sites else "")
+    gases = [name for name, props in gas_data.items() if props['fluid_class'] == fluid_class]
+    return html.Td([label, html.Br(), html.Small(", ".join(gases), style=OR_STYLE)])
+
+
+def create_tiering_table():
+    """Tiering thresholds table and footnotes, built from tier_thresholds.json"""
+    release_types = tier_release_types()
+    sites = tier_sites()
+    # Per fluid class, one row per distinct set of thresholds; sites that share one are listed together
+    rows_by_class = {}
+    for fluid_class in tier_fluid_classes():
+        groups = rows_by_class[fluid_class] = {}
+        for site in sites:
+            entries = [get_tier_entry(site, release_type, fluid_class) for release_type in release_types]
+            key = json.dumps([entry and [entry['thresholds'], entry['window_seconds']] for entry in entries],
+                             sort_keys=True)
+            groups.setdefault(key, (entries, []))[1].append(site)
+    # Column headings describe the first class configured for each release type;
+    # cells note where another class counts the release differently
+    all_entries = [entries for groups in rows_by_class.values() for entries, _ in groups.values()]
+    headings = [next(entries[i] for entries in all_entries if entries[i]) for i in range(len(release_types))]
+    tiers = sorted({tier for entries in all_entries for entry in entries if entry for tier in entry['thresholds']})
+
+    header_cells = [html.Th("Service Fluid Classification", rowSpan=2)]
+    footnotes = []
+    for release_type, entry in zip(release_types, headings):
+        window_note, footnote = release_type_basis(entry)
+        if window_note:
+            note = [html.Span("( Release Rate Threshold ", style={"white-space": "pre"}),
+                    html.Span("—", style={"margin": "0 4px"}),
+                    html.Span(window_note, style={"white-space": "pre"})]
+        else:
+            note = [html.Span("( Total Release Volume Threshold )", style={"white-space": "pre"})]
+        header_cells.append(html.Th([f"{release_type} Release", html.Br(), html.Small(note)],
+                                    colSpan=len(tiers), className="text-center"))
+        spacing = {} if footnotes else {'mt': "xs"}
+        footnotes.append(dmc.Text(f"* {release_type} release {footnote}", size="xs", c="dimmed", **spacing))
+    unclassified = [name for name, props in gas_data.items() if props['fluid_class'] not in rows_by_class]
+    if unclassified:
+        footnotes.append(dmc.Text(f"Releases of {', '.join(unclassified)} are not tiered (N/A): no thresholds "
+                                  "are configured for their fluid class.", size="xs", c="dimmed"))
+    tier_cells = [html.Th(f"Tier {tier}", className=f"tier-{tier}-header")
+                  for _ in release_types for tier in tiers]
+
+    rows = []
+    for fluid_class, groups in rows_by_class.items():
+        for entries, group_sites in groups.values():
+            cells = [fluid_class_label(fluid_class, group_sites if len(groups) > 1 else None)]
+            for entry, heading in zip(entries, headings):
+                if entry is None:
+                    cells += [html.Td("—") for _ in tiers]
+                    continue
+                note = None
+                if entry['window_seconds'] != heading['window_seconds']:
+                    note = (f"in the first {entry['window_seconds'] / 60:g} minutes" if entry['window_seconds']
+                            else "total release")
+                cells += [threshold_cell(entry['thresholds'].get(tier, {}), note) for tier in tiers]
+            rows.append(html.Tr(cells))
+
+    return [
+        dmc.Table(
+            striped=True,
+            highlightOnHover=True,
+            className="tiering-table",
+            children=[
+                html.Thead([html.Tr(header_cells), html.Tr(tier_cells)]),
+                html.Tbody(rows)
+            ]
+        ),
+        *footnotes
+    ]
+
+
+def create_info_tab_content():
+    """Create the Information tab content"""
+    # Pre-rendered equation trees, shared with the /equations static routes
+    trees = equation_trees(DEFAULT_STYLE)
+    static_equations, variable_definitions = trees['equations'], trees['variables']
+
+    return dmc.Paper(
+        p="xl",
+        radius="md",
+        children=[
+            dmc.Stack(
+                gap="xl",
+                children=[
+                    # Tiering Thresholds Section
+                    dmc.Stack(
+                        gap="md",
+                        children=[
+                            dmc.Title("Tiering Thresholds", order=4, className="section-title"),
+                            dmc.Paper(
+                                p="md",
+                                className="input-card",
+                                children=create_tiering_table()
+                            )
+                        ]
+                    ),
+
+                    # Roles and Responsibilities Section
+                    dmc.Stack(
+                        gap="md",
+                        children=[
+                            dmc.Title("Roles and Responsibilities", order=4, className="section-title"),
+                            dmc.Paper(
+                                p="md",
+                                className="input-card",
+                                children=[
+                                    dmc.Table(
+                                        striped=True,
+                                        highlightOnHover=True,
+                                        className="roles-table",
+                                        children=[
+                                            html.Thead([
+                                                html.Tr([
+                                                    html.Th("Roles", style={"width": "30%"}),
+                                                    html.Th("Responsibilities")
+                                                ])
+                                            ]),
+                                            html.Tbody([
+                                                html.Tr([
+                                                    html.Td(html.Strong("Regional Technical Staff (Operations)")),
+                                                    html.Td([
+                                                        html.Ul([
+                                                            html.Li("Gathers all relevant data from Area Operations Supervisor"),
+                                                            html.Li("Performs calculations in accordance with this document"),
+                                                            html.Li("Documents calculations and uploads in PDF format to EnCompass"),
+                                                            html.Li("Informs personnel accountable for updating gas loss database"),
+                                                            html.Li("Notifies Compliance team (US) or Regulatory team (Canada)")
+                                                        ])
+                                                    ])
+                                                ]),
+                                                html.Tr([
+                                                    html.Td(html.Strong("GTM Measurement Engineer")),
+                                                    html.Td([
+                                                        html.Ul([
+                                                            html.Li("Supports Regional Measurement Engineer with questions"),
+                                                            html.Li("Performs recalculation as necessary")
+                                                        ])
+                                                    ])
+                                                ]),
+                                                html.Tr([
+                                                    html.Td(html.Strong("Area Operations Supervisor")),
+                                                    html.Td([
+                                                        html.Ul([
+                                                            html.Li("Provides relevant data to Regional Measurement Engineer")
+                                                        ])
+                                                    ])
+                                                ]),
+                                                html.Tr([
+                                                    html.Td(html.Strong("Process Safety Engineer")),
+                                                    html.Td([
+                                                        html.Ul([
+                                                            html.Li("Categorizes PSE based on calculated volume of release")
+                                                        ])
+                                                    ])
+                                                ])
+                                            ])
+                                        ]
+                                    )
+                                ]
+                            )
+                        ]
+                    ),
+
+                    # Equations Section
+                    dmc.Stack(
+                        gap="md",
+                        children=[
+                            dmc.Title("Calculation Equations", order=4, className="section-title"),
+                            dmc.Paper(
+                                p="md",
+                                className="input-card",
+                                children=[
+                                    dmc.Stack(
+                                        gap="lg",
+                                        children=[
+                                            # Sonic Flow Equation
+                                            html.Div([
+                                                dmc.Text("Sonic (Choked) Flow:", fw=600, size="sm", mb="xs"),
+                                                html.Div(
+                                                    className="equation-box",
+                                                    children=[static_equations['sonic_flow']]
+                                                )
+                                            ]),
+
+                                            # Subsonic Flow Equation
+                                            html.Div([
+                                                dmc.Text("Subsonic Flow:", fw=600, size="sm", mb="xs"),
+                                                html.Div(
+                                                    className="equation-box",
+                                                    children=[static_equations['subsonic_flow']]
+                                                )
+                                            ]),
+
+                                            # Critical Pressure Ratio
+                                            html.Div([
+                                                dmc.Text("Critical Pressure Ratio:", fw=600, size="sm", mb="xs"),
+                                                html.Div(
+                                                    className="equation-box",
+                                                    children=[static_equations['critical_pressure']]
+                                                )
+                                            ]),
+
+                                            # Simplified Form Section
+                                            html.Div([
+                                                dmc.Text("Simplified Forms:", fw=600, size="sm", mb="xs"),
+                                                dmc.Paper(
+                                                    p="sm",
+                                                    className="results-info-card",
+                                                    children=[
+                                                        dmc.Stack(
+                                                            gap="lg",
+                                                            children=[
+                                                                html.Div([
+                                                                    dmc.Text("For Sonic Flow:", size="sm", fw=500, mb="sm"),
+                                                                    static_equations['sonic_simplified'],
+                                                                    html.Div([
+                                                                        "where ",
+                                                                        static_equations['sonic_factor'],
+                                                                        " is the sonic flow factor"
+                                                                    ], style={"textAlign": "center", "marginTop": "0.5rem"})
+                                                                ]),
+                                                                dmc.Divider(my="xs"),
+                                                                html.Div([
+                                                                    dmc.Text("For Subsonic Flow:", size="sm", fw=500, mb="sm"),
+                                                                    static_equations['subsonic_simplified']
+                                                                ])
+                                                            ]
+                                                        )
+                                                    ]
+                                                )
+                                            ]),
+
+                                            # Flow Conditions
+                                            html.Div([
+                                                dmc.Text("Flow Conditions:", fw=600, size="sm", mb="xs"),
+                                                dmc.Paper(
+                                                    p="sm",
+                                                    className="results-info-card",
+                                                    children=[
+                                                        dmc.Stack(
+                                                            gap="md",
+                                                            children=[
+                                                                html.Div([
+                                                                    html.Strong("Sonic (Choked) Flow occurs when:", style={"display": "block", "marginBottom": "0.5rem", "color": "var(--primary-color)"}),
+                                                                    static_equations['flow_condition_sonic']
+                                                                ]),
+                                                                dmc.Divider(my="xs"),
+                                                                html.Div([
+                                                                    html.Strong("Subsonic Flow occurs when:", style={"display": "block", "marginBottom": "0.5rem", "color": "var(--primary-color)"}),
+                                                                    static_equations['flow_condition_subsonic']
+                                                                ])
+                                                            ]
+                                                        )
+                                                    ]
+                                                )
+                                            ]),
+
+                                            # Variables Legend
+                                            dmc.Paper(
+                                                p="sm",
+                                                className="results-info-card",
+                                                children=[
+                                                    dmc.Text("Where:", fw=600, size="sm", mb="xs"),
+                                                    dmc.SimpleGrid(
+                                                        cols=2,
+                                                        spacing="sm",
+                                                        children=[
+                                                            html.Div([
+                                                                html.P(variable_definitions['mdot'], className="variable-item"),
+                                                                html.P(variable_definitions['cd'], className="variable-item"),
+                                                                html.P(variable_definitions['area'], className="variable-item"),
+                                                                html.P(variable_definitions['p1'], className="variable-item"),
+                                                                html.P(variable_definitions['p2'], className="variable-item"),
+                                                            ]),
+                                                            html.Div([
+                                                                html.P(variable_definitions['gamma'], className="variable-item"),
+                                                                html.P(variable_definitions['mw'], className="variable-item"),
+                                                                html.P(variable_definitions['z'], className="variable-item"),
+                                                                html.P(variable_definitions['r'], className="variable-item"),
+                                                                html.P(variable_definitions['t1'], className="variable-item"),
+                                                            ])
+                                                        ]
+                                                    )
+                                                ]
+                                            )
+                                        ]
+                                    )
+                                ]
+                            )
+                        ]
+                    ),
+
+                    # Common Gas Properties Section
+                    dmc.Stack(
+                        gap="md",
+                        children=[
+                            dmc.Title("Common Gas Properties", order=4, className="section-title"),
+                            dmc.Paper(
+                                p="md",
+                                className="input-card",
+                                children=[
+                                    dmc.Table(
+                                        striped=True,
+                                        highlightOnHover=True,
+                                        className="tiering-table",
+                                        children=[
+                                            html.Thead([
+                                                html.Tr([
+                                                    html.Th("Gas"),
+                                                    html.Th("γ (k)"),
+                                                    html.Th("R (J/kg·K)"),
+                                                    html.Th("MW (g/mol)"),
+                                                    html.Th("Critical Pressure Ratio")
+                                                ])
+                                            ]),
+                                            html.Tbody([
+                                                html.Tr([
+                                                    html.Td("Natural Gas"),
+                                                    html.Td("1.32"),
+                                                    html.Td("518.3"),
+                                                    html.Td("16.04"),
+                                                    html.Td("0.546")
+                                                ]),
+                                                html.Tr([
+                                                    html.Td("Air"),
+                                                    html.Td("1.40"),
+                                                    html.Td("287"),
+                                                    html.Td("28.96"),
+                                                    html.Td("0.528")
+                                                ]),
+                                                html.Tr([
+                                                    html.Td("Nitrogen"),
+                                                    html.Td("1.40"),
+                                                    html.Td("296.8"),
+                                                    html.Td("28.01"),
+                                                    html.Td("0.528")
+                                                ])
+                                            ])
+                                        ]
+                                    ),
+                                    dmc.Text("* Critical pressure ratio determines if flow is sonic or subsonic", size="xs", c="dimmed", mt="xs")
+                                ]
+                            )
+                        ]
+                    ),
+
+                    # Equipment Failure Hole Sizes Section
+                    dmc.Stack(
+                        gap="md",
+                        children=[
+                            dmc.Title("Equipment Failure Hole Sizes", order=4, className="section-title"),
+                            dmc.Paper(
+                                p="md",
+                                className="input-card",
+                                children=[
+                                    dmc.Table(
+                                        striped=True,
+                                        highlightOnHover=True,
+                                        className="equipment-table",
+                                        children=[
+                                            html.Thead([
+                                                html.Tr([
+                                                    html.Th("Equipment Type"),
+                                                    html.Th("Failure"),
+                                                    html.Th("Hole Size")
+                                                ])
+                                            ]),
+                                            html.Tbody([
+                                                # Flanges header
+                                                html.Tr([
+                                                    html.Td(html.Strong("Flanges"), colSpan=3, style={"background": "rgba(212, 175, 55, 0.1)"})
+                                                ]),
+                                                # CAF
+                                                html.Tr([
+                                                    html.Td("CAF", rowSpan=2, style={"vertical-align": "middle"}),
+                                                    html.Td("Severe"),
+                                                    html.Td("1 mm × distance between 2 flange bolts")
+                                                ]),
+                                                html.Tr([
+                                                    html.Td("Small release"),
+                                                    html.Td("2.5 mm²")
+                                                ]),
+                                                # SWJ
+                                                html.Tr([
+                                                    html.Td("SWJ", rowSpan=2, style={"vertical-align": "middle"}),
+                                                    html.Td("Severe"),
+                                                    html.Td("0.05 mm × distance between 2 flange bolts")
+                                                ]),
+                                                html.Tr([
+                                                    html.Td("Small release"),
+                                                    html.Td("0.25 mm²")
+                                                ]),
+                                                # RTJ
+                                                html.Tr([
+                                                    html.Td("RTJ", rowSpan=2, style={"vertical-align": "middle"}),
+                                                    html.Td("Severe"),
+                                                    html.Td("0.05 mm × distance between 2 flange bolts")
+                                                ]),
+                                                html.Tr([
+                                                    html.Td("Small release"),
+                                                    html.Td("0.1 mm²")
+                                                ]),
+                                                # Valves header
+                                                html.Tr([
+                                                    html.Td(html.Strong("Valves"), colSpan=3, style={"background": "rgba(212, 175, 55, 0.1)"})
+                                                ]),
+                                                # < 150 mm
+                                                html.Tr([
+                                                    html.Td("< 150 mm", rowSpan=2, style={"vertical-align": "middle"}),
+                                                    html.Td("Severe"),
+                                                    html.Td("2.5 mm²")
+                                                ]),
+                                                html.Tr([
+                                                    html.Td("Small release"),
+                                                    html.Td("0.25 mm²")
+                                                ]),
+                                                # > 150 mm
+                                                html.Tr([
+                                                    html.Td("> 150 mm"),
+                                                    html.Td("All releases"),
+                                                    html.Td("0.25 mm²")
+                                                ]),
+                                                # Divider row
+                                                html.Tr([
+                                                    html.Td(
+                                                        "",
+                                                        colSpan=3,
+                                                        style={
+                                                            "padding": "0",
+                                                            "height": "2px",
+                                                            "background": "var(--border-color)",
+                                                            "border": "none"
+                                                        }
+                                                    )
+                                                ]),
+                                                # Centrifugal compressor header
+                                                html.Tr([
+                                                    html.Td([
+                                                        html.Strong("Centrifugal compressor"),
+                                                        html.Br(),
+                                                        html.Small("Note: assumed to be a 150-mm shaft. For different sizes, pro-rate the hole size by the square of the shaft diameter", style={"font-style": "italic"})
+                                                    ], rowSpan=2, style={"vertical-align": "middle"}),
+                                                    html.Td("Purged labyrinth seal"),
+                                                    html.Td("250 mm²")
+                                                ]),
+                                                html.Tr([
+                                                    html.Td("Floating ring seal"),
+                                                    html.Td("50 mm²")
+                                                ]),
+                                                # Reciprocating compressors
+                                                html.Tr([
+                                                    html.Td(html.Strong("Reciprocating compressors")),
+                                                    html.Td(""),
+                                                    html.Td("2.5 mm²")
+                                                ]),
+                                                # Small bore connections
+                                                html.Tr([
+                                                    html.Td(html.Strong("Small bore connections"), rowSpan=2, style={"vertical-align": "middle"}),
+                                                    html.Td("Failures < full bore"),
+                                                    html.Td("0.25 mm²")
+                                                ]),
+                                                html.Tr([
+                                                    html.Td("Full bore"),
+                                                    html.Td("Tubing diameter")
+                                                ]),
+                                                # Drains and sample points
+                                                html.Tr([
+                                                    html.Td(html.Strong("Drains and sample points")),
+                                                    html.Td("All"),
+                                                    html.Td("Diameter of the connection")
+                                                ])
+                                            ])
+                                        ]
+                                    ),
+                                    # Table caption
+                                    html.Div(
+                                        html.Em(
+                                            "Cox, A. W., Ang, M. L., & Lees, F. P. (1990). Standard Hole Sizes. In Classification of Hazardous Locations (pp. 132–134). Institution of Chemical Engineers."
+                                        ),
+                                        style={
+                                            "font-size": "0.85rem",
+                                            "color": "var(--text-secondary)",
+                                            "text-align": "left",
+                                            "margin-top": "0.5rem",
+                                            "padding": "0 0.5rem"
+                                        }
+                                    )
+                                ]
+                            )
+                        ]
+                    ),
+
+                    # Important Links Section
+                    dmc.Stack(
+                        gap="md",
+                        children=[
+                            dmc.Title("Important Links", order=4, className="section-title"),
+                            dmc.Paper(
+                                p="md",
+                                className="input-card",
+                                children=[
+                                    dmc.Stack(
+                                        gap="sm",
+                                        children=[
+                                            dmc.Group(
+                                                gap="xs",
+                                                children=[
+                                                    DashIconify(icon="tabler:external-link", width=16, color="#d4af37"),
+                                                    dmc.Anchor(
+                                                        "Enbridge PSE Guidelines",
+                                                        href="#",
+                                                        className="info-link"
+                                                    )
+                                                ]
+                                            ),
+                                            dmc.Group(
+                                                gap="xs",
+                                                children=[
+                                                    DashIconify(icon="tabler:external-link", width=16, color="#d4af37"),
+                                                    dmc.Anchor(
+                                                        "EnCompass Document Repository",
+                                                        href="#",
+                                                        className="info-link"
+                                                    )
+                                                ]
+                                            ),
+                                            dmc.Group(
+                                                gap="xs",
+                                                children=[
+                                                    DashIconify(icon="tabler:external-link", width=16, color="#d4af37"),
+                                                    dmc.Anchor(
+                                                        "Gas Loss Database",
+                                                        href="#",
+                                                        className="info-link"
+                                                    )
+                                                ]
+                                            ),
+                                            dmc.Group(
+                                                gap="xs",
+                                                children=[
+                                                    DashIconify(icon="tabler:mail", width=16, color="#d4af37"),
+                                                    dmc.Anchor(
+                                                        "Contact GTM Measurement Engineering",
+                                                        href="#",
+                                                        className="info-link"
+                                                    )
+                                                ]
+                                            )
+                                        ]
+                                    )
+                                ]
+                            )
+                        ]
+                    )
+                ]
+            )
+        ]
+    )
+
+
+@lru_cache(maxsize=None)
+def info_tab_json():
+    """Serialized Information tab content, built once per process"""
+    return json.dumps(create_info_tab_content(), cls=plotly.utils.PlotlyJSONEncoder)
+
+
+@lru_cache(maxsize=None)
+def info_tab_tree():
+    """Information tab content as plain JSON-ready dicts.
+
+    Returning plain dicts from a callback skips Dash walking the component
+    objects on every request; only the final json encoding remains.
+    """
+    return json.loads(info_tab_json())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Offline support: serves the service worker that caches the app shell.
+
+The worker script lives in static/service-worker.js (not assets/, where Dash
+would load it as a page script) and is served from /service-worker.js so its
+scope covers the whole app. Its cache version is a hash of the script, the
+asset files and the pre-rendered equations. Any change to those makes browsers
+install the new worker and drop the old cache.
+
+The Information tab is rendered by a callback (a POST the Cache API cannot
+store), so its response is also served as a fingerprinted GET under /offline/
+for the worker to precache and answer with when the network is unavailable.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import dash
+import flask
+
+from equation_registry import CACHE_CONTROL, EQUATION_STYLES, equations_fingerprint, equations_url
+from info_tab_component import info_tab_tree
+
+SERVICE_WORKER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'service-worker.js')
+
+# Callbacks that only depend on their inputs; the worker replays them offline
+OFFLINE_CALLBACK_OUTPUTS = ['info-tab-content']
+
+
+@lru_cache(maxsize=None)
+def service_worker_template():
+    """Service worker source with placeholders"""
+    with open(SERVICE_WORKER_FILE, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def info_tab_response():
+    """The Information tab callback response body, as Dash sends it"""
+    return json.dumps({
+        'multi': True,
+        'response': {
+            'info-tab-content': {'children': info_tab_tree()},
+            'info-tab-loaded': {'data': True},
+        },
+    }, separators=(',', ':'))
+
+
+def info_tab_response_url():
+    """Fingerprinted URL of info_tab_response()"""
+    fingerprint = hashlib.sha1(info_tab_response().encode()).hexdigest()[:12]
+    return f"/offline/info-tab.{fingerprint}.json"
+
+
+def offline_fallbacks():
+    """Precached responses the worker answers callbacks with when it has no cached reply"""
+    return {'info-tab-content': info_tab_response_url()}
+
+
+def precache_urls(app):
+    """URLs cached when the worker installs, besides the scripts linked by the page"""
+    urls = ['/', '/_dash-layout', '/_dash-dependencies', app.get_asset_url('manifest.json'),
+            info_tab_response_url()]
+    for style in EQUATION_STYLES:
+        urls.append(equations_url(style, 'json'))
+        urls.append(equations_url(style, 'html'))
+    return urls
+
+
+def cache_version(app):
+    """Hash of everything the worker caches that can change between deployments"""
+    digest = hashlib.sha1()
+    digest.update(service_worker_template().encode())
+    digest.update(dash.__version__.encode())
+    digest.update(equations_fingerprint().encode())
+    digest.update(info_tab_response_url().encode())
+    assets_folder = app.config.assets_folder
+    for name in sorted(os.listdir(assets_folder)):
+        digest.update(f"{name}:{os.path.getmtime(os.path.join(assets_folder, name))}".encode())
+    return digest.hexdigest()[:12]
+
+
+def render_service_worker(app):
+    """Service worker script for this deployment"""
+    return (
+        service_worker_template()
+        .replace('__CACHE_VERSION__', cache_version(app))
+        .replace('__PRECACHE_URLS__', json.dumps(precache_urls(app)))
+        .replace('__OFFLINE_CALLBACK_OUTPUTS__', json.dumps(OFFLINE_CALLBACK_OUTPUTS))
+        .replace('__OFFLINE_FALLBACKS__', json.dumps(offline_fallbacks()))
+    )
+
+
+def register_service_worker(app):
+    """Serve /service-worker.js from app.server"""
+    @app.server.route('/service-worker.js')
+    def service_worker():
+        response = flask.Response(render_service_worker(app), mimetype='application/javascript')
+        # Browsers must always check for a new worker
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['Service-Worker-Allowed'] = '/'
+        return response
+
+    @app.server.route('/offline/info-tab.<fingerprint>.json')
+    def offline_info_tab(fingerprint):
+        if f"/offline/info-tab.{fingerprint}.json" != info_tab_response_url():
+            flask.abort(404)
+        response = flask.Response(info_tab_response(), mimetype='application/json')
+        response.headers['Cache-Control'] = CACHE_CONTROL
+        return response
+
+    return app
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+PDF reports of saved calculations, for uploading to EnCompass.
+
+Each report shows the inputs, results, flow regime, release tier and the flow
+equations with the values used. PDFs are written directly with the standard
+PDF fonts (Helvetica and Symbol), so no font files or network access are
+needed. Reports are streamed into a zip as they complete. The web route
+renders at most WEB_MAX_REPORTS per request in its own thread; larger batches
+belong to the command line, which renders in parallel worker processes.
+
+    python pdf_reports.py                         # every saved calculation -> calculation_reports.zip
+    python pdf_reports.py --ids ID [ID ...] --out month_end.zip --processes 8
+"""
+
+import argparse
+import re
+import multiprocessing
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from unit_conversions import to_si
+from pse_engine import gas_data, critical_pressure_ratio
+from tier_classification import FLUID_CLASSES, TIER_LABELS, format_threshold, get_tier_entry
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter, points
+MARGIN = 54
+
+# Batches smaller than this are rendered in-process
+PARALLEL_MIN_REPORTS = 64
+PARALLEL_CHUNKSIZE = 16
+
+# Reports one /reports/calculations.zip request may render (in-process, no worker pool)
+WEB_MAX_REPORTS = 500
+
+GOLD = (0.83, 0.69, 0.22)
+GRAY = (0.45, 0.45, 0.45)
+
+# Characters missing from Helvetica's WinAnsi encoding, drawn from the Symbol font
+SYMBOL_CHARS = {'γ': 0x67, '√': 0xD6, '≤': 0xA3, '≥': 0xB3, '→': 0xAE, 'Δ': 0x44}
+
+# _{...} is a subscript and ^{...} a superscript in text passed to PdfDocument.text
+MARKUP = re.compile(r'([_^])\{([^{}]*)\}')
+
+
+def _pdf_string(data):
+    """PDF literal string of encoded bytes, ASCII-only"""
+    out = []
+    for byte in data:
+        if byte in (0x28, 0x29, 0x5C):  # ( ) backslash
+            out.append('\\' + chr(byte))
+        elif 32 <= byte < 127:
+            out.append(chr(byte))
+        else:
+            out.append(f'\\{byte:03o}')
+    return '(' + ''.join(out) + ')'
+
+
+def _font_segments(text):
+    """Split text into (font key, bytes) runs for Helvetica and Symbol"""
+    segments = []
+    for char in text:
+        if char in SYMBOL_CHARS:
+            key, data = 'symbol', bytes([SYMBOL_CHARS[char]])
+        elif char == 'ṁ':
+            key, data = 'mdot', b'm'
+        else:
+            key, data = 'text', char.encode('cp1252', errors='replace')
+        if segments and segments[-1][0] == key and key != 'mdot':
+            segments[-1] = (key, segments[-1][1] + data)
+        else:
+            segments.append((key, data))
+    return segments
+
+
+class PdfDocument:
+    """Minimal PDF writer: pages of text and lines in the standard fonts"""
+
+    FONTS = {'regular': 'F1', 'bold': 'F2', 'symbol': 'F3'}
+
+    def __init__(self):
+        self.pages = []
+
+    def new_page(self):
+        self.pages.append([])
+
+    def _ops(self):
+        if not self.pages:
+            self.new_page()
+        return self.pages[-1]
+
+    def text(self, x, y, markup, size=10, bold=False, color=None):
+        """Draw one line of text at (x, y); supports _{sub} and ^{sup} markup"""
+        ops = self._ops()
+        ops.append('BT')
+        if color:
+            ops.append('{:.3f} {:.3f} {:.3f} rg'.format(*color))
+        ops.append(f'{x:.2f} {y:.2f} Td')
+        text_font = self.FONTS['bold' if bold else 'regular']
+        position = 0
+        runs = []
+        for match in MARKUP.finditer(markup):
+            runs.append((markup[position:match.start()], None))
+            runs.append((match.group(2), match.group(1)))
+            position = match.end()
+        runs.append((markup[position:], None))
+        for run, kind in runs:
+            if not run:
+                continue
+            run_size = size * 0.7 if kind else size
+            rise = {'_': -0.25 * size, '^': 0.4 * size}.get(kind, 0)
+            ops.append(f'{rise:.2f} Ts')
+            for key, data in _font_segments(run):
+                font = self.FONTS['symbol'] if key == 'symbol' else text_font
+                ops.append(f'/{font} {run_size:.2f} Tf {_pdf_string(data)} Tj')
+                if key == 'mdot':
+                    # Dot over the m: back up, raise a period, then return to the end of the m
+                    ops.append(f'[() 555] TJ {rise + 0.55 * run_size:.2f} Ts (.) Tj {rise:.2f} Ts [() -278] TJ')
+        ops.append('0 Ts')
+        if color:
+            ops.append('0 g')
+        ops.append('ET')
+
+    def line(self, x1, y1, x2, y2, width=0.5, color=(0, 0, 0)):
+        """Draw a straight line"""
+        self._ops().append('{:.3f} {:.3f} {:.3f} RG {:.2f} w {:.2f} {:.2f} m {:.2f} {:.2f} l S'.format(
+            *color, width, x1, y1, x2, y2))
+
+    def to_bytes(self, title=''):
+        """Serialize the document"""
+        if not self.pages:
+            self.new_page()
+        objects = []
+
+        def add(body):
+            objects.append(body)
+            return len(objects)
+
+        catalog = add(None)
+        pages = add(None)
+        fonts = [
+            add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>'),
+            add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>'),
+            add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Symbol >>'),
+        ]
+        resources = '<< /Font << {} >> >>'.format(
+            ' '.join(f'/F{i + 1} {ref} 0 R' for i, ref in enumerate(fonts)))
+        kids = []
+        for ops in self.pages:
+            stream = zlib.compress('\n'.join(ops).encode('ascii'))
+            content = add(b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream) + stream + b'\nendstream')
+            kids.append(add(
+                f'<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+                f'/Resources {resources} /Contents {content} 0 R >>'.encode()
+            ))
+        objects[catalog - 1] = f'<< /Type /Catalog /Pages {pages} 0 R >>'.encode()
+        objects[pages - 1] = '<< /Type /Pages /Kids [{}] /Count {} >>'.format(
+            ' '.join(f'{kid} 0 R' for kid in kids), len(kids)).encode()
+        info = add('<< /Title {} /Producer (PSE Calculator) /CreationDate (D:{}) >>'.format(
+            _pdf_string(title.encode('cp1252', errors='replace')),
+            datetime.now().strftime('%Y%m%d%H%M%S')).encode())
+
+        out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(out))
+            out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+        xref = len(out)
+        out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+        for offset in offsets:
+            out += b'%010d 00000 n \n' % offset
+        out += b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+            len(objects) + 1, catalog, info, xref)
+        return bytes(out)
+
+
+class ReportWriter:
+    """Flows report lines down the page, starting new pages as needed"""
+
+    def __init__(self, document, footer):
+        self.document = document
+        self.footer = footer
+        self.y = 0
+        self.new_page()
+
+    def new_page(self):
+        self.document.new_page()
+        self.document.text(MARGIN, MARGIN - 24, self.footer, size=8, color=GRAY)
+        self.document.text(PAGE_WIDTH - MARGIN - 40, MARGIN - 24, f"Page {len(self.document.pages)}", size=8, color=GRAY)
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def ensure(self, height):
+        if self.y - height < MARGIN:
+            self.new_page()
+
+    def title(self, text, subtitle=None):
+        self.document.text(MARGIN, self.y - 18, text, size=18, bold=True)
+        self.y -= 26
+        if subtitle:
+            self.document.text(MARGIN, self.y - 12, subtitle, size=12)
+            self.y -= 18
+        self.document.line(MARGIN, self.y - 4, PAGE_WIDTH - MARGIN, self.y - 4, width=1.5, color=GOLD)
+        self.y -= 14
+
+    def section(self, text):
+        self.ensure(40)
+        self.y -= 10
+        self.document.text(MARGIN, self.y - 11, text, size=11, bold=True)
+        self.document.line(MARGIN, self.y - 15, PAGE_WIDTH - MARGIN, self.y - 15, width=0.5, color=GOLD)
+        self.y -= 24
+
+    def rows(self, rows, label_width=170):
+        for label, value in rows:
+            self.ensure(14)
+            self.document.text(MARGIN, self.y - 10, label, size=10, color=GRAY)
+            self.document.text(MARGIN + label_width, self.y - 10, value, size=10)
+            self.y -= 14
+
+    def paragraph(self, markup, size=10, bold=False, indent=0):
+        self.ensure(size + 6)
+        self.document.text(MARGIN + indent, self.y - size, markup, size=size, bold=bold)
+        self.y -= size + 6
+
+
+def _number(value, digits=4):
+    """Format a number for the report"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    if value != 0 and (abs(value) >= 1e6 or abs(value) < 1e-3):
+        return f"{value:.{digits}e}"
+    return f"{value:,.{digits}f}"
+
+
+def calculation_report(record):
+    """PDF bytes of the report for one saved calculation record"""
+    results = record.get('results') or {}
+    title = record.get('calculation_title') or 'Untitled calculation'
+    generated = datetime.now().strftime('%Y-%m-%d %H:%M')
+    document = PdfDocument()
+    writer = ReportWriter(document, f"PSE Calculator - generated {generated}")
+    writer.title("PSE Calculation Report", title)
+    writer.rows([
+        ("Prepared by", record.get('user_name') or ''),
+        ("Saved", record.get('timestamp') or ''),
+        ("Calculation ID", record.get('id') or ''),
+        ("Scenario", record.get('scenario') or ''),
+        ("Engine version", results.get('engine_version', '')),
+    ])
+
+    writer.section("Inputs")
+    writer.rows([
+        ("Gas", record.get('gas')),
+        ("Release type", record.get('release_type')),
+        ("Site", record.get('site')),
+        ("Upstream pressure P_{1}", f"{_number(record.get('p0'), 3)} {record.get('p0_unit')}"),
+        ("Downstream pressure P_{2}", f"{_number(record.get('p2'), 3)} {record.get('p2_unit')}"),
+        ("Upstream temperature T_{1}", f"{_number(record.get('t0'), 2)} {record.get('t0_unit')}"),
+        ("Orifice area A", f"{_number(record.get('area'), 4)} {record.get('area_unit')}"),
+        ("Release duration", f"{_number(record.get('duration'), 2)} {record.get('duration_unit')}"),
+        ("Discharge coefficient C_{d}", str(record.get('cd'))),
+    ])
+
+    writer.section("Results")
+    if 'error' in results or not results:
+        writer.paragraph(f"No results: {results.get('error', 'not calculated')}", bold=True)
+    else:
+        writer.rows([
+            ("Mass flow rate", f"{_number(results['flow_kgs'], 6)} kg/s   ({_number(results['flow_lbs'], 6)} lb/s)"),
+            ("Volumetric flow rate", f"{_number(results['flow_mscf'], 4)} MSCF/hr   ({_number(results['flow_stm3'], 3)} st m³/hr)"),
+            ("Total release", f"{_number(results['total_kg'], 3)} kg   ({_number(results['total_lb'], 3)} lb)"),
+            ("Total release volume", f"{_number(results['total_mscf'], 4)} MSCF   ({_number(results['total_stm3'], 3)} st m³)"),
+            ("Flow regime", results['flow_status']),
+            ("Release tier", results['release_tier']),
+        ])
+        fluid_class = gas_data.get(record.get('gas'), {}).get('fluid_class')
+        entry = get_tier_entry(record.get('site'), record.get('release_type'), fluid_class)
+        if entry:
+            basis = "released within one hour" if entry['window_seconds'] else "total release"
+            rows = [("Service fluid class", FLUID_CLASSES[fluid_class])]
+            rows += [(f"Tier {tier} threshold",
+                      ' or '.join(format_threshold(value, unit) for unit, value in criteria.items()) + f" ({basis})")
+                     for tier, criteria in sorted(entry['thresholds'].items())]
+            # The criterion that set the tier, when a threshold was met
+            tier = next((tier for tier, label in TIER_LABELS.items() if label == results['release_tier']), 0)
+            unit = results.get('tier_criterion')
+            if unit in entry['thresholds'].get(tier, {}):
+                rows.append(("Threshold met", format_threshold(entry['thresholds'][tier][unit], unit)))
+            writer.rows(rows)
+
+    gas = gas_data.get(record.get('gas'))
+    writer.section("Equations")
+    writer.paragraph("Critical pressure ratio:", bold=True)
+    writer.paragraph("P_{2}/P_{1} ≤ (2/(γ+1))^{γ/(γ-1)}  → sonic (choked) flow, otherwise subsonic", indent=12)
+    writer.paragraph("Sonic (choked) flow:", bold=True)
+    writer.paragraph("ṁ_{choked} = C_{d} · A · P_{1} · √(γ / (R · T_{1})) · K_{sonic},   "
+                     "K_{sonic} = (2/(γ+1))^{(γ+1)/(2(γ-1))}", indent=12)
+    writer.paragraph("Subsonic flow:", bold=True)
+    writer.paragraph("ṁ = C_{d} · A · P_{1} · √(2γ / ((γ-1) · R · T_{1})) · "
+                     "√((P_{2}/P_{1})^{2/γ} - (P_{2}/P_{1})^{(γ+1)/γ})", indent=12)
+    if gas:
+        try:
+            P1 = float(to_si(record.get('p0'), record.get('p0_unit')))
+            P2 = float(to_si(record.get('p2'), record.get('p2_unit')))
+            T1 = float(to_si(record.get('t0'), record.get('t0_unit')))
+            A = float(to_si(record.get('area'), record.get('area_unit')))
+        except (TypeError, ValueError, KeyError):
+            P1 = None
+        if P1:
+            ratio = P2 / P1
+            critical = float(critical_pressure_ratio(gas['gamma']))
+            comparison = "≤" if ratio <= critical else ">"
+            regime = "sonic (choked)" if ratio <= critical else "subsonic"
+            writer.section("Values used (SI)")
+            writer.rows([
+                ("C_{d}, A", f"{record.get('cd')}, {_number(A, 6)} m²"),
+                ("P_{1}, P_{2}", f"{_number(P1, 1)} Pa abs, {_number(P2, 1)} Pa abs"),
+                ("T_{1}", f"{_number(T1, 2)} K"),
+                ("γ, R, M", f"{gas['gamma']}, {gas['R']} J/kg·K, {gas['MW']} kg/kmol"),
+                ("Pressure ratio", f"P_{{2}}/P_{{1}} = {ratio:.4f} {comparison} {critical:.4f}  → {regime} equation applied"),
+            ])
+    return document.to_bytes(title=title)
+
+
+def report_filename(record):
+    """Zip member name for a record's report"""
+    title = re.sub(r'[^A-Za-z0-9]+', '_', record.get('calculation_title') or 'calculation').strip('_')
+    date = (record.get('timestamp') or '')[:10] or 'undated'
+    return f"{date}_{title[:60]}_{(record.get('id') or '')[:8]}.pdf"
+
+
+def render_reports(records, processes=None):
+    """Yield (filename, pdf bytes) for each record, in order, rendering in parallel for large batches"""
+    if len(records) < PARALLEL_MIN_REPORTS or processes == 1:
+        for record in records:
+            yield report_filename(record), calculation_report(record)
+        return
+    # spawn: safe to start from a threaded server worker
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+        for record, pdf in zip(records, executor.map(calculation_report, records, chunksize=PARALLEL_CHUNKSIZE)):
+            yield report_filename(record), pdf
+
+
+class _ZipStream:
+    """Write-only file object collecting zip output for streaming"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_reports_zip(records, processes=None):
+    """Yield a zip of all reports chunk by chunk, as each PDF is rendered"""
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for filename, pdf in render_reports(records, processes):
+            # PDF content streams are already deflated
+            archive.writestr(filename, pdf)
+            yield stream.drain()
+    yield stream.drain()
+
+
+def register_report_routes(server):
+    """Serve /reports/<id>.pdf and /reports/calculations.zip[?ids=a,b] from the Flask server"""
+    import flask
+    from calculation_store import load_calculations_from_file
+
+    @server.route('/reports/<calc_id>.pdf')
+    def calculation_pdf(calc_id):
+        record = next((r for r in load_calculations_from_file() if r.get('id') == calc_id), None)
+        if record is None:
+            flask.abort(404)
+        response = flask.Response(calculation_report(record), mimetype='application/pdf')
+        response.headers['Content-Disposition'] = f'attachment; filename="{report_filename(record)}"'
+        return response
+
+    @server.route('/reports/calculations.zip')
+    def calculations_zip():
+        records = load_calculations_from_file()
+        ids = flask.request.args.get('ids')
+        if ids:
+            wanted = set(ids.split(','))
+            records = [r for r in records if r.get('id') in wanted]
+        if len(records) > WEB_MAX_REPORTS:
+            flask.abort(413, f"At most {WEB_MAX_REPORTS} reports per download: select fewer with ?ids= "
+                             "or run pdf_reports.py on the server")
+        filename = f"calculation_reports_{datetime.now():%Y%m%d}.zip"
+        response = flask.Response(stream_reports_zip(records, processes=1), mimetype='application/zip')
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    return server
+
+
+if __name__ == "__main__":
+    from calculation_store import load_calculations_from_file
+
+    parser = argparse.ArgumentParser(description="Render PDF reports of saved calculations into a zip")
+    parser.add_argument('--ids', nargs='*', help="only these calculation ids")
+    parser.add_argument('--out', default='calculation_reports.zip')
+    parser.add_argument('--processes', type=int, default=None, help="worker processes (default: all CPUs)")
+    args = parser.parse_args()
+
+    records = load_calculations_from_file()
+    if args.ids:
+        records = [r for r in records if r.get('id') in set(args.ids)]
+    with open(args.out, 'wb') as f:
+        for chunk in stream_reports_zip(records, args.processes):
+            f.write(chunk)
+    print(f"Wrote {len(records)} reports to {args.out}")
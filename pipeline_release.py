@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Full-bore pipe rupture: line-pack depressurization of an isolated pipe segment.
+
+The segment (inside diameter D, length L) is packed at P0 and T0 and ruptures
+to P2 at one end, or at both ends of its two halves (double-ended). The gas
+is treated as isothermal at T0. The discharge rate at a pack pressure P is the
+lesser of:
+
+    choked (Fanno) flow   m = Cd A P sqrt(γ/(R T)) M1 (1 + (γ-1)/2 M1²)^(-(γ+1)/(2(γ-1)))
+                          with the inlet Mach number M1 set by f L / D
+    friction-limited flow m = Cd A sqrt(D (P² - P2²) / (f L R T))
+
+with the Darcy friction factor f of fully rough turbulent flow. The blowdown
+is integrated over pressure, not time: between pack pressures P_k > P_k+1
+the time taken is ΔM / m(P_mid), so every segment of a batch is integrated
+in one array pass with no time-step stability limit, and the released mass
+at any time is read off the resulting curve. Flow only falls as the pack
+empties, so the largest release in any threshold window is the first one.
+
+Kept free of Dash imports; pipeline_release_batch evaluates many segments
+at once and pipeline_release one segment in the calculator's output units.
+"""
+
+import numpy as np
+
+from pse_engine import convert_flow_all_units, gas_data, gas_indices, gas_table
+from tier_classification import (
+    CRITERIA_UNITS, TIER_COLORS, TIER_LABELS, classify_tiers, criterion_label, get_tier_entry,
+)
+
+# Commercial steel pipe wall roughness (m)
+DEFAULT_ROUGHNESS = 4.5e-5
+
+# Pack pressure levels per segment: the excess over P2 falls geometrically to this fraction
+PRESSURE_LEVELS = 256
+FINAL_EXCESS = 1e-6
+
+# Fraction of the line pack whose release time is reported as the blowdown time
+BLOWDOWN_FRACTION = 0.95
+
+RUPTURE_ENDS = {1: "Single-ended", 2: "Double-ended"}
+
+
+def darcy_friction_factor(diameter, roughness=DEFAULT_ROUGHNESS):
+    """Fully rough turbulent Darcy friction factor (von Kármán)"""
+    relative = np.asarray(roughness, dtype=float) / np.asarray(diameter, dtype=float)
+    return (2 * np.log10(3.7 / relative)) ** -2
+
+
+def fanno_inlet_mach(fld, gamma, iterations=60):
+    """Inlet Mach number of an adiabatic pipe choked at its exit, for f L / D (vectorized bisection)"""
+    fld, gamma = np.broadcast_arrays(np.asarray(fld, dtype=float), np.asarray(gamma, dtype=float))
+    low = np.full(fld.shape, np.log(1e-6))
+    high = np.zeros(fld.shape)
+    for _ in range(iterations):
+        mid = 0.5 * (low + high)
+        m2 = np.exp(2 * mid)
+        f = (1 - m2) / (gamma * m2) + (gamma + 1) / (2 * gamma) * np.log((gamma + 1) * m2 / (2 + (gamma - 1) * m2))
+        # f falls as M rises: too much friction left means M must grow
+        low = np.where(f > fld, mid, low)
+        high = np.where(f > fld, high, mid)
+    return np.exp(0.5 * (low + high))
+
+
+def _discharge(P, P2, T0, area, diameter, fl, mach, gamma, R, cd):
+    """Discharge rate (kg/s) at pack pressure P, and whether it is the choked limit"""
+    choked = (cd * area * P * np.sqrt(gamma / (R * T0)) * mach
+              * (1 + (gamma - 1) / 2 * mach ** 2) ** (-(gamma + 1) / (2 * (gamma - 1))))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        friction = cd * area * np.sqrt(np.maximum(P ** 2 - P2 ** 2, 0) * diameter / (fl * R * T0))
+    friction = np.where(fl > 0, friction, np.inf)
+    return np.minimum(choked, friction), choked <= friction
+
+
+def _released_at(times, released, t):
+    """Released mass at time t on each row's (time, mass) curve"""
+    t = np.asarray(t, dtype=float)[:, None]
+    k = np.clip((times <= t).sum(axis=1), 1, times.shape[1] - 1)
+    rows = np.arange(times.shape[0])
+    t0, t1 = times[rows, k - 1], times[rows, k]
+    m0, m1 = released[rows, k - 1], released[rows, k]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction = np.clip((t[:, 0] - t0) / (t1 - t0), 0, 1)
+    return np.where(np.isfinite(fraction), m0 + fraction * (m1 - m0), m1)
+
+
+def pipeline_release_batch(gas, P0, P2, T0, diameter, length, duration_seconds, site, release_type,
+                           ends=1, roughness=DEFAULT_ROUGHNESS, cd=1.0):
+    """Blowdown of many pipe segments in one pass (SI inputs; scalars or arrays).
+
+    gas, site and release_type are names or arrays of names. Returns a dict of
+    arrays: the convert_flow_all_units fields (flow rates at rupture, totals
+    released over the duration), line_pack_kg, blowdown_seconds (to release
+    BLOWDOWN_FRACTION of the line pack), choked (at rupture), valid, and the
+    classify_tiers tiers and criteria. Invalid rows are NaN with tier 0.
+    """
+    P0, P2, T0, diameter, length, duration_seconds, ends, roughness, cd = (
+        np.atleast_1d(np.asarray(x, dtype=float))
+        for x in (P0, P2, T0, diameter, length, duration_seconds, ends, roughness, cd))
+    n = max(x.shape[0] for x in (P0, P2, T0, diameter, length, duration_seconds, ends, roughness, cd,
+                                  np.atleast_1d(gas)))
+    P0, P2, T0, diameter, length, duration_seconds, ends, roughness, cd = np.broadcast_arrays(
+        *(np.broadcast_to(x, (n,)) for x in (P0, P2, T0, diameter, length, duration_seconds, ends, roughness, cd)))
+    gases = [gas] * n if isinstance(gas, str) else list(gas)
+    table = gas_table()
+    idx = gas_indices(gases)
+    gamma, R = table['gamma'][idx], table['R'][idx]
+
+    valid = ((P0 > P2) & (P2 > 0) & (T0 > 0) & (diameter > 0) & (length > 0) & (duration_seconds > 0)
+             & (ends >= 1) & (roughness > 0) & (cd > 0))
+    # Each rupture end drains its own share of the segment
+    length_per_end = np.where(valid, length / ends, 1.0)
+    diameter = np.where(valid, diameter, 1.0)
+    area = np.pi * diameter ** 2 / 4
+    fl = darcy_friction_factor(diameter, roughness) * length_per_end
+    mach = fanno_inlet_mach(fl / diameter, gamma)
+    # Mass per pascal of pack pressure, all ends together
+    pack = ends * area * length_per_end / (R * T0)
+
+    # Pack pressures from P0 down to just above P2, levels across, segments down
+    excess = np.geomspace(1, FINAL_EXCESS, PRESSURE_LEVELS)
+    P = P2[:, None] + (P0 - P2)[:, None] * excess[None, :]
+    column = (slice(None), None)
+    P_mid = 0.5 * (P[:, 1:] + P[:, :-1])
+    flow_mid, _ = _discharge(P_mid, P2[column], T0[column], area[column], diameter[column], fl[column],
+                             mach[column], gamma[column], R[column], cd[column])
+    flow_mid = flow_mid * ends[column]
+    released = (P0[column] - P) * pack[column]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        steps = np.diff(released, axis=1) / flow_mid
+    times = np.concatenate([np.zeros((n, 1)), np.cumsum(steps, axis=1)], axis=1)
+
+    flow0, choked = _discharge(P0, P2, T0, area, diameter, fl, mach, gamma, R, cd)
+    flow0 = flow0 * ends
+    released_kg = _released_at(times, released, duration_seconds)
+    line_pack_kg = (P0 - P2) * pack
+
+    # Flow rates at rupture; totals from the mass released over the duration
+    outputs = convert_flow_all_units(flow0, gases, duration_seconds)
+    totals = convert_flow_all_units(released_kg / duration_seconds, gases, duration_seconds)
+    for field in ('total_kg', 'total_lb', 'total_mscf', 'total_stm3'):
+        outputs[field] = totals[field]
+
+    # Tier on the release in the first threshold window (or the whole duration)
+    fluid_class = table['fluid_class'][idx]
+    sites = np.broadcast_to(np.asarray(site, dtype=str), (n,))
+    release_types = np.broadcast_to(np.asarray(release_type, dtype=str), (n,))
+    windows = np.array([
+        (get_tier_entry(s, r, c) or {}).get('window_seconds') or np.inf
+        for s, r, c in zip(sites, release_types, fluid_class)
+    ], dtype=float)
+    counted = np.minimum(duration_seconds, windows)
+    counted_kg = _released_at(times, released, counted)
+    tiers, criteria = classify_tiers(convert_flow_all_units(counted_kg / counted, gases, counted), counted,
+                                     sites, release_types, fluid_class)
+
+    outputs.update({
+        'line_pack_kg': line_pack_kg,
+        'blowdown_seconds': _time_to_release(times, released, BLOWDOWN_FRACTION * line_pack_kg),
+        'choked': choked,
+        'valid': valid,
+        'tiers': np.where(valid, tiers, 0),
+        'criteria': np.where(valid, criteria, -1),
+    })
+    for field, values in outputs.items():
+        if values.dtype.kind == 'f':
+            outputs[field] = np.where(valid, values, np.nan)
+    return outputs
+
+
+def _time_to_release(times, released, mass):
+    """Time at which each row's curve reaches the given released mass"""
+    mass = np.asarray(mass, dtype=float)[:, None]
+    k = np.clip((released < mass).sum(axis=1), 1, released.shape[1] - 1)
+    rows = np.arange(released.shape[0])
+    m0, m1 = released[rows, k - 1], released[rows, k]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction = np.clip((mass[:, 0] - m0) / (m1 - m0), 0, 1)
+        return times[rows, k - 1] + np.nan_to_num(fraction) * (times[rows, k] - times[rows, k - 1])
+
+
+def pipeline_release(gas, release_type, site, P0, P2, T0, diameter, length, duration_seconds,
+                     ends=1, roughness=DEFAULT_ROUGHNESS, cd=1.0):
+    """Blowdown of one pipe segment (SI inputs) as floats, with the tier label, colour and trigger.
+
+    Raises ValueError for inputs the model cannot use.
+    """
+    if gas not in gas_data:
+        raise ValueError(f"Unknown gas: {gas}")
+    outputs = pipeline_release_batch(gas, P0, P2, T0, diameter, length, duration_seconds, site, release_type,
+                                     ends, roughness, cd)
+    if not outputs['valid'][0]:
+        raise ValueError("Pipe rupture needs P0 above P2 and positive diameter, length and duration")
+    result = {field: float(values[0]) for field, values in outputs.items() if values.dtype.kind == 'f'}
+    tier, criterion = int(outputs['tiers'][0]), int(outputs['criteria'][0])
+    result.update({
+        'flow_status': "SONIC (CHOKED)" if outputs['choked'][0] else "SUBSONIC",
+        'release_tier': TIER_LABELS[tier],
+        'tier_color': TIER_COLORS[tier],
+        'tier_criterion': CRITERIA_UNITS[criterion] if criterion >= 0 else None,
+        'tier_trigger': criterion_label(site, release_type, tier, criterion, gas_data[gas]['fluid_class']),
+    })
+    return result
+
+
+if __name__ == "__main__":
+    # Example: 10 km of NPS 12 (0.3 m ID) at 70 bar(g), double-ended, over 1 hour
+    from unit_conversions import to_si
+
+    result = pipeline_release('Natural Gas', 'Outdoor', 'GTM US', to_si(70, 'bar(g)'), to_si(0, 'bar(g)'),
+                              to_si(15, '°C'), 0.3, 10_000, 3600, ends=2)
+    for key, value in result.items():
+        print(f"{key:>18}: {value:,.4g}" if isinstance(value, float) else f"{key:>18}: {value}")
@@ -1,199 +1,69 @@
+from startup_profile import mark, profile_phase
 import dash
-from dash import dcc, html, Input, Output, State, callback_context
+from dash import dcc, html, Input, Output, State, ClientsideFunction
 import dash_mantine_components as dmc
-import dash_ag_grid as dag
 from dash_iconify import DashIconify
 import numpy as np
-import pandas as pd
-import json
 from datetime import datetime
+from functools import lru_cache
 import uuid
-import os
-from create_static_equations import equations as static_equations, variable_definitions
 from equipment_table_component import create_equipment_table_mini
+from info_tab_component import info_tab_tree
+from unit_conversions import to_si, normalize_unit, unit_options, unit_scales
+from pse_engine import (
+    gas_data, mass_flow_rate, convert_flow_all_units, critical_pressure_ratio,
+    reverse_area_solution
+)
+from tier_classification import FLUID_CLASSES, classify_tier, tier_sites
+from calculation_store import load_calculations_from_file, update_calculations_file, with_results
+from callback_metrics import instrument_callbacks
+from http_caching import install_http_caching
+from offline_support import register_service_worker
+from health_checks import register_health_endpoints
+from equation_registry import register_equation_routes
+from pdf_reports import calculation_report, report_filename, register_report_routes
+from gas_loss_export import register_export_routes
+from compare_component import create_comparison
+from timeseries_replay import register_replay_routes
+from pipeline_release import BLOWDOWN_FRACTION, RUPTURE_ENDS, pipeline_release
 
-# Gas properties: gamma (γ), R (J/kg·K), molecular weight (g/mol)
-gas_data = {
-    'Air': {'gamma': 1.4, 'R': 287, 'MW': 28.96},
-    'Nitrogen': {'gamma': 1.4, 'R': 296.8, 'MW': 28.01},
-    'Oxygen': {'gamma': 1.4, 'R': 259.8, 'MW': 32.0},
-    'Helium': {'gamma': 1.66, 'R': 2077, 'MW': 4.0},
-    'Hydrogen': {'gamma': 1.41, 'R': 4124, 'MW': 2.02},
-    'CO2': {'gamma': 1.29, 'R': 188.9, 'MW': 44.01},
-    'Natural Gas': {'gamma': 1.32, 'R': 518.3, 'MW': 16.04},
-    'Argon': {'gamma': 1.67, 'R': 208.1, 'MW': 39.95},
-}
+mark('imports')
 
-# Unit conversion factors
-pressure_units = {
-    'bar(g)': 1e5,       # to Pa
-    'psi(g)': 6894.76,   # to Pa
-    'kPa(g)': 1e3,       # to Pa
-    'MPa(g)': 1e6,       # to Pa
-}
+# Initialize the Dash app
+app = dash.Dash(
+    __name__,
+    external_stylesheets=[
+        "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap",
+    ],
+    suppress_callback_exceptions=True
+)
 
-temperature_units = {
-    '°C': lambda t: t + 273.15,       # to K
-    '°F': lambda t: (t - 32) * 5/9 + 273.15,  # to K
-    'K': lambda t: t,                 # already K
-}
+# Compress responses and mark fingerprinted static files immutable. Registered
+# before the metrics hook so payload metrics see uncompressed sizes.
+install_http_caching(app)
 
-area_units = {
-    'mm²': 1e-6,    # to m²
-    'cm²': 1e-4,    # to m²
-    'in²': 6.4516e-4,  # to m²
-    'm²': 1,        # already m²
-}
+# Record latency and payload size of every callback declared below (/metrics)
+instrument_callbacks(app)
 
-time_units = {
-    'sec': 1,         # to seconds
-    'min': 60,        # to seconds
-    'hr': 3600,       # to seconds
-}
+# Pre-rendered equations as long-cached static JSON/HTML (/equations/...)
+register_equation_routes(app.server)
 
-# Output unit conversion functions
-def convert_output_units(mdot_kgs, gas, unit):
-    if unit == 'kg/s':
-        return mdot_kgs, 'kg'
-    elif unit == 'lb/s':
-        return mdot_kgs * 2.20462, 'lb'
-    elif unit == 'MSCF/hr':
-        R_universal = 8314.5  # J/(kmol·K)
-        MW = gas_data[gas]['MW']  # g/mol = kg/kmol
-        std_temp = 288.71  # K (60°F)
-        std_press = 101325  # Pa (1 atm)
-        density = std_press * MW / (R_universal * std_temp)  # kg/m³
-        vol_flow_m3_s = mdot_kgs / density  # m³/s
-        scf_s = vol_flow_m3_s * 35.3147  # ft³/s
-        return scf_s * 3600 / 1000, 'MSCF'  # MSCF/hr
-    elif unit == 'st m³/hr':
-        R_universal = 8314.5  # J/(kmol·K)
-        MW = gas_data[gas]['MW']  # g/mol = kg/kmol
-        std_temp = 288.15  # K (15°C)
-        std_press = 101325  # Pa (1 atm)
-        density = std_press * MW / (R_universal * std_temp)  # kg/m³
-        vol_flow_m3_s = mdot_kgs / density  # m³/s
-        return vol_flow_m3_s * 3600, 'st m³'  # m³/hr
-
-ATM_PRESSURE = 101325  # Pa (standard atmospheric pressure)
-
-def mass_flow_rate(Cd, A, P0, P2, T0, gamma, R):
-    # Sonic (choked) condition
-    critical_pressure_ratio = (2 / (gamma + 1)) ** (gamma / (gamma - 1))
-    if P2 / P0 <= critical_pressure_ratio:
-        mdot = (
-            Cd * A * P0 * np.sqrt(gamma / (R * T0)) *
-            ((2 / (gamma + 1)) ** ((gamma + 1) / (2 * (gamma - 1))))
-        )
-    else:
-        mdot = (
-            Cd * A * P0 * np.sqrt(
-                2 * gamma / (R * T0 * (gamma - 1)) *
-                ((P2 / P0) ** (2 / gamma) - (P2 / P0) ** ((gamma + 1) / gamma))
-            )
-        )
-    return mdot
+# Service worker that caches the app shell for offline use (/service-worker.js)
+register_service_worker(app)
 
-def calculate_required_area(target_tier, release_type, site, duration_seconds, Cd, P0, P2, T0, gamma, R, gas):
-    """Calculate the required orifice area to achieve a target tier"""
-    if site != "GTM US":
-        return None, "Tier calculation only available for GTM US"
-    
-    # Determine target flow rate or total release based on tier and type
-    if release_type == "Indoor":
-        if duration_seconds > 3600:  # Greater than 1 hour - use flow rate thresholds
-            if target_tier == "1":
-                target_flow_rate_mscf = 2.47 * 1.0001  # Slightly above minimum for Tier 1
-            elif target_tier == "2":
-                target_flow_rate_mscf = 1.41 * 1.0001  # Slightly above minimum for Tier 2
-            
-            # Convert MSCF/hr to kg/s
-            R_universal = 8314.5
-            MW = gas_data[gas]['MW']
-            std_temp = 288.71  # K (60°F)
-            std_press = 101325  # Pa (1 atm)
-            density = std_press * MW / (R_universal * std_temp)  # kg/m³
-            target_mdot_kgs = (target_flow_rate_mscf * 1000 / 3600) / 35.3147 * density
-        else:  # Less than 1 hour - use total release thresholds
-            if target_tier == "1":
-                target_total_mscf = 2.47 * 1.0001  # Slightly above minimum for Tier 1
-            elif target_tier == "2":
-                target_total_mscf = 1.41 * 1.0001  # Slightly above minimum for Tier 2
-            
-            # Convert to flow rate for calculation
-            target_flow_rate_mscf = target_total_mscf * 3600 / duration_seconds
-            
-            # Convert to kg/s
-            R_universal = 8314.5
-            MW = gas_data[gas]['MW']
-            std_temp = 288.71
-            std_press = 101325
-            density = std_press * MW / (R_universal * std_temp)
-            target_mdot_kgs = (target_flow_rate_mscf * 1000 / 3600) / 35.3147 * density
-    
-    elif release_type == "Outdoor":
-        if target_tier == "1":
-            target_total_mscf = 3000 * 1.0001  # Slightly above minimum for Tier 1
-        elif target_tier == "2":
-            target_total_mscf = 300 * 1.0001  # Slightly above minimum for Tier 2
-        
-        # Convert to flow rate
-        target_flow_rate_mscf = target_total_mscf * 3600 / duration_seconds
-        
-        # Convert to kg/s
-        R_universal = 8314.5
-        MW = gas_data[gas]['MW']
-        std_temp = 288.71
-        std_press = 101325
-        density = std_press * MW / (R_universal * std_temp)
-        target_mdot_kgs = (target_flow_rate_mscf * 1000 / 3600) / 35.3147 * density
-    
-    # Calculate required area by rearranging mass flow equation
-    critical_pressure_ratio = (2 / (gamma + 1)) ** (gamma / (gamma - 1))
-    
-    if P2 / P0 <= critical_pressure_ratio:  # Sonic flow
-        denominator = Cd * P0 * np.sqrt(gamma / (R * T0)) * ((2 / (gamma + 1)) ** ((gamma + 1) / (2 * (gamma - 1))))
-        required_area = target_mdot_kgs / denominator
-    else:  # Subsonic flow
-        flow_term = np.sqrt(2 * gamma / (R * T0 * (gamma - 1)) * ((P2 / P0) ** (2 / gamma) - (P2 / P0) ** ((gamma + 1) / gamma)))
-        denominator = Cd * P0 * flow_term
-        required_area = target_mdot_kgs / denominator
-    
-    return required_area, None
+# Liveness and readiness probes (/healthz, /readyz)
+register_health_endpoints(app)
 
-# File path for persistent storage
-CALCULATIONS_FILE = 'saved_calculations.json'
+# PDF reports of saved calculations (/reports/<id>.pdf, /reports/calculations.zip)
+register_report_routes(app.server)
 
-# Utility functions for data persistence
-def load_calculations_from_file():
-    """Load calculations from JSON file"""
-    try:
-        if os.path.exists(CALCULATIONS_FILE):
-            with open(CALCULATIONS_FILE, 'r') as f:
-                return json.load(f)
-        return []
-    except Exception as e:
-        print(f"Error loading calculations: {e}")
-        return []
+# Bulk export and change feed for the gas loss database (/export/...)
+register_export_routes(app.server)
 
-def save_calculations_to_file(data):
-    """Save calculations to JSON file"""
-    try:
-        with open(CALCULATIONS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
-        return True
-    except Exception as e:
-        print(f"Error saving calculations: {e}")
-        return False
+# Release totals from recorded pressure series, streamed as CSV (/replay)
+register_replay_routes(app.server)
 
-# Initialize the Dash app
-app = dash.Dash(
-    __name__,
-    external_stylesheets=[
-        "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap",
-    ],
-    suppress_callback_exceptions=True
-)
+mark('app')
 
 # Custom CSS for Enbridge theme - now loaded from external file
 app.index_string = '''
@@ -209,7 +79,6 @@ app.index_string = '''
         <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
         {%favicon%}
         {%css%}
-        <link rel="stylesheet" href="/assets/main.css">
     </head>
     <body>
         {%app_entry%}
@@ -217,1240 +86,1075 @@ app.index_string = '''
             {%config%}
             {%scripts%}
             {%renderer%}
+            <script>
+                if ('serviceWorker' in navigator) {
+                    window.addEventListener('load', function () {
+                        navigator.serviceWorker.register('/service-worker.js');
+                    });
+                }
+            </script>
         </footer>
     </body>
 </html>
 '''
 
+# Unit scales for the clientside area <-> diameter conversions
+ORIFICE_UNIT_SCALES = {'area': unit_scales('area'), 'length': unit_scales('length')}
+
+# Displayed results: (flow field, unit label) in card order, first the flow
+# rates then the total release
+RESULT_DISPLAY_FIELDS = [
+    ('flow_kgs', "kg/s"), ('flow_lbs', "lb/s"), ('flow_mscf', "MSCF/hr"), ('flow_stm3', "st m³/hr"),
+    ('total_kg', "kg"), ('total_lb', "lb"), ('total_mscf', "MSCF"), ('total_stm3', "st m³"),
+]
+
+# Debounce delay of the live (what-if) mode, in milliseconds
+LIVE_DEBOUNCE_MS = 300
+
+# Style of a results component with nothing to show
+HIDDEN = {'display': 'none'}
+
+# Results panel as first rendered, as {component id: {prop: value}}; lists every
+# prop the results callbacks set. results-display holds what is on screen.
+RESULTS_INITIAL_DISPLAY = {
+    'status-badge': {'children': "Ready", 'color': "gray"},
+    'results-placeholder': {'style': {}},
+    'results-error': {'children': "", 'style': HIDDEN},
+    'results-card': {'style': HIDDEN},
+    'result-flow-status': {'children': "", 'className': "status-badge-blue"},
+    'result-tier': {'children': "N/A", 'className': "tier-badge-gray", 'style': HIDDEN},
+    'result-tier-trigger': {'children': "", 'style': HIDDEN},
+    'result-note': {'children': "", 'style': HIDDEN},
+    'save-calc-btn': {'disabled': False},
+    **{f'result-{field}': {'children': ""} for field, _ in RESULT_DISPLAY_FIELDS},
+}
+
+# Visibility props with a calculated result on screen
+RESULTS_SHOWN = {
+    'results-placeholder': {'style': HIDDEN},
+    'results-error': {'style': HIDDEN},
+    'results-card': {'style': {}},
+}
+
+@lru_cache(maxsize=None)
+def get_ag_grid():
+    """Import dash_ag_grid on first use; only the Saved Calculations grid needs it"""
+    import dash_ag_grid
+    return dash_ag_grid
+
+
 # App layout with Mantine Provider
-app.layout = dmc.MantineProvider(
-    theme={
-        "colorScheme": "dark",
-        "primaryColor": "yellow",
-        "fontFamily": "'Inter', sans-serif",
-    },
-    children=[
-        # Store components
-        dcc.Store(id='calculations-store', data=load_calculations_from_file()),
-        dcc.Store(id='current-calculation-id', data=None),
-        
-        # Header
-        dmc.Paper(
-            p="md",
-            className="app-header",
-            children=[
-                dmc.Container(
-                    size="xl",
-                    children=[
-                        dmc.Group(
-                            justify="space-between",
-                            children=[
-                                dmc.Group(
-                                    gap="md",
-                                    children=[
-                                        dmc.ThemeIcon(
-                                            DashIconify(icon="mdi:gas-cylinder", width=28),
-                                            size=44,
-                                            radius="md",
-                                            variant="gradient",
-                                            gradient={"from": "yellow", "to": "orange"}
-                                        ),
-                                        dmc.Stack(
-                                            gap=0,
-                                            children=[
-                                                dmc.Title("PSE Flow Calculator", order=3),
-                                                dmc.Text("Gas Orifice Mass Flow Analysis", size="sm", c="dimmed")
-                                            ]
-                                        )
-                                    ]
-                                ),
-                                dmc.Badge(
-                                    "ENBRIDGE",
-                                    size="lg",
-                                    radius="sm",
-                                    variant="gradient",
-                                    gradient={"from": "yellow", "to": "orange"}
-                                )
-                            ]
-                        )
-                    ]
-                )
-            ]
-        ),
-        
-        # Main content
-        dmc.Container(
-            size="xl",
-            children=[
-                dmc.Tabs(
-                    id="main-tabs",
-                    value="calculator",
-                    children=[
-                        dmc.TabsList([
-                            dmc.TabsTab("Calculator", value="calculator", leftSection=DashIconify(icon="tabler:calculator", width=16)),
-                            dmc.TabsTab("Saved Calculations", value="saved", leftSection=DashIconify(icon="tabler:database", width=16)),
-                            dmc.TabsTab("Information", value="info", leftSection=DashIconify(icon="tabler:info-circle", width=16))
-                        ]),
-                        
-                        # Calculator Tab
-                        dmc.TabsPanel(
-                            value="calculator",
-                            pt="xl",
-                            children=[
-                                dmc.Grid(
-                                    gutter="xl",
-                                    children=[
-                                        # Input Column
-                                        dmc.GridCol(
-                                            span={"base": 12, "md": 7},
-                                            children=[
-                                                dmc.Paper(
-                                                    p="xl",
-                                                    radius="md",
-                                                    children=[
-                                                        dmc.Stack(
-                                                            gap="lg",
-                                                            children=[
-                                                                # Title
-                                                                dmc.Title("Input Parameters", order=4, className="section-title"),
-                                                                
-                                                                # User Information
-                                                                dmc.Paper(
-                                                                    p="md",
-                                                                    className="input-card",
-                                                                    children=[
-                                                                        dmc.Text("User Information", size="sm", fw=600, c="yellow", mb="sm"),
-                                                                        dmc.Grid(
-                                                                            gutter="md",
-                                                                            children=[
-                                                                                dmc.GridCol(
-                                                                                    span=6,
-                                                                                    children=[
-                                                                                        dmc.TextInput(
-                                                                                            id='user-name',
-                                                                                            label='Name',
-                                                                                            placeholder="Enter your name",
-                                                                                            size="sm",
-                                                                                            leftSection=DashIconify(icon="tabler:user", width=16)
-                                                                                        )
-                                                                                    ]
-                                                                                ),
-                                                                                dmc.GridCol(
-                                                                                    span=6,
-                                                                                    children=[
-                                                                                        dmc.TextInput(
-                                                                                            id='calculation-title',
-                                                                                            label='Calculation Title',
-                                                                                            placeholder="Enter title",
-                                                                                            size="sm",
-                                                                                            leftSection=DashIconify(icon="tabler:tag", width=16),
-                                                                                            rightSection=dmc.Tooltip(
-                                                                                                label="Enter facility name and equipment tag/location where leak occurred",
-                                                                                                children=[DashIconify(icon="tabler:info-circle", width=16)]
+def create_layout():
+    """Build the full app layout"""
+    return dmc.MantineProvider(
+        theme={
+            "colorScheme": "dark",
+            "primaryColor": "yellow",
+            "fontFamily": "'Inter', sans-serif",
+        },
+        children=[
+            # Store components
+            dcc.Store(id='calculations-store', data=load_calculations_from_file()),
+            dcc.Store(id='current-calculation-id', data=None),
+            dcc.Download(id='report-download'),
+            # Reverse solution for the current scenario (every tier and unit) and the
+            # unit scales the clientside orifice callback converts with
+            dcc.Store(id='reverse-solution-store', data=None),
+            dcc.Store(id='orifice-units', data=ORIFICE_UNIT_SCALES),
+            # Props of the results panel on screen, the debounced live-mode scenario
+            # and its debounce delay
+            dcc.Store(id='results-display', data=RESULTS_INITIAL_DISPLAY),
+            dcc.Store(id='live-request', data=None),
+            dcc.Store(id='live-debounce', data=LIVE_DEBOUNCE_MS),
+
+            # Header
+            dmc.Paper(
+                p="md",
+                className="app-header",
+                children=[
+                    dmc.Container(
+                        size="xl",
+                        children=[
+                            dmc.Group(
+                                justify="space-between",
+                                children=[
+                                    dmc.Group(
+                                        gap="md",
+                                        children=[
+                                            dmc.ThemeIcon(
+                                                DashIconify(icon="mdi:gas-cylinder", width=28),
+                                                size=44,
+                                                radius="md",
+                                                variant="gradient",
+                                                gradient={"from": "yellow", "to": "orange"}
+                                            ),
+                                            dmc.Stack(
+                                                gap=0,
+                                                children=[
+                                                    dmc.Title("PSE Flow Calculator", order=3),
+                                                    dmc.Text("Gas Orifice Mass Flow Analysis", size="sm", c="dimmed")
+                                                ]
+                                            )
+                                        ]
+                                    ),
+                                    dmc.Badge(
+                                        "ENBRIDGE",
+                                        size="lg",
+                                        radius="sm",
+                                        variant="gradient",
+                                        gradient={"from": "yellow", "to": "orange"}
+                                    )
+                                ]
+                            )
+                        ]
+                    )
+                ]
+            ),
+
+            # Main content
+            dmc.Container(
+                size="xl",
+                children=[
+                    dmc.Tabs(
+                        id="main-tabs",
+                        value="calculator",
+                        children=[
+                            dmc.TabsList([
+                                dmc.TabsTab("Calculator", value="calculator", leftSection=DashIconify(icon="tabler:calculator", width=16)),
+                                dmc.TabsTab("Saved Calculations", value="saved", leftSection=DashIconify(icon="tabler:database", width=16)),
+                                dmc.TabsTab("Information", value="info", leftSection=DashIconify(icon="tabler:info-circle", width=16))
+                            ]),
+
+                            # Calculator Tab
+                            dmc.TabsPanel(
+                                value="calculator",
+                                pt="xl",
+                                children=[
+                                    dmc.Grid(
+                                        gutter="xl",
+                                        children=[
+                                            # Input Column
+                                            dmc.GridCol(
+                                                span={"base": 12, "md": 7},
+                                                children=[
+                                                    dmc.Paper(
+                                                        p="xl",
+                                                        radius="md",
+                                                        children=[
+                                                            dmc.Stack(
+                                                                gap="lg",
+                                                                children=[
+                                                                    # Title
+                                                                    dmc.Title("Input Parameters", order=4, className="section-title"),
+
+                                                                    # User Information
+                                                                    dmc.Paper(
+                                                                        p="md",
+                                                                        className="input-card",
+                                                                        children=[
+                                                                            dmc.Text("User Information", size="sm", fw=600, c="yellow", mb="sm"),
+                                                                            dmc.Grid(
+                                                                                gutter="md",
+                                                                                children=[
+                                                                                    dmc.GridCol(
+                                                                                        span=6,
+                                                                                        children=[
+                                                                                            dmc.TextInput(
+                                                                                                id='user-name',
+                                                                                                label='Name',
+                                                                                                placeholder="Enter your name",
+                                                                                                size="sm",
+                                                                                                leftSection=DashIconify(icon="tabler:user", width=16)
                                                                                             )
-                                                                                        )
-                                                                                    ]
-                                                                                )
-                                                                            ]
-                                                                        )
-                                                                    ]
-                                                                ),
-                                                                
-                                                                # Gas Properties
-                                                                dmc.Paper(
-                                                                    p="md",
-                                                                    className="input-card",
-                                                                    children=[
-                                                                        dmc.Text("Gas Properties", size="sm", fw=600, c="yellow", mb="sm"),
-                                                                        dmc.Grid(
-                                                                            gutter="md",
-                                                                            children=[
-                                                                                dmc.GridCol(
-                                                                                    span=6,
-                                                                                    children=[
-                                                                                        dmc.Select(
-                                                                                            id='gas-dropdown',
-                                                                                            label='Gas Type',
-                                                                                            data=list(gas_data.keys()),
-                                                                                            value='Natural Gas',
-                                                                                            size="sm",
-                                                                                            leftSection=DashIconify(icon="tabler:gas-station", width=16),
-                                                                                            searchable=False,
-                                                                                            required=True,
-                                                                                            allowDeselect=False
-                                                                                        )
-                                                                                    ]
-                                                                                ),
-                                                                                dmc.GridCol(
-                                                                                    span=6,
-                                                                                    children=[
-                                                                                        dmc.Select(
-                                                                                            id='release-type-dropdown',
-                                                                                            label='Release Type',
-                                                                                            data=['Indoor', 'Outdoor'],
-                                                                                            value='Outdoor',
-                                                                                            size="sm",
-                                                                                            leftSection=DashIconify(icon="tabler:wind", width=16),
-                                                                                            searchable=False,
-                                                                                            required=True,
-                                                                                            allowDeselect=False
-                                                                                        )
-                                                                                    ]
-                                                                                ),
-                                                                                dmc.GridCol(
-                                                                                    span=6,
-                                                                                    children=[
-                                                                                        dmc.Select(
-                                                                                            id='site-dropdown',
-                                                                                            label='Site',
-                                                                                            data=['GTM US', 'GTM Canada'],
-                                                                                            value='GTM US',
-                                                                                            size="sm",
-                                                                                            leftSection=DashIconify(icon="tabler:map-pin", width=16),
-                                                                                            searchable=False,
-                                                                                            required=True,
-                                                                                            allowDeselect=False
-                                                                                        )
-                                                                                    ]
-                                                                                ),
-                                                                                dmc.GridCol(
-                                                                                    span=6,
-                                                                                    children=[
-                                                                                        dmc.Select(
-                                                                                            id='cd-dropdown',
-                                                                                            label='Discharge Coefficient (Cd)',
-                                                                                            data=[
-                                                                                                {'label': '0.61 - Sharp-edged', 'value': '0.61'},
-                                                                                                {'label': '0.98 - Well-rounded', 'value': '0.98'},
-                                                                                                {'label': '0.85 - Typical PSV', 'value': '0.85'}
-                                                                                            ],
-                                                                                            value='0.61',
-                                                                                            size="sm",
-                                                                                            leftSection=DashIconify(icon="tabler:percentage", width=16),
-                                                                                            searchable=False,
-                                                                                            required=True,
-                                                                                            allowDeselect=False
-                                                                                        )
-                                                                                    ]
-                                                                                )
-                                                                            ]
-                                                                        )
-
-                                                                    ]
-                                                                ),
-                                                                
-                                                                # Operating Conditions
-                                                                dmc.Paper(
-                                                                    p="md",
-                                                                    className="input-card",
-                                                                    children=[
-                                                                        dmc.Text("Operating Conditions", size="sm", fw=600, c="yellow", mb="sm"),
-                                                                        dmc.Stack(
-                                                                            gap="md",
-                                                                            children=[
-                                                                                # Pressures
-                                                                                dmc.Grid(
-                                                                                    gutter="md",
-                                                                                    children=[
-                                                                                        dmc.GridCol(
-                                                                                            span=6,
-                                                                                            children=[
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.Text("Upstream Pressure", size="xs", fw=500),
-                                                                                                        dmc.Tooltip(
-                                                                                                            label="This is the pipe internal pressure",
-                                                                                                            children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
-                                                                                                        )
-                                                                                                    ],
-                                                                                                    mb=4
-                                                                                                ),
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.NumberInput(
-                                                                                                            id='p0',
-                                                                                                            value=100,
-                                                                                                            size="sm",
-                                                                                                            className="input-flex",
-                                                                                                            leftSection=DashIconify(icon="tabler:gauge", width=16),
-                                                                                                            required=True
-                                                                                                        ),
-                                                                                                        dmc.Select(
-                                                                                                            id='p0-unit',
-                                                                                                            data=list(pressure_units.keys()),
-                                                                                                            value='psi(g)',
-                                                                                                            size="sm",
-                                                                                                            className="input-width-small",
-                                                                                                            searchable=False,
-                                                                                                            allowDeselect=False
-                                                                                                        )
-                                                                                                    ]
-                                                                                                )
-                                                                                            ]
-                                                                                        ),
-                                                                                        dmc.GridCol(
-                                                                                            span=6,
-                                                                                            children=[
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.Text("Downstream Pressure", size="xs", fw=500),
-                                                                                                        dmc.Tooltip(
-                                                                                                            label="This is mostly atmospheric pressure and by default it's 0 psig. Don't change unless relieving to somewhere other than atmospheric",
-                                                                                                            children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
-                                                                                                        )
-                                                                                                    ],
-                                                                                                    mb=4
-                                                                                                ),
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.NumberInput(
-                                                                                                            id='p2',
-                                                                                                            value=0,
-                                                                                                            size="sm",
-                                                                                                            className="input-flex",
-                                                                                                            leftSection=DashIconify(icon="tabler:gauge", width=16),
-                                                                                                            required=True
-                                                                                                        ),
-                                                                                                        dmc.Select(
-                                                                                                            id='p2-unit',
-                                                                                                            data=list(pressure_units.keys()),
-                                                                                                            value='psi(g)',
-                                                                                                            size="sm",
-                                                                                                            className="input-width-small",
-                                                                                                            searchable=False,
-                                                                                                            allowDeselect=False
-                                                                                                        )
-                                                                                                    ]
-                                                                                                )
-                                                                                            ]
-                                                                                        )
-                                                                                    ]
-                                                                                ),
-                                                                                
-                                                                                # Temperature and Area
-                                                                                dmc.Grid(
-                                                                                    gutter="md",
-                                                                                    children=[
-                                                                                        dmc.GridCol(
-                                                                                            span=6,
-                                                                                            children=[
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.Text("Temperature", size="xs", fw=500),
-                                                                                                        dmc.Tooltip(
-                                                                                                            label="This is the temperature of the gas prior to leak/rupture",
-                                                                                                            children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
-                                                                                                        )
-                                                                                                    ],
-                                                                                                    mb=4
-                                                                                                ),
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.NumberInput(
-                                                                                                            id='t0',
-                                                                                                            value=20,
-                                                                                                            size="sm",
-                                                                                                            className="input-flex",
-                                                                                                            leftSection=DashIconify(icon="tabler:temperature", width=16),
-                                                                                                            required=True
-                                                                                                        ),
-                                                                                                        dmc.Select(
-                                                                                                            id='t0-unit',
-                                                                                                            data=list(temperature_units.keys()),
-                                                                                                            value='°C',
-                                                                                                            size="sm",
-                                                                                                            className="input-width-small",
-                                                                                                            searchable=False,
-                                                                                                            allowDeselect=False
-                                                                                                        )
-                                                                                                    ]
-                                                                                                )
-                                                                                            ]
-                                                                                        ),
-                                                                                        dmc.GridCol(
-                                                                                            span=6,
-                                                                                            children=[
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.Text("Release Duration", size="xs", fw=500),
-                                                                                                        dmc.Tooltip(
-                                                                                                            label="If you don't know the release duration, use 48 hr",
-                                                                                                            children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
-                                                                                                        )
-                                                                                                    ],
-                                                                                                    mb=4
-                                                                                                ),
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.NumberInput(
-                                                                                                            id='duration',
-                                                                                                            value=10,
-                                                                                                            size="sm",
-                                                                                                            className="input-flex",
-                                                                                                            leftSection=DashIconify(icon="tabler:clock", width=16),
-                                                                                                            required=True
-                                                                                                        ),
-                                                                                                        dmc.Select(
-                                                                                                            id='duration-unit',
-                                                                                                            data=list(time_units.keys()),
-                                                                                                            value='min',
-                                                                                                            size="sm",
-                                                                                                            className="input-width-small",
-                                                                                                            searchable=False,
-                                                                                                            allowDeselect=False
-                                                                                                        )
-                                                                                                    ]
-                                                                                                )
-                                                                                            ]
-                                                                                        )
-                                                                                    ]
-                                                                                ),
-                                                                                
-                                                                                # Orifice Configuration
-                                                                                dmc.Divider(label="Orifice Configuration", labelPosition="center", my="md"),
-                                                                                dmc.Grid(
-                                                                                    gutter="md",
-                                                                                    children=[
-                                                                                        dmc.GridCol(
-                                                                                            span=12,
-                                                                                            children=[
-                                                                                                dmc.Center(
-                                                                                                    children=[
-                                                                                                        dmc.SegmentedControl(
-                                                                                                            id="orifice-input-type",
-                                                                                                            value="area",
-                                                                                                            data=[
-                                                                                                                {"value": "area", "label": "Input by Area"},
-                                                                                                                {"value": "diameter", "label": "Input by Diameter"}
-                                                                                                            ],
-                                                                                                            size="sm"
-                                                                                                        )
-                                                                                                    ]
-                                                                                                )
-                                                                                            ]
-                                                                                        ),
-                                                                                        dmc.GridCol(
-                                                                                            span=6,
-                                                                                            children=[
-                                                                                                # Orifice Area input
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.Text("Orifice Area", size="xs", fw=500),
-                                                                                                        dmc.Popover(
-                                                                                                                        width=400,
-                                                                                                                        position="bottom",
-                                                                                                                        withArrow=True,
-                                                                                                                        shadow="md",
-                                                                                                                        children=[
-                                                                                                                            dmc.PopoverTarget(
-                                                                                                                                DashIconify(
-                                                                                                                                    icon="tabler:info-circle", 
-                                                                                                                                    width=14, 
-                                                                                                                                    color="#868e96",
-                                                                                                                                    style={"cursor": "pointer"}
-                                                                                                                                )
-                                                                                                                            ),
-                                                                                                                            dmc.PopoverDropdown(
-                                                                                                                                children=[
-                                                                                                                                    html.Div(
-                                                                                                                                        className="equipment-table-popover-content",
-                                                                                                                                        children=[
-                                                                                                                                            dmc.Text("Equipment Failure Hole Sizes", fw=600, size="sm", mb="xs"),
-                                                                                                                                            create_equipment_table_mini(),
-                                                                                                                                            dmc.Text(
-                                                                                                                                                "Cox et al. (1990)",
-                                                                                                                                                size="xs",
-                                                                                                                                                c="dimmed",
-                                                                                                                                                mt="xs",
-                                                                                                                                                style={"fontStyle": "italic"}
-                                                                                                                                            )
-                                                                                                                                        ]
-                                                                                                                                    )
-                                                                                                                                ]
-                                                                                                                            )
-                                                                                                                        ]
-                                                                                                                    )
-                                                                                                    ],
-                                                                                                    mb=4
-                                                                                                ),
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.NumberInput(
-                                                                                                            id='area',
-                                                                                                            value=10,
-                                                                                                            size="sm",
-                                                                                                            className="input-flex",
-                                                                                                            leftSection=DashIconify(icon="tabler:circle", width=16),
-                                                                                                            required=True,
-                                                                                                            disabled=False
-                                                                                                        ),
-                                                                                                        dmc.Select(
-                                                                                                            id='area-unit',
-                                                                                                            data=list(area_units.keys()),
-                                                                                                            value='mm²',
-                                                                                                            size="sm",
-                                                                                                            className="input-width-small",
-                                                                                                            searchable=False,
-                                                                                                            allowDeselect=False,
-                                                                                                            disabled=False
-                                                                                                        )
-                                                                                                    ]
-                                                                                                )
-                                                                                            ]
-                                                                                        ),
-                                                                                        dmc.GridCol(
-                                                                                            span=6,
-                                                                                            children=[
-                                                                                                # Orifice Diameter input
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.Text("Orifice Diameter", size="xs", fw=500),
-                                                                                                        dmc.Tooltip(
-                                                                                                            label="Enter the diameter; area will be calculated automatically",
-                                                                                                            children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
-                                                                                                        )
-                                                                                                    ],
-                                                                                                    mb=4
-                                                                                                ),
-                                                                                                dmc.Group(
-                                                                                                    gap="xs",
-                                                                                                    children=[
-                                                                                                        dmc.NumberInput(
-                                                                                                            id='diameter',
-                                                                                                            value=3.57,  # sqrt(10/pi) ≈ 3.57 mm default diameter for 10 mm² area
-                                                                                                            size="sm",
-                                                                                                            className="input-flex",
-                                                                                                            leftSection=DashIconify(icon="tabler:ruler", width=16),
-                                                                                                            required=True,
-                                                                                                            disabled=True
-                                                                                                        ),
-                                                                                                        dmc.Select(
-                                                                                                            id='diameter-unit',
-                                                                                                            data=['mm', 'inch'],
-                                                                                                            value='mm',
-                                                                                                            size="sm",
-                                                                                                            className="input-width-small",
-                                                                                                            searchable=False,
-                                                                                                            allowDeselect=False,
-                                                                                                            disabled=True
-                                                                                                        )
-                                                                                                    ]
+                                                                                        ]
+                                                                                    ),
+                                                                                    dmc.GridCol(
+                                                                                        span=6,
+                                                                                        children=[
+                                                                                            dmc.TextInput(
+                                                                                                id='calculation-title',
+                                                                                                label='Calculation Title',
+                                                                                                placeholder="Enter title",
+                                                                                                size="sm",
+                                                                                                leftSection=DashIconify(icon="tabler:tag", width=16),
+                                                                                                rightSection=dmc.Tooltip(
+                                                                                                    label="Enter facility name and equipment tag/location where leak occurred",
+                                                                                                    children=[DashIconify(icon="tabler:info-circle", width=16)]
                                                                                                 )
-                                                                                            ]
-                                                                                        )
-                                                                                    ]
-                                                                                )
-                                                                            ]
-                                                                        )
-                                                                    ]
-                                                                ),
-                                                                
-                                                                # Reverse Calculation
-                                                                dmc.Paper(
-                                                                    p="md",
-                                                                    className="input-card",
-                                                                    children=[
-                                                                        dmc.Group(
-                                                                            gap="xs",
-                                                                            children=[
-                                                                                dmc.Text("Reverse Calculation", size="sm", fw=600, c="yellow"),
-                                                                                dmc.Tooltip(
-                                                                                    label="Using this feature is not required. It only helps you determine what is the area required to achieve a Tier 1 or Tier 2 release depending on the selected release type (indoor/outdoor)",
-                                                                                    children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
-                                                                                )
-                                                                            ],
-                                                                            mb="sm"
-                                                                        ),
-                                                                        dmc.Group(
-                                                                            align="flex-end",
-                                                                            children=[
-                                                                                dmc.Select(
-                                                                                    id='target-tier-dropdown',
-                                                                                    label='Target Tier',
-                                                                                    data=['1', '2'],
-                                                                                    value='2',
-                                                                                    size="sm",
-                                                                                    style={'flex': 1},
-                                                                                    leftSection=DashIconify(icon="tabler:trophy", width=16),
-                                                                                    allowDeselect=False
-                                                                                ),
-                                                                                dmc.Button(
-                                                                                    'Calculate Required Area/Diameter',
-                                                                                    id='reverse-calc-btn',
-                                                                                    size="sm",
-                                                                                    variant="light",
-                                                                                    leftSection=DashIconify(icon="tabler:arrows-exchange", width=16),
-                                                                                    className="button-calculate"
-                                                                                )
-                                                                            ]
-                                                                        )
-                                                                    ]
-                                                                ),
-                                                                
-                                                                # Calculate Button
-                                                                dmc.Button(
-                                                                    'Calculate Release',
-                                                                    id='calc-btn',
-                                                                    size="lg",
-                                                                    fullWidth=True,
-                                                                    leftSection=DashIconify(icon="tabler:calculator", width=20),
-                                                                    variant="filled"
-                                                                )
-                                                            ]
-                                                        )
-                                                    ]
-                                                )
-                                            ]
-                                        ),
-                                        
-                                        # Results Column
-                                        dmc.GridCol(
-                                            span={"base": 12, "md": 5},
-                                            children=[
-                                                dmc.Paper(
-                                                    p="xl",
-                                                    radius="md",
-                                                    className="results-container",
-                                                    children=[
-                                                        dmc.Stack(
-                                                            gap="lg",
-                                                            children=[
-                                                                dmc.Group(
-                                                                    justify="space-between",
-                                                                    children=[
-                                                                        dmc.Title("Results", order=4, className="section-title"),
-                                                                        dmc.Badge(
-                                                                            "Ready",
-                                                                            id="status-badge",
-                                                                            color="gray",
-                                                                            variant="dot"
-                                                                        )
-                                                                    ]
-                                                                ),
-                                                                html.Div(id='results', className="results-content"),
-                                                                html.Div(id='notifications')
-                                                            ]
-                                                        )
-                                                    ]
-                                                )
-                                            ]
-                                        )
-                                    ]
-                                )
-                            ]
-                        ),
-                        
-                        # Saved Calculations Tab
-                        dmc.TabsPanel(
-                            value="saved",
-                            pt="xl",
-                            children=[
-                                dmc.Paper(
-                                    p="xl",
-                                    radius="md",
-                                    children=[
-                                        dmc.Stack(
-                                            gap="lg",
-                                            children=[
-                                                dmc.Group(
-                                                    justify="space-between",
-                                                    mb="md",
-                                                    children=[
-                                                        dmc.Title("Saved Calculations", order=4, className="section-title"),
-                                                        dmc.Badge(
-                                                            id="calc-count-badge",
-                                                            variant="filled",
-                                                            size="lg"
-                                                        )
-                                                    ]
-                                                ),
-                                                html.Div(id='calculations-table')
-                                            ]
-                                        )
-                                    ]
-                                )
-                            ]
-                        ),
-                        
-                        # Information Tab
-                        dmc.TabsPanel(
-                            value="info",
-                            pt="xl",
-                            children=[
-                                dmc.Paper(
-                                    p="xl",
-                                    radius="md",
-                                    children=[
-                                        dmc.Stack(
-                                            gap="xl",
-                                            children=[
-                                                # Tiering Thresholds Section
-                                                dmc.Stack(
-                                                    gap="md",
-                                                    children=[
-                                                        dmc.Title("Tiering Thresholds", order=4, className="section-title"),
-                                                        dmc.Paper(
-                                                            p="md",
-                                                            className="input-card",
-                                                            children=[
-                                                                dmc.Table(
-                                                                    striped=True,
-                                                                    highlightOnHover=True,
-                                                                    className="tiering-table",
-                                                                    children=[
-                                                                        html.Thead([
-                                                                            html.Tr([
-                                                                                html.Th("Service Fluid Classification", rowSpan=2),
-                                                                                html.Th([
-                                                                                    "Indoor Release",
-                                                                                    html.Br(),
-                                                                                    html.Small([
-                                                                                        html.Span("( Release Rate Threshold ", style={"white-space": "pre"}),
-                                                                                        html.Span("—", style={"margin": "0 4px"}),
-                                                                                        html.Span(" 60 minutes )", style={"white-space": "pre"})
-                                                                                    ])
-                                                                                ], colSpan=2, className="text-center"),
-                                                                                html.Th([
-                                                                                    "Outdoor Release",
-                                                                                    html.Br(),
-                                                                                    html.Small([
-                                                                                        html.Span("( Total Release Volume Threshold )", style={"white-space": "pre"})
-                                                                                    ])
-                                                                                ], colSpan=2, className="text-center")
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Th("Tier 1", className="tier-1-header"),
-                                                                                html.Th("Tier 2", className="tier-2-header"),
-                                                                                html.Th("Tier 1", className="tier-1-header"),
-                                                                                html.Th("Tier 2", className="tier-2-header")
-                                                                            ])
-                                                                        ]),
-                                                                        html.Tbody([
-                                                                            html.Tr([
-                                                                                html.Td("Flammable Gases"),
-                                                                                html.Td([
-                                                                                    "≥ 70 m³",
-                                                                                    html.Span(" or ", style={"color": "var(--text-secondary)", "font-style": "italic"}),
-                                                                                    "2.47 MSCF",
-                                                                                    html.Br(),
-                                                                                    html.Span("or ", style={"font-style": "italic"}),
-                                                                                    "≥ 50 kg"
-                                                                                ]),
-                                                                                html.Td([
-                                                                                    "≥ 40 m³",
-                                                                                    html.Span(" or ", style={"color": "var(--text-secondary)", "font-style": "italic"}),
-                                                                                    "1.41 MSCF",
-                                                                                    html.Br(),
-                                                                                    html.Span("or ", style={"font-style": "italic"}),
-                                                                                    "≥ 25 kg"
-                                                                                ]),
-                                                                                html.Td([
-                                                                                    "≥ 85,000 m³",
-                                                                                    html.Span(" or ", style={"color": "var(--text-secondary)", "font-style": "italic"}),
-                                                                                    "3000 MSCF"
-                                                                                ]),
-                                                                                html.Td([
-                                                                                    "≥ 8,500 m³",
-                                                                                    html.Span(" or ", style={"color": "var(--text-secondary)", "font-style": "italic"}),
-                                                                                    "300 MSCF"
-                                                                                ])
-                                                                            ])
-                                                                        ])
-                                                                    ]
-                                                                ),
-                                                                dmc.Text("* Indoor release uses 60-minute rate threshold", size="xs", c="dimmed", mt="xs"),
-                                                                dmc.Text("* Outdoor release uses total volume threshold", size="xs", c="dimmed")
-                                                            ]
-                                                        )
-                                                    ]
-                                                ),
-                                                
-                                                # Roles and Responsibilities Section
-                                                dmc.Stack(
-                                                    gap="md",
-                                                    children=[
-                                                        dmc.Title("Roles and Responsibilities", order=4, className="section-title"),
-                                                        dmc.Paper(
-                                                            p="md",
-                                                            className="input-card",
-                                                            children=[
-                                                                dmc.Table(
-                                                                    striped=True,
-                                                                    highlightOnHover=True,
-                                                                    className="roles-table",
-                                                                    children=[
-                                                                        html.Thead([
-                                                                            html.Tr([
-                                                                                html.Th("Roles", style={"width": "30%"}),
-                                                                                html.Th("Responsibilities")
-                                                                            ])
-                                                                        ]),
-                                                                        html.Tbody([
-                                                                            html.Tr([
-                                                                                html.Td(html.Strong("Regional Technical Staff (Operations)")),
-                                                                                html.Td([
-                                                                                    html.Ul([
-                                                                                        html.Li("Gathers all relevant data from Area Operations Supervisor"),
-                                                                                        html.Li("Performs calculations in accordance with this document"),
-                                                                                        html.Li("Documents calculations and uploads in PDF format to EnCompass"),
-                                                                                        html.Li("Informs personnel accountable for updating gas loss database"),
-                                                                                        html.Li("Notifies Compliance team (US) or Regulatory team (Canada)")
-                                                                                    ])
-                                                                                ])
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td(html.Strong("GTM Measurement Engineer")),
-                                                                                html.Td([
-                                                                                    html.Ul([
-                                                                                        html.Li("Supports Regional Measurement Engineer with questions"),
-                                                                                        html.Li("Performs recalculation as necessary")
-                                                                                    ])
-                                                                                ])
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td(html.Strong("Area Operations Supervisor")),
-                                                                                html.Td([
-                                                                                    html.Ul([
-                                                                                        html.Li("Provides relevant data to Regional Measurement Engineer")
-                                                                                    ])
-                                                                                ])
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td(html.Strong("Process Safety Engineer")),
-                                                                                html.Td([
-                                                                                    html.Ul([
-                                                                                        html.Li("Categorizes PSE based on calculated volume of release")
-                                                                                    ])
-                                                                                ])
-                                                                            ])
-                                                                        ])
-                                                                    ]
-                                                                )
-                                                            ]
-                                                        )
-                                                    ]
-                                                ),
-                                                
-                                                # Equations Section
-                                                dmc.Stack(
-                                                    gap="md",
-                                                    children=[
-                                                        dmc.Title("Calculation Equations", order=4, className="section-title"),
-                                                        dmc.Paper(
-                                                            p="md",
-                                                            className="input-card",
-                                                            children=[
-                                                                dmc.Stack(
-                                                                    gap="lg",
-                                                                    children=[
-                                                                        # Sonic Flow Equation
-                                                                        html.Div([
-                                                                            dmc.Text("Sonic (Choked) Flow:", fw=600, size="sm", mb="xs"),
-                                                                            html.Div(
-                                                                                className="equation-box",
-                                                                                children=[static_equations['sonic_flow']]
-                                                                            )
-                                                                        ]),
-                                                                        
-                                                                        # Subsonic Flow Equation
-                                                                        html.Div([
-                                                                            dmc.Text("Subsonic Flow:", fw=600, size="sm", mb="xs"),
-                                                                            html.Div(
-                                                                                className="equation-box",
-                                                                                children=[static_equations['subsonic_flow']]
+                                                                                            )
+                                                                                        ]
+                                                                                    )
+                                                                                ]
                                                                             )
-                                                                        ]),
-                                                                        
-                                                                        # Critical Pressure Ratio
-                                                                        html.Div([
-                                                                            dmc.Text("Critical Pressure Ratio:", fw=600, size="sm", mb="xs"),
-                                                                            html.Div(
-                                                                                className="equation-box",
-                                                                                children=[static_equations['critical_pressure']]
+                                                                        ]
+                                                                    ),
+
+                                                                    # Gas Properties
+                                                                    dmc.Paper(
+                                                                        p="md",
+                                                                        className="input-card",
+                                                                        children=[
+                                                                            dmc.Text("Gas Properties", size="sm", fw=600, c="yellow", mb="sm"),
+                                                                            dmc.Grid(
+                                                                                gutter="md",
+                                                                                children=[
+                                                                                    dmc.GridCol(
+                                                                                        span=6,
+                                                                                        children=[
+                                                                                            dmc.Select(
+                                                                                                id='gas-dropdown',
+                                                                                                label='Gas Type',
+                                                                                                data=list(gas_data.keys()),
+                                                                                                value='Natural Gas',
+                                                                                                size="sm",
+                                                                                                leftSection=DashIconify(icon="tabler:gas-station", width=16),
+                                                                                                searchable=False,
+                                                                                                required=True,
+                                                                                                allowDeselect=False
+                                                                                            )
+                                                                                        ]
+                                                                                    ),
+                                                                                    dmc.GridCol(
+                                                                                        span=6,
+                                                                                        children=[
+                                                                                            dmc.Select(
+                                                                                                id='release-type-dropdown',
+                                                                                                label='Release Type',
+                                                                                                data=['Indoor', 'Outdoor'],
+                                                                                                value='Outdoor',
+                                                                                                size="sm",
+                                                                                                leftSection=DashIconify(icon="tabler:wind", width=16),
+                                                                                                searchable=False,
+                                                                                                required=True,
+                                                                                                allowDeselect=False
+                                                                                            )
+                                                                                        ]
+                                                                                    ),
+                                                                                    dmc.GridCol(
+                                                                                        span=6,
+                                                                                        children=[
+                                                                                            dmc.Select(
+                                                                                                id='site-dropdown',
+                                                                                                label='Site',
+                                                                                                data=tier_sites(),
+                                                                                                value='GTM US',
+                                                                                                size="sm",
+                                                                                                leftSection=DashIconify(icon="tabler:map-pin", width=16),
+                                                                                                searchable=False,
+                                                                                                required=True,
+                                                                                                allowDeselect=False
+                                                                                            )
+                                                                                        ]
+                                                                                    ),
+                                                                                    dmc.GridCol(
+                                                                                        span=6,
+                                                                                        children=[
+                                                                                            dmc.Select(
+                                                                                                id='cd-dropdown',
+                                                                                                label='Discharge Coefficient (Cd)',
+                                                                                                data=[
+                                                                                                    {'label': '0.61 - Sharp-edged', 'value': '0.61'},
+                                                                                                    {'label': '0.98 - Well-rounded', 'value': '0.98'},
+                                                                                                    {'label': '0.85 - Typical PSV', 'value': '0.85'}
+                                                                                                ],
+                                                                                                value='0.61',
+                                                                                                size="sm",
+                                                                                                leftSection=DashIconify(icon="tabler:percentage", width=16),
+                                                                                                searchable=False,
+                                                                                                required=True,
+                                                                                                allowDeselect=False
+                                                                                            )
+                                                                                        ]
+                                                                                    )
+                                                                                ]
                                                                             )
-                                                                        ]),
-                                                                        
-                                                                        # Simplified Form Section
-                                                                        html.Div([
-                                                                            dmc.Text("Simplified Forms:", fw=600, size="sm", mb="xs"),
-                                                                            dmc.Paper(
-                                                                                p="sm",
-                                                                                className="results-info-card",
+
+                                                                        ]
+                                                                    ),
+
+                                                                    # Operating Conditions
+                                                                    dmc.Paper(
+                                                                        p="md",
+                                                                        className="input-card",
+                                                                        children=[
+                                                                            dmc.Text("Operating Conditions", size="sm", fw=600, c="yellow", mb="sm"),
+                                                                            dmc.Stack(
+                                                                                gap="md",
                                                                                 children=[
-                                                                                    dmc.Stack(
-                                                                                        gap="lg",
+                                                                                    # Pressures
+                                                                                    dmc.Grid(
+                                                                                        gutter="md",
+                                                                                        children=[
+                                                                                            dmc.GridCol(
+                                                                                                span=6,
+                                                                                                children=[
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.Text("Upstream Pressure", size="xs", fw=500),
+                                                                                                            dmc.Tooltip(
+                                                                                                                label="This is the pipe internal pressure",
+                                                                                                                children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
+                                                                                                            )
+                                                                                                        ],
+                                                                                                        mb=4
+                                                                                                    ),
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.NumberInput(
+                                                                                                                id='p0',
+                                                                                                                value=100,
+                                                                                                                size="sm",
+                                                                                                                className="input-flex",
+                                                                                                                leftSection=DashIconify(icon="tabler:gauge", width=16),
+                                                                                                                required=True
+                                                                                                            ),
+                                                                                                            dmc.Select(
+                                                                                                                id='p0-unit',
+                                                                                                                data=unit_options('pressure'),
+                                                                                                                value='psi(g)',
+                                                                                                                size="sm",
+                                                                                                                className="input-width-small",
+                                                                                                                searchable=False,
+                                                                                                                allowDeselect=False
+                                                                                                            )
+                                                                                                        ]
+                                                                                                    )
+                                                                                                ]
+                                                                                            ),
+                                                                                            dmc.GridCol(
+                                                                                                span=6,
+                                                                                                children=[
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.Text("Downstream Pressure", size="xs", fw=500),
+                                                                                                            dmc.Tooltip(
+                                                                                                                label="This is mostly atmospheric pressure and by default it's 0 psig. Don't change unless relieving to somewhere other than atmospheric",
+                                                                                                                children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
+                                                                                                            )
+                                                                                                        ],
+                                                                                                        mb=4
+                                                                                                    ),
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.NumberInput(
+                                                                                                                id='p2',
+                                                                                                                value=0,
+                                                                                                                size="sm",
+                                                                                                                className="input-flex",
+                                                                                                                leftSection=DashIconify(icon="tabler:gauge", width=16),
+                                                                                                                required=True
+                                                                                                            ),
+                                                                                                            dmc.Select(
+                                                                                                                id='p2-unit',
+                                                                                                                data=unit_options('pressure'),
+                                                                                                                value='psi(g)',
+                                                                                                                size="sm",
+                                                                                                                className="input-width-small",
+                                                                                                                searchable=False,
+                                                                                                                allowDeselect=False
+                                                                                                            )
+                                                                                                        ]
+                                                                                                    )
+                                                                                                ]
+                                                                                            )
+                                                                                        ]
+                                                                                    ),
+
+                                                                                    # Temperature and Area
+                                                                                    dmc.Grid(
+                                                                                        gutter="md",
                                                                                         children=[
-                                                                                            html.Div([
-                                                                                                dmc.Text("For Sonic Flow:", size="sm", fw=500, mb="sm"),
-                                                                                                static_equations['sonic_simplified'],
-                                                                                                html.Div([
-                                                                                                    "where ",
-                                                                                                    static_equations['sonic_factor'],
-                                                                                                    " is the sonic flow factor"
-                                                                                                ], style={"textAlign": "center", "marginTop": "0.5rem"})
-                                                                                            ]),
-                                                                                            dmc.Divider(my="xs"),
-                                                                                            html.Div([
-                                                                                                dmc.Text("For Subsonic Flow:", size="sm", fw=500, mb="sm"),
-                                                                                                static_equations['subsonic_simplified']
-                                                                                            ])
+                                                                                            dmc.GridCol(
+                                                                                                span=6,
+                                                                                                children=[
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.Text("Temperature", size="xs", fw=500),
+                                                                                                            dmc.Tooltip(
+                                                                                                                label="This is the temperature of the gas prior to leak/rupture",
+                                                                                                                children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
+                                                                                                            )
+                                                                                                        ],
+                                                                                                        mb=4
+                                                                                                    ),
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.NumberInput(
+                                                                                                                id='t0',
+                                                                                                                value=20,
+                                                                                                                size="sm",
+                                                                                                                className="input-flex",
+                                                                                                                leftSection=DashIconify(icon="tabler:temperature", width=16),
+                                                                                                                required=True
+                                                                                                            ),
+                                                                                                            dmc.Select(
+                                                                                                                id='t0-unit',
+                                                                                                                data=unit_options('temperature'),
+                                                                                                                value='°C',
+                                                                                                                size="sm",
+                                                                                                                className="input-width-small",
+                                                                                                                searchable=False,
+                                                                                                                allowDeselect=False
+                                                                                                            )
+                                                                                                        ]
+                                                                                                    )
+                                                                                                ]
+                                                                                            ),
+                                                                                            dmc.GridCol(
+                                                                                                span=6,
+                                                                                                children=[
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.Text("Release Duration", size="xs", fw=500),
+                                                                                                            dmc.Tooltip(
+                                                                                                                label="If you don't know the release duration, use 48 hr",
+                                                                                                                children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
+                                                                                                            )
+                                                                                                        ],
+                                                                                                        mb=4
+                                                                                                    ),
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.NumberInput(
+                                                                                                                id='duration',
+                                                                                                                value=10,
+                                                                                                                size="sm",
+                                                                                                                className="input-flex",
+                                                                                                                leftSection=DashIconify(icon="tabler:clock", width=16),
+                                                                                                                required=True
+                                                                                                            ),
+                                                                                                            dmc.Select(
+                                                                                                                id='duration-unit',
+                                                                                                                data=unit_options('time'),
+                                                                                                                value='min',
+                                                                                                                size="sm",
+                                                                                                                className="input-width-small",
+                                                                                                                searchable=False,
+                                                                                                                allowDeselect=False
+                                                                                                            )
+                                                                                                        ]
+                                                                                                    )
+                                                                                                ]
+                                                                                            )
+                                                                                        ]
+                                                                                    ),
+
+                                                                                    # Orifice Configuration
+                                                                                    dmc.Divider(label="Orifice Configuration", labelPosition="center", my="md"),
+                                                                                    dmc.Grid(
+                                                                                        gutter="md",
+                                                                                        children=[
+                                                                                            dmc.GridCol(
+                                                                                                span=12,
+                                                                                                children=[
+                                                                                                    dmc.Center(
+                                                                                                        children=[
+                                                                                                            dmc.SegmentedControl(
+                                                                                                                id="orifice-input-type",
+                                                                                                                value="area",
+                                                                                                                data=[
+                                                                                                                    {"value": "area", "label": "Input by Area"},
+                                                                                                                    {"value": "diameter", "label": "Input by Diameter"}
+                                                                                                                ],
+                                                                                                                size="sm"
+                                                                                                            )
+                                                                                                        ]
+                                                                                                    )
+                                                                                                ]
+                                                                                            ),
+                                                                                            dmc.GridCol(
+                                                                                                span=6,
+                                                                                                children=[
+                                                                                                    # Orifice Area input
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.Text("Orifice Area", size="xs", fw=500),
+                                                                                                            dmc.Popover(
+                                                                                                                            width=400,
+                                                                                                                            position="bottom",
+                                                                                                                            withArrow=True,
+                                                                                                                            shadow="md",
+                                                                                                                            children=[
+                                                                                                                                dmc.PopoverTarget(
+                                                                                                                                    DashIconify(
+                                                                                                                                        icon="tabler:info-circle", 
+                                                                                                                                        width=14, 
+                                                                                                                                        color="#868e96",
+                                                                                                                                        style={"cursor": "pointer"}
+                                                                                                                                    )
+                                                                                                                                ),
+                                                                                                                                dmc.PopoverDropdown(
+                                                                                                                                    children=[
+                                                                                                                                        html.Div(
+                                                                                                                                            className="equipment-table-popover-content",
+                                                                                                                                            children=[
+                                                                                                                                                dmc.Text("Equipment Failure Hole Sizes", fw=600, size="sm", mb="xs"),
+                                                                                                                                                create_equipment_table_mini(),
+                                                                                                                                                dmc.Text(
+                                                                                                                                                    "Cox et al. (1990)",
+                                                                                                                                                    size="xs",
+                                                                                                                                                    c="dimmed",
+                                                                                                                                                    mt="xs",
+                                                                                                                                                    style={"fontStyle": "italic"}
+                                                                                                                                                )
+                                                                                                                                            ]
+                                                                                                                                        )
+                                                                                                                                    ]
+                                                                                                                                )
+                                                                                                                            ]
+                                                                                                                        )
+                                                                                                        ],
+                                                                                                        mb=4
+                                                                                                    ),
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.NumberInput(
+                                                                                                                id='area',
+                                                                                                                value=10,
+                                                                                                                size="sm",
+                                                                                                                className="input-flex",
+                                                                                                                leftSection=DashIconify(icon="tabler:circle", width=16),
+                                                                                                                required=True,
+                                                                                                                disabled=False
+                                                                                                            ),
+                                                                                                            dmc.Select(
+                                                                                                                id='area-unit',
+                                                                                                                data=unit_options('area'),
+                                                                                                                value='mm²',
+                                                                                                                size="sm",
+                                                                                                                className="input-width-small",
+                                                                                                                searchable=False,
+                                                                                                                allowDeselect=False,
+                                                                                                                disabled=False
+                                                                                                            )
+                                                                                                        ]
+                                                                                                    )
+                                                                                                ]
+                                                                                            ),
+                                                                                            dmc.GridCol(
+                                                                                                span=6,
+                                                                                                children=[
+                                                                                                    # Orifice Diameter input
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.Text("Orifice Diameter", size="xs", fw=500),
+                                                                                                            dmc.Tooltip(
+                                                                                                                label="Enter the diameter; area will be calculated automatically",
+                                                                                                                children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
+                                                                                                            )
+                                                                                                        ],
+                                                                                                        mb=4
+                                                                                                    ),
+                                                                                                    dmc.Group(
+                                                                                                        gap="xs",
+                                                                                                        children=[
+                                                                                                            dmc.NumberInput(
+                                                                                                                id='diameter',
+                                                                                                                value=3.57,  # sqrt(10/pi) ≈ 3.57 mm default diameter for 10 mm² area
+                                                                                                                size="sm",
+                                                                                                                className="input-flex",
+                                                                                                                leftSection=DashIconify(icon="tabler:ruler", width=16),
+                                                                                                                required=True,
+                                                                                                                disabled=True
+                                                                                                            ),
+                                                                                                            dmc.Select(
+                                                                                                                id='diameter-unit',
+                                                                                                                data=['mm', 'inch'],
+                                                                                                                value='mm',
+                                                                                                                size="sm",
+                                                                                                                className="input-width-small",
+                                                                                                                searchable=False,
+                                                                                                                allowDeselect=False,
+                                                                                                                disabled=True
+                                                                                                            )
+                                                                                                        ]
+                                                                                                    )
+                                                                                                ]
+                                                                                            )
                                                                                         ]
                                                                                     )
                                                                                 ]
                                                                             )
-                                                                        ]),
-                                                                        
-                                                                        # Flow Conditions
-                                                                        html.Div([
-                                                                            dmc.Text("Flow Conditions:", fw=600, size="sm", mb="xs"),
-                                                                            dmc.Paper(
-                                                                                p="sm",
-                                                                                className="results-info-card",
+                                                                        ]
+                                                                    ),
+
+                                                                    # Reverse Calculation
+                                                                    dmc.Paper(
+                                                                        p="md",
+                                                                        className="input-card",
+                                                                        children=[
+                                                                            dmc.Group(
+                                                                                gap="xs",
+                                                                                children=[
+                                                                                    dmc.Text("Reverse Calculation", size="sm", fw=600, c="yellow"),
+                                                                                    dmc.Tooltip(
+                                                                                        label="Using this feature is not required. It only helps you determine what is the area required to achieve a Tier 1 or Tier 2 release depending on the selected release type (indoor/outdoor)",
+                                                                                        children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
+                                                                                    )
+                                                                                ],
+                                                                                mb="sm"
+                                                                            ),
+                                                                            dmc.Group(
+                                                                                align="flex-end",
+                                                                                children=[
+                                                                                    dmc.Select(
+                                                                                        id='target-tier-dropdown',
+                                                                                        label='Target Tier',
+                                                                                        data=['1', '2'],
+                                                                                        value='2',
+                                                                                        size="sm",
+                                                                                        style={'flex': 1},
+                                                                                        leftSection=DashIconify(icon="tabler:trophy", width=16),
+                                                                                        allowDeselect=False
+                                                                                    ),
+                                                                                    dmc.Button(
+                                                                                        'Calculate Required Area/Diameter',
+                                                                                        id='reverse-calc-btn',
+                                                                                        size="sm",
+                                                                                        variant="light",
+                                                                                        leftSection=DashIconify(icon="tabler:arrows-exchange", width=16),
+                                                                                        className="button-calculate"
+                                                                                    )
+                                                                                ]
+                                                                            )
+                                                                        ]
+                                                                    ),
+
+                                                                    # Pipe Rupture
+                                                                    dmc.Paper(
+                                                                        p="md",
+                                                                        className="input-card",
+                                                                        children=[
+                                                                            dmc.Group(
+                                                                                gap="xs",
                                                                                 children=[
-                                                                                    dmc.Stack(
-                                                                                        gap="md",
+                                                                                    dmc.Text("Pipe Rupture", size="sm", fw=600, c="yellow"),
+                                                                                    dmc.Tooltip(
+                                                                                        label="Full-bore failure of a pipe segment (Drains – Pipe Ø): line-pack depressurization with pipe friction, using the gas, pressures, temperature and duration above. Results replace the orifice results and cannot be saved.",
+                                                                                        multiline=True,
+                                                                                        w=320,
+                                                                                        children=[DashIconify(icon="tabler:info-circle", width=14, color="#868e96")]
+                                                                                    )
+                                                                                ],
+                                                                                mb="sm"
+                                                                            ),
+                                                                            dmc.Grid(
+                                                                                gutter="md",
+                                                                                children=[
+                                                                                    dmc.GridCol(
+                                                                                        span=6,
+                                                                                        children=[
+                                                                                            dmc.Text("Pipe Inside Diameter", size="xs", fw=500, mb=4),
+                                                                                            dmc.Group(
+                                                                                                gap="xs",
+                                                                                                children=[
+                                                                                                    dmc.NumberInput(
+                                                                                                        id='pipe-diameter',
+                                                                                                        value=12,
+                                                                                                        min=0,
+                                                                                                        size="sm",
+                                                                                                        className="input-flex",
+                                                                                                        leftSection=DashIconify(icon="tabler:ruler", width=16)
+                                                                                                    ),
+                                                                                                    dmc.Select(
+                                                                                                        id='pipe-diameter-unit',
+                                                                                                        data=['mm', 'inch'],
+                                                                                                        value='inch',
+                                                                                                        size="sm",
+                                                                                                        className="input-width-small",
+                                                                                                        searchable=False,
+                                                                                                        allowDeselect=False
+                                                                                                    )
+                                                                                                ]
+                                                                                            )
+                                                                                        ]
+                                                                                    ),
+                                                                                    dmc.GridCol(
+                                                                                        span=6,
                                                                                         children=[
-                                                                                            html.Div([
-                                                                                                html.Strong("Sonic (Choked) Flow occurs when:", style={"display": "block", "marginBottom": "0.5rem", "color": "var(--primary-color)"}),
-                                                                                                static_equations['flow_condition_sonic']
-                                                                                            ]),
-                                                                                            dmc.Divider(my="xs"),
-                                                                                            html.Div([
-                                                                                                html.Strong("Subsonic Flow occurs when:", style={"display": "block", "marginBottom": "0.5rem", "color": "var(--primary-color)"}),
-                                                                                                static_equations['flow_condition_subsonic']
-                                                                                            ])
+                                                                                            dmc.Text("Segment Length", size="xs", fw=500, mb=4),
+                                                                                            dmc.Group(
+                                                                                                gap="xs",
+                                                                                                children=[
+                                                                                                    dmc.NumberInput(
+                                                                                                        id='pipe-length',
+                                                                                                        value=1,
+                                                                                                        min=0,
+                                                                                                        size="sm",
+                                                                                                        className="input-flex",
+                                                                                                        leftSection=DashIconify(icon="tabler:line", width=16)
+                                                                                                    ),
+                                                                                                    dmc.Select(
+                                                                                                        id='pipe-length-unit',
+                                                                                                        data=['m', 'km', 'ft'],
+                                                                                                        value='km',
+                                                                                                        size="sm",
+                                                                                                        className="input-width-small",
+                                                                                                        searchable=False,
+                                                                                                        allowDeselect=False
+                                                                                                    )
+                                                                                                ]
+                                                                                            )
                                                                                         ]
                                                                                     )
                                                                                 ]
+                                                                            ),
+                                                                            dmc.Group(
+                                                                                align="flex-end",
+                                                                                mt="sm",
+                                                                                children=[
+                                                                                    dmc.SegmentedControl(
+                                                                                        id='pipe-ends',
+                                                                                        value='1',
+                                                                                        data=[{"value": str(ends), "label": label} for ends, label in RUPTURE_ENDS.items()],
+                                                                                        size="sm",
+                                                                                        style={'flex': 1}
+                                                                                    ),
+                                                                                    dmc.Button(
+                                                                                        'Calculate Pipe Rupture',
+                                                                                        id='pipe-calc-btn',
+                                                                                        size="sm",
+                                                                                        variant="light",
+                                                                                        leftSection=DashIconify(icon="tabler:pipeline", width=16),
+                                                                                        className="button-calculate"
+                                                                                    )
+                                                                                ]
                                                                             )
-                                                                        ]),
-                                                                        
-                                                                        # Variables Legend
-                                                                        dmc.Paper(
-                                                                            p="sm",
-                                                                            className="results-info-card",
-                                                                            children=[
-                                                                                dmc.Text("Where:", fw=600, size="sm", mb="xs"),
-                                                                                dmc.SimpleGrid(
-                                                                                    cols=2,
-                                                                                    spacing="sm",
-                                                                                    children=[
-                                                                                        html.Div([
-                                                                                            html.P(variable_definitions['mdot'], className="variable-item"),
-                                                                                            html.P(variable_definitions['cd'], className="variable-item"),
-                                                                                            html.P(variable_definitions['area'], className="variable-item"),
-                                                                                            html.P(variable_definitions['p1'], className="variable-item"),
-                                                                                            html.P(variable_definitions['p2'], className="variable-item"),
-                                                                                        ]),
-                                                                                        html.Div([
-                                                                                            html.P(variable_definitions['gamma'], className="variable-item"),
-                                                                                            html.P(variable_definitions['mw'], className="variable-item"),
-                                                                                            html.P(variable_definitions['z'], className="variable-item"),
-                                                                                            html.P(variable_definitions['r'], className="variable-item"),
-                                                                                            html.P(variable_definitions['t1'], className="variable-item"),
-                                                                                        ])
-                                                                                    ]
-                                                                                )
-                                                                            ]
-                                                                        )
-                                                                    ]
-                                                                )
-                                                            ]
-                                                        )
-                                                    ]
-                                                ),
-                                                
-                                                # Common Gas Properties Section
-                                                dmc.Stack(
-                                                    gap="md",
-                                                    children=[
-                                                        dmc.Title("Common Gas Properties", order=4, className="section-title"),
-                                                        dmc.Paper(
-                                                            p="md",
-                                                            className="input-card",
-                                                            children=[
-                                                                dmc.Table(
-                                                                    striped=True,
-                                                                    highlightOnHover=True,
-                                                                    className="tiering-table",
-                                                                    children=[
-                                                                        html.Thead([
-                                                                            html.Tr([
-                                                                                html.Th("Gas"),
-                                                                                html.Th("γ (k)"),
-                                                                                html.Th("R (J/kg·K)"),
-                                                                                html.Th("MW (g/mol)"),
-                                                                                html.Th("Critical Pressure Ratio")
-                                                                            ])
-                                                                        ]),
-                                                                        html.Tbody([
-                                                                            html.Tr([
-                                                                                html.Td("Natural Gas"),
-                                                                                html.Td("1.32"),
-                                                                                html.Td("518.3"),
-                                                                                html.Td("16.04"),
-                                                                                html.Td("0.546")
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td("Air"),
-                                                                                html.Td("1.40"),
-                                                                                html.Td("287"),
-                                                                                html.Td("28.96"),
-                                                                                html.Td("0.528")
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td("Nitrogen"),
-                                                                                html.Td("1.40"),
-                                                                                html.Td("296.8"),
-                                                                                html.Td("28.01"),
-                                                                                html.Td("0.528")
-                                                                            ])
-                                                                        ])
-                                                                    ]
-                                                                ),
-                                                                dmc.Text("* Critical pressure ratio determines if flow is sonic or subsonic", size="xs", c="dimmed", mt="xs")
-                                                            ]
-                                                        )
-                                                    ]
-                                                ),
-                                                
-                                                # Equipment Failure Hole Sizes Section
-                                                dmc.Stack(
-                                                    gap="md",
-                                                    children=[
-                                                        dmc.Title("Equipment Failure Hole Sizes", order=4, className="section-title"),
-                                                        dmc.Paper(
-                                                            p="md",
-                                                            className="input-card",
-                                                            children=[
-                                                                dmc.Table(
-                                                                    striped=True,
-                                                                    highlightOnHover=True,
-                                                                    className="equipment-table",
-                                                                    children=[
-                                                                        html.Thead([
-                                                                            html.Tr([
-                                                                                html.Th("Equipment Type"),
-                                                                                html.Th("Failure"),
-                                                                                html.Th("Hole Size")
-                                                                            ])
-                                                                        ]),
-                                                                        html.Tbody([
-                                                                            # Flanges header
-                                                                            html.Tr([
-                                                                                html.Td(html.Strong("Flanges"), colSpan=3, style={"background": "rgba(212, 175, 55, 0.1)"})
-                                                                            ]),
-                                                                            # CAF
-                                                                            html.Tr([
-                                                                                html.Td("CAF", rowSpan=2, style={"vertical-align": "middle"}),
-                                                                                html.Td("Severe"),
-                                                                                html.Td("1 mm × distance between 2 flange bolts")
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td("Small release"),
-                                                                                html.Td("2.5 mm²")
-                                                                            ]),
-                                                                            # SWJ
-                                                                            html.Tr([
-                                                                                html.Td("SWJ", rowSpan=2, style={"vertical-align": "middle"}),
-                                                                                html.Td("Severe"),
-                                                                                html.Td("0.05 mm × distance between 2 flange bolts")
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td("Small release"),
-                                                                                html.Td("0.25 mm²")
-                                                                            ]),
-                                                                            # RTJ
-                                                                            html.Tr([
-                                                                                html.Td("RTJ", rowSpan=2, style={"vertical-align": "middle"}),
-                                                                                html.Td("Severe"),
-                                                                                html.Td("0.05 mm × distance between 2 flange bolts")
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td("Small release"),
-                                                                                html.Td("0.1 mm²")
-                                                                            ]),
-                                                                            # Valves header
-                                                                            html.Tr([
-                                                                                html.Td(html.Strong("Valves"), colSpan=3, style={"background": "rgba(212, 175, 55, 0.1)"})
-                                                                            ]),
-                                                                            # < 150 mm
-                                                                            html.Tr([
-                                                                                html.Td("< 150 mm", rowSpan=2, style={"vertical-align": "middle"}),
-                                                                                html.Td("Severe"),
-                                                                                html.Td("2.5 mm²")
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td("Small release"),
-                                                                                html.Td("0.25 mm²")
-                                                                            ]),
-                                                                            # > 150 mm
-                                                                            html.Tr([
-                                                                                html.Td("> 150 mm"),
-                                                                                html.Td("All releases"),
-                                                                                html.Td("0.25 mm²")
-                                                                            ]),
-                                                                            # Divider row
-                                                                            html.Tr([
-                                                                                html.Td(
-                                                                                    "",
-                                                                                    colSpan=3,
-                                                                                    style={
-                                                                                        "padding": "0",
-                                                                                        "height": "2px",
-                                                                                        "background": "var(--border-color)",
-                                                                                        "border": "none"
-                                                                                    }
-                                                                                )
-                                                                            ]),
-                                                                            # Centrifugal compressor header
-                                                                            html.Tr([
-                                                                                html.Td([
-                                                                                    html.Strong("Centrifugal compressor"),
-                                                                                    html.Br(),
-                                                                                    html.Small("Note: assumed to be a 150-mm shaft. For different sizes, pro-rate the hole size by the square of the shaft diameter", style={"font-style": "italic"})
-                                                                                ], rowSpan=2, style={"vertical-align": "middle"}),
-                                                                                html.Td("Purged labyrinth seal"),
-                                                                                html.Td("250 mm²")
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td("Floating ring seal"),
-                                                                                html.Td("50 mm²")
-                                                                            ]),
-                                                                            # Reciprocating compressors
-                                                                            html.Tr([
-                                                                                html.Td(html.Strong("Reciprocating compressors")),
-                                                                                html.Td(""),
-                                                                                html.Td("2.5 mm²")
-                                                                            ]),
-                                                                            # Small bore connections
-                                                                            html.Tr([
-                                                                                html.Td(html.Strong("Small bore connections"), rowSpan=2, style={"vertical-align": "middle"}),
-                                                                                html.Td("Failures < full bore"),
-                                                                                html.Td("0.25 mm²")
-                                                                            ]),
-                                                                            html.Tr([
-                                                                                html.Td("Full bore"),
-                                                                                html.Td("Tubing diameter")
-                                                                            ]),
-                                                                            # Drains and sample points
-                                                                            html.Tr([
-                                                                                html.Td(html.Strong("Drains and sample points")),
-                                                                                html.Td("All"),
-                                                                                html.Td("Diameter of the connection")
-                                                                            ])
-                                                                        ])
-                                                                    ]
-                                                                ),
-                                                                # Table caption
-                                                                html.Div(
-                                                                    html.Em(
-                                                                        "Cox, A. W., Ang, M. L., & Lees, F. P. (1990). Standard Hole Sizes. In Classification of Hazardous Locations (pp. 132–134). Institution of Chemical Engineers."
+                                                                        ]
                                                                     ),
-                                                                    style={
-                                                                        "font-size": "0.85rem",
-                                                                        "color": "var(--text-secondary)",
-                                                                        "text-align": "left",
-                                                                        "margin-top": "0.5rem",
-                                                                        "padding": "0 0.5rem"
-                                                                    }
-                                                                )
-                                                            ]
-                                                        )
-                                                    ]
-                                                ),
-                                                
-                                                # Important Links Section
-                                                dmc.Stack(
-                                                    gap="md",
-                                                    children=[
-                                                        dmc.Title("Important Links", order=4, className="section-title"),
-                                                        dmc.Paper(
-                                                            p="md",
-                                                            className="input-card",
-                                                            children=[
-                                                                dmc.Stack(
-                                                                    gap="sm",
-                                                                    children=[
-                                                                        dmc.Group(
-                                                                            gap="xs",
-                                                                            children=[
-                                                                                DashIconify(icon="tabler:external-link", width=16, color="#d4af37"),
-                                                                                dmc.Anchor(
-                                                                                    "Enbridge PSE Guidelines",
-                                                                                    href="#",
-                                                                                    className="info-link"
-                                                                                )
-                                                                            ]
-                                                                        ),
-                                                                        dmc.Group(
-                                                                            gap="xs",
-                                                                            children=[
-                                                                                DashIconify(icon="tabler:external-link", width=16, color="#d4af37"),
-                                                                                dmc.Anchor(
-                                                                                    "EnCompass Document Repository",
-                                                                                    href="#",
-                                                                                    className="info-link"
-                                                                                )
-                                                                            ]
-                                                                        ),
-                                                                        dmc.Group(
-                                                                            gap="xs",
-                                                                            children=[
-                                                                                DashIconify(icon="tabler:external-link", width=16, color="#d4af37"),
-                                                                                dmc.Anchor(
-                                                                                    "Gas Loss Database",
-                                                                                    href="#",
-                                                                                    className="info-link"
-                                                                                )
-                                                                            ]
-                                                                        ),
-                                                                        dmc.Group(
-                                                                            gap="xs",
-                                                                            children=[
-                                                                                DashIconify(icon="tabler:mail", width=16, color="#d4af37"),
-                                                                                dmc.Anchor(
-                                                                                    "Contact GTM Measurement Engineering",
-                                                                                    href="#",
-                                                                                    className="info-link"
-                                                                                )
-                                                                            ]
-                                                                        )
-                                                                    ]
-                                                                )
-                                                            ]
-                                                        )
-                                                    ]
-                                                )
-                                            ]
-                                        )
-                                    ]
-                                )
-                            ]
-                        )
-                    ]
-                )
+
+                                                                    # Calculate Button
+                                                                    dmc.Button(
+                                                                        'Calculate Release',
+                                                                        id='calc-btn',
+                                                                        size="lg",
+                                                                        fullWidth=True,
+                                                                        leftSection=DashIconify(icon="tabler:calculator", width=20),
+                                                                        variant="filled"
+                                                                    ),
+                                                                    dmc.Switch(
+                                                                        id='live-mode',
+                                                                        label="Live results (recalculate as you type)",
+                                                                        checked=False,
+                                                                        size="sm",
+                                                                        color="yellow"
+                                                                    )
+                                                                ]
+                                                            )
+                                                        ]
+                                                    )
+                                                ]
+                                            ),
+
+                                            # Results Column
+                                            dmc.GridCol(
+                                                span={"base": 12, "md": 5},
+                                                children=[
+                                                    dmc.Paper(
+                                                        p="xl",
+                                                        radius="md",
+                                                        className="results-container",
+                                                        children=[
+                                                            dmc.Stack(
+                                                                gap="lg",
+                                                                children=[
+                                                                    dmc.Group(
+                                                                        justify="space-between",
+                                                                        children=[
+                                                                            dmc.Title("Results", order=4, className="section-title"),
+                                                                            dmc.Badge(
+                                                                                id="status-badge",
+                                                                                variant="dot",
+                                                                                **RESULTS_INITIAL_DISPLAY['status-badge']
+                                                                            )
+                                                                        ]
+                                                                    ),
+                                                                    html.Div(id='results', className="results-content", children=results_panel()),
+                                                                    html.Div(id='notifications')
+                                                                ]
+                                                            )
+                                                        ]
+                                                    )
+                                                ]
+                                            )
+                                        ]
+                                    )
+                                ]
+                            ),
+
+                            # Saved Calculations Tab
+                            dmc.TabsPanel(
+                                value="saved",
+                                pt="xl",
+                                children=[
+                                    dmc.Paper(
+                                        p="xl",
+                                        radius="md",
+                                        children=[
+                                            dmc.Stack(
+                                                gap="lg",
+                                                children=[
+                                                    dmc.Group(
+                                                        justify="space-between",
+                                                        mb="md",
+                                                        children=[
+                                                            dmc.Title("Saved Calculations", order=4, className="section-title"),
+                                                            dmc.Badge(
+                                                                id="calc-count-badge",
+                                                                variant="filled",
+                                                                size="lg"
+                                                            )
+                                                        ]
+                                                    ),
+                                                    html.Div(id='calculations-table'),
+                                                    html.Div(id='compare-content')
+                                                ]
+                                            )
+                                        ]
+                                    )
+                                ]
+                            ),
+
+                            # Information Tab (content rendered on first visit)
+                            dmc.TabsPanel(
+                                value="info",
+                                pt="xl",
+                                children=[
+                                    dcc.Store(id='info-tab-loaded', data=False),
+                                    html.Div(
+                                        id='info-tab-content',
+                                        children=dmc.Center(dmc.Loader(color="yellow"), className="results-placeholder")
+                                    )
+                                ]
+                            )
+                        ]
+                    )
+                ]
+            )
+        ]
+    )
+
+
+@lru_cache(maxsize=None)
+def serve_layout():
+    """Build the layout on the first request instead of at import, then reuse it.
+
+    Dash calls this before generating the page's script tags, so component
+    libraries imported here (ag-grid) are still registered in time.
+    """
+    with profile_phase('layout'):
+        get_ag_grid()
+        return create_layout()
+
+
+app.layout = serve_layout
+
+@lru_cache(maxsize=4096)
+def results_display(gas, release_type, site, p0, p0_unit, p2, p2_unit, t0, t0_unit,
+                    area, area_unit, duration, duration_unit, cd):
+    """Props of every results component for one scenario, as {component id: {prop: value}}.
+
+    Cached on the raw inputs, so repeated live updates of a scenario cost a
+    dict lookup. Raises on invalid inputs.
+    """
+    # Convert to SI units (gauge pressures become absolute)
+    P0 = to_si(float(p0), p0_unit)
+    P2 = to_si(float(p2), p2_unit)
+    T0 = to_si(float(t0), t0_unit)
+    A = to_si(float(area), area_unit)
+    duration_seconds = to_si(float(duration), duration_unit)
+
+    # Get gas properties
+    props = gas_data[gas]
+
+    # Calculate mass flow rate and convert to every output unit and total in one pass
+    mdot_kgs = mass_flow_rate(float(cd), A, P0, P2, T0, props['gamma'], props['R'])
+    outputs = convert_flow_all_units(mdot_kgs, gas, duration_seconds)
+
+    # Check flow condition
+    flow_status = "SONIC (CHOKED)" if P2 / P0 <= critical_pressure_ratio(props['gamma']) else "SUBSONIC"
+
+    # Calculate Release Tier from every criterion of the site's threshold table
+    release_tier, tier_color, tier_trigger = classify_tier(outputs, duration_seconds, site, release_type,
+                                                           props['fluid_class'])
+    return display_props(outputs, flow_status, release_tier, tier_color, tier_trigger, props['fluid_class'])
+
+
+@lru_cache(maxsize=1024)
+def pipe_results_display(gas, release_type, site, p0, p0_unit, p2, p2_unit, t0, t0_unit, duration, duration_unit,
+                         pipe_diameter, pipe_diameter_unit, pipe_length, pipe_length_unit, ends):
+    """Results props of a full-bore pipe rupture (line-pack blowdown); raises on invalid inputs"""
+    ends = int(ends)
+    result = pipeline_release(
+        gas, release_type, site, to_si(float(p0), p0_unit), to_si(float(p2), p2_unit), to_si(float(t0), t0_unit),
+        to_si(float(pipe_diameter), pipe_diameter_unit), to_si(float(pipe_length), pipe_length_unit),
+        to_si(float(duration), duration_unit), ends=ends)
+    blowdown = result['blowdown_seconds']
+    blowdown = f"{blowdown:,.0f} s" if blowdown < 120 else f"{blowdown / 60:,.1f} min"
+    note = (f"{RUPTURE_ENDS[ends]} pipe rupture: flow rates at rupture. Line pack {result['line_pack_kg']:,.1f} kg, "
+            f"{BLOWDOWN_FRACTION:.0%} released in {blowdown}.")
+    return display_props(result, result['flow_status'], result['release_tier'], result['tier_color'],
+                         result['tier_trigger'], gas_data[gas]['fluid_class'], note=note, saveable=False)
+
+
+def display_props(outputs, flow_status, release_tier, tier_color, tier_trigger, fluid_class, note="", saveable=True):
+    """Results props for computed outputs (convert_flow_all_units fields), flow status and tier"""
+    display = {
+        'result-flow-status': {
+            'children': flow_status,
+            'className': f"status-badge-{'red' if 'SONIC' in flow_status else 'blue'}",
+        },
+        'result-tier': {
+            'children': release_tier,
+            'className': f"tier-badge-{tier_color}",
+            'style': HIDDEN if release_tier == "N/A" else {},
+        },
+        'result-tier-trigger': {
+            'children': (f"{release_tier} threshold met: {tier_trigger} ({FLUID_CLASSES[fluid_class]})"
+                         if tier_trigger else ""),
+            'style': {} if tier_trigger else HIDDEN,
+        },
+        'result-note': {'children': note, 'style': {} if note else HIDDEN},
+        # Saved calculations are orifice scenarios
+        'save-calc-btn': {'disabled': not saveable},
+    }
+    for field, _ in RESULT_DISPLAY_FIELDS:
+        display[f'result-{field}'] = {'children': f"{float(outputs[field]):.3f}"}
+    return display
+
+
+def results_card(display):
+    """Results card skeleton; its props are set from a results display dict"""
+    def value_grid(fields):
+        return dmc.SimpleGrid(
+            cols=2,
+            spacing="sm",
+            children=[
+                dmc.Stack(gap=0, align="center", children=[
+                    dmc.Text(id=f'result-{field}', size="xl", fw=700, **display[f'result-{field}']),
+                    dmc.Text(unit, size="xs", c="dimmed")
+                ])
+                for field, unit in fields
             ]
         )
+
+    return dmc.Stack(id='results-card', **display['results-card'], children=[
+        # Status badges
+        dmc.Group(
+            justify="center",
+            mb="md",
+            children=[
+                dmc.Badge(id='result-flow-status', size="lg", variant="filled", **display['result-flow-status']),
+                dmc.Badge(id='result-tier', size="lg", variant="filled", **display['result-tier'])
+            ]
+        ),
+        dmc.Text(id='result-tier-trigger', size="xs", c="dimmed", ta="center", mt=-8,
+                 **display['result-tier-trigger']),
+        dmc.Text(id='result-note', size="xs", c="dimmed", ta="center", **display['result-note']),
+
+        # Flow rates
+        dmc.Paper(
+            p="sm",
+            className="results-info-card",
+            children=[
+                dmc.Text("Flow Rates", size="sm", fw=600, c="yellow", mb="xs"),
+                value_grid(RESULT_DISPLAY_FIELDS[:4])
+            ]
+        ),
+
+        # Total release
+        dmc.Paper(
+            p="sm",
+            className="results-info-card",
+            children=[
+                dmc.Text("Total Release", size="sm", fw=600, c="yellow", mb="xs"),
+                value_grid(RESULT_DISPLAY_FIELDS[4:])
+            ]
+        ),
+
+        # Save button
+        dmc.Button(
+            'Save Calculation',
+            id='save-calc-btn',
+            fullWidth=True,
+            variant="light",
+            leftSection=DashIconify(icon="tabler:device-floppy", width=16),
+            **display['save-calc-btn']
+        )
+    ])
+
+
+def results_panel():
+    """Static results panel: placeholder, error alert and card, shown and filled via results-display"""
+    display = RESULTS_INITIAL_DISPLAY
+    return [
+        dmc.Center(
+            dmc.Stack(
+                [
+                    DashIconify(icon="tabler:calculator", width=64, color="#6c757d"),
+                    dmc.Text("Enter parameters and click Calculate", size="sm", c="dimmed")
+                ],
+                align="center",
+                gap="md"
+            ),
+            id='results-placeholder',
+            className="results-placeholder",
+            **display['results-placeholder']
+        ),
+        dmc.Alert(
+            id='results-error',
+            title="Calculation Error",
+            color="red",
+            icon=DashIconify(icon="tabler:alert-circle", width=24),
+            **display['results-error']
+        ),
+        results_card(display)
     ]
-)
 
-# Calculate flow rate callback
+
+def results_patch(previous, display):
+    """Patch of the results-display props that differ from previous, or no_update"""
+    previous = previous or {}
+    changes = dash.Patch()
+    changed = False
+    for component_id, props in display.items():
+        for prop, value in props.items():
+            if (previous.get(component_id) or {}).get(prop) != value:
+                changes[component_id][prop] = value
+                changed = True
+    return changes if changed else dash.no_update
+
+
+def shown_results(display, status, color):
+    """Results display with the card shown and the status badge set"""
+    return dict(display, **RESULTS_SHOWN, **{'status-badge': {'children': status, 'color': color}})
+
+
+def error_results(error):
+    """Results display with the calculation error shown in place of the card"""
+    return {
+        'results-placeholder': {'style': HIDDEN},
+        'results-card': {'style': HIDDEN},
+        'results-error': {'children': f"Error: {str(error)}", 'style': {}},
+        'status-badge': {'children': "Error", 'color': "red"},
+    }
+
+
+# Calculate flow rate callback - sends only the result props that changed; the
+# clientside results callback applies them to the static results panel
 @app.callback(
-    [Output('results', 'children'),
-     Output('status-badge', 'children'),
-     Output('status-badge', 'color')],
+    Output('results-display', 'data'),
     [Input('calc-btn', 'n_clicks')],
     [State('gas-dropdown', 'value'),
      State('release-type-dropdown', 'value'),
@@ -1460,284 +1164,130 @@ app.layout = dmc.MantineProvider(
      State('t0', 'value'), State('t0-unit', 'value'),
      State('area', 'value'), State('area-unit', 'value'),
      State('duration', 'value'), State('duration-unit', 'value'),
-     State('cd-dropdown', 'value')]
+     State('cd-dropdown', 'value'),
+     State('results-display', 'data')],
+    prevent_initial_call=True
 )
 def update_results(n_clicks, gas, release_type, site, p0, p0_unit, p2, p2_unit, t0, t0_unit, 
-                   area, area_unit, duration, duration_unit, cd):
+                   area, area_unit, duration, duration_unit, cd, previous):
     if not n_clicks:
-        return (
-            dmc.Center(
-                dmc.Stack(
-                    [
-                        DashIconify(icon="tabler:calculator", width=64, color="#6c757d"),
-                        dmc.Text("Enter parameters and click Calculate", size="sm", c="dimmed")
-                    ],
-                    align="center",
-                    gap="md"
-                ),
-                className="results-placeholder"
-            ),
-            "Ready",
-            "gray"
-        )
+        return dash.no_update
     
     try:
-        # Convert inputs
-        p0 = float(p0)
-        p2 = float(p2)
-        t0 = float(t0)
-        area = float(area)
-        duration = float(duration)
-        cd = float(cd)
-        
-        # Convert to SI units
-        P0 = (p0 * pressure_units[p0_unit]) + ATM_PRESSURE
-        P2 = (p2 * pressure_units[p2_unit]) + ATM_PRESSURE
-        T0 = temperature_units[t0_unit](t0)
-        A = area * area_units[area_unit]
-        duration_seconds = duration * time_units[duration_unit]
-        
-        # Get gas properties
-        props = gas_data[gas]
-        
-        # Calculate mass flow rate
-        mdot_kgs = mass_flow_rate(cd, A, P0, P2, T0, props['gamma'], props['R'])
-        
-        # Convert to different units
-        flow_rate_kgs, _ = convert_output_units(mdot_kgs, gas, 'kg/s')
-        flow_rate_lbs, _ = convert_output_units(mdot_kgs, gas, 'lb/s')
-        flow_rate_mscf, _ = convert_output_units(mdot_kgs, gas, 'MSCF/hr')
-        flow_rate_stm3, _ = convert_output_units(mdot_kgs, gas, 'st m³/hr')
-        
-        # Calculate totals
-        total_release_kg = flow_rate_kgs * duration_seconds
-        total_release_lb = flow_rate_lbs * duration_seconds
-        total_release_mscf = flow_rate_mscf * duration_seconds / 3600
-        total_release_stm3 = flow_rate_stm3 * duration_seconds / 3600
-        
-        # Check flow condition
-        critical_pressure_ratio = (2 / (props['gamma'] + 1)) ** (props['gamma'] / (props['gamma'] - 1))
-        flow_status = "SONIC (CHOKED)" if P2 / P0 <= critical_pressure_ratio else "SUBSONIC"
-        
-        # Calculate Release Tier
-        release_tier = "N/A"
-        tier_color = "gray"
-        if site == "GTM US":
-            if release_type == "Indoor":
-                if duration_seconds > 3600:
-                    if flow_rate_mscf >= 2.47:
-                        release_tier = "Tier 1"
-                        tier_color = "red"
-                    elif flow_rate_mscf >= 1.41:
-                        release_tier = "Tier 2"
-                        tier_color = "grape"
-                    else:
-                        release_tier = "Tier 3"
-                        tier_color = "green"
-                else:
-                    if total_release_mscf >= 2.47:
-                        release_tier = "Tier 1"
-                        tier_color = "red"
-                    elif total_release_mscf >= 1.41:
-                        release_tier = "Tier 2"
-                        tier_color = "grape"
-                    else:
-                        release_tier = "Tier 3"
-                        tier_color = "green"
-            else:  # Outdoor
-                if total_release_mscf >= 3000:
-                    release_tier = "Tier 1"
-                    tier_color = "red"
-                elif total_release_mscf >= 300:
-                    release_tier = "Tier 2"
-                    tier_color = "grape"
-                else:
-                    release_tier = "Tier 3"
-                    tier_color = "green"
-        
-        # Create results display
-        results = dmc.Stack([
-            # Status badges
-            dmc.Group(
-                justify="center",
-                mb="md",
-                children=[
-                    dmc.Badge(flow_status, size="lg", variant="filled", 
-                             className=f"status-badge-{'red' if 'SONIC' in flow_status else 'blue'}"),
-                    dmc.Badge(release_tier, size="lg", variant="filled", 
-                             className=f"tier-badge-{tier_color}") if release_tier != "N/A" else None
-                ]
-            ),
-            
-            # Flow rates
-            dmc.Paper(
-                p="sm",
-                className="results-info-card",
-                children=[
-                    dmc.Text("Flow Rates", size="sm", fw=600, c="yellow", mb="xs"),
-                    dmc.SimpleGrid(
-                        cols=2,
-                        spacing="sm",
-                        children=[
-                            dmc.Stack(gap=0, align="center", children=[
-                                dmc.Text(f"{flow_rate_kgs:.3f}", size="xl", fw=700),
-                                dmc.Text("kg/s", size="xs", c="dimmed")
-                            ]),
-                            dmc.Stack(gap=0, align="center", children=[
-                                dmc.Text(f"{flow_rate_lbs:.3f}", size="xl", fw=700),
-                                dmc.Text("lb/s", size="xs", c="dimmed")
-                            ]),
-                            dmc.Stack(gap=0, align="center", children=[
-                                dmc.Text(f"{flow_rate_mscf:.3f}", size="xl", fw=700),
-                                dmc.Text("MSCF/hr", size="xs", c="dimmed")
-                            ]),
-                            dmc.Stack(gap=0, align="center", children=[
-                                dmc.Text(f"{flow_rate_stm3:.3f}", size="xl", fw=700),
-                                dmc.Text("st m³/hr", size="xs", c="dimmed")
-                            ])
-                        ]
-                    )
-                ]
-            ),
-            
-            # Total release
-            dmc.Paper(
-                p="sm",
-                className="results-info-card",
-                children=[
-                    dmc.Text("Total Release", size="sm", fw=600, c="yellow", mb="xs"),
-                    dmc.SimpleGrid(
-                        cols=2,
-                        spacing="sm",
-                        children=[
-                            dmc.Stack(gap=0, align="center", children=[
-                                dmc.Text(f"{total_release_kg:.3f}", size="xl", fw=700),
-                                dmc.Text("kg", size="xs", c="dimmed")
-                            ]),
-                            dmc.Stack(gap=0, align="center", children=[
-                                dmc.Text(f"{total_release_lb:.3f}", size="xl", fw=700),
-                                dmc.Text("lb", size="xs", c="dimmed")
-                            ]),
-                            dmc.Stack(gap=0, align="center", children=[
-                                dmc.Text(f"{total_release_mscf:.3f}", size="xl", fw=700),
-                                dmc.Text("MSCF", size="xs", c="dimmed")
-                            ]),
-                            dmc.Stack(gap=0, align="center", children=[
-                                dmc.Text(f"{total_release_stm3:.3f}", size="xl", fw=700),
-                                dmc.Text("st m³", size="xs", c="dimmed")
-                            ])
-                        ]
-                    )
-                ]
-            ),
-            
-            # Save button
-            dmc.Button(
-                'Save Calculation',
-                id='save-calc-btn',
-                fullWidth=True,
-                variant="light",
-                leftSection=DashIconify(icon="tabler:device-floppy", width=16)
-            )
-        ])
-        
-        return results, "Calculated", "green"
-        
+        display = results_display(gas, release_type, site, p0, p0_unit, p2, p2_unit, t0, t0_unit,
+                                  area, area_unit, duration, duration_unit, cd)
     except Exception as e:
-        return (
-            dmc.Alert(
-                f"Error: {str(e)}",
-                title="Calculation Error",
-                color="red",
-                icon=DashIconify(icon="tabler:alert-circle", width=24)
-            ),
-            "Error",
-            "red"
-        )
+        return results_patch(previous, error_results(e))
+    return results_patch(previous, shown_results(display, "Calculated", "green"))
+
+# Pipe rupture callback - line-pack blowdown shown in the same results panel
+@app.callback(
+    Output('results-display', 'data', allow_duplicate=True),
+    [Input('pipe-calc-btn', 'n_clicks')],
+    [State('gas-dropdown', 'value'),
+     State('release-type-dropdown', 'value'),
+     State('site-dropdown', 'value'),
+     State('p0', 'value'), State('p0-unit', 'value'),
+     State('p2', 'value'), State('p2-unit', 'value'),
+     State('t0', 'value'), State('t0-unit', 'value'),
+     State('duration', 'value'), State('duration-unit', 'value'),
+     State('pipe-diameter', 'value'), State('pipe-diameter-unit', 'value'),
+     State('pipe-length', 'value'), State('pipe-length-unit', 'value'),
+     State('pipe-ends', 'value'),
+     State('results-display', 'data')],
+    prevent_initial_call=True
+)
+def calculate_pipe_rupture(n_clicks, gas, release_type, site, p0, p0_unit, p2, p2_unit, t0, t0_unit,
+                           duration, duration_unit, pipe_diameter, pipe_diameter_unit, pipe_length,
+                           pipe_length_unit, ends, previous):
+    if not n_clicks:
+        return dash.no_update
+
+    try:
+        display = pipe_results_display(gas, release_type, site, p0, p0_unit, p2, p2_unit, t0, t0_unit,
+                                       duration, duration_unit, pipe_diameter, pipe_diameter_unit,
+                                       pipe_length, pipe_length_unit, ends)
+    except Exception as e:
+        return results_patch(previous, error_results(e))
+    return results_patch(previous, shown_results(display, "Pipe Rupture", "green"))
+
+# Live (what-if) mode: the clientside liveRequest callback debounces input
+# edits into live-request, which is calculated like a Calculate click
+app.clientside_callback(
+    ClientsideFunction(namespace='pse', function_name='liveRequest'),
+    Output('live-request', 'data'),
+    [Input('live-mode', 'checked'),
+     Input('gas-dropdown', 'value'),
+     Input('release-type-dropdown', 'value'),
+     Input('site-dropdown', 'value'),
+     Input('p0', 'value'), Input('p0-unit', 'value'),
+     Input('p2', 'value'), Input('p2-unit', 'value'),
+     Input('t0', 'value'), Input('t0-unit', 'value'),
+     Input('area', 'value'), Input('area-unit', 'value'),
+     Input('duration', 'value'), Input('duration-unit', 'value'),
+     Input('cd-dropdown', 'value')],
+    State('live-debounce', 'data'),
+    prevent_initial_call=True
+)
+
 
-# Reverse calculation callback
 @app.callback(
-    [Output('area', 'value'),
-     Output('diameter', 'value', allow_duplicate=True)],
+    Output('results-display', 'data', allow_duplicate=True),
+    Input('live-request', 'data'),
+    State('results-display', 'data'),
+    prevent_initial_call=True
+)
+def live_results(scenario, previous):
+    if not scenario:
+        return dash.no_update
+    try:
+        display = results_display(*scenario)
+    except Exception:
+        # Usually an input mid-edit; keep the last results on screen
+        return results_patch(previous, {'status-badge': {'children': "Incomplete", 'color': "orange"}})
+    return results_patch(previous, shown_results(display, "Live", "green"))
+
+
+# Every (component id, prop) of the results display, as targeted outputs
+app.clientside_callback(
+    ClientsideFunction(namespace='pse', function_name='results'),
+    [Output(component_id, prop) for component_id, props in RESULTS_INITIAL_DISPLAY.items() for prop in props],
+    Input('results-display', 'data')
+)
+
+# Reverse calculation callback - solves every tier once per scenario; the
+# clientside orifice callback picks the target tier and units from the result
+@app.callback(
+    Output('reverse-solution-store', 'data'),
     [Input('reverse-calc-btn', 'n_clicks')],
-    [State('target-tier-dropdown', 'value'),
-     State('gas-dropdown', 'value'),
+    [State('gas-dropdown', 'value'),
      State('release-type-dropdown', 'value'),
      State('site-dropdown', 'value'),
      State('p0', 'value'), State('p0-unit', 'value'),
      State('p2', 'value'), State('p2-unit', 'value'),
      State('t0', 'value'), State('t0-unit', 'value'),
-     State('area-unit', 'value'),
-     State('diameter-unit', 'value'),
      State('duration', 'value'), State('duration-unit', 'value'),
      State('cd-dropdown', 'value')],
     prevent_initial_call=True
 )
-def calculate_reverse_area(n_clicks, target_tier, gas, release_type, site, p0, p0_unit, p2, p2_unit, 
-                          t0, t0_unit, area_unit, diameter_unit, duration, duration_unit, cd):
+def calculate_reverse_area(n_clicks, gas, release_type, site, p0, p0_unit, p2, p2_unit,
+                           t0, t0_unit, duration, duration_unit, cd):
     if not n_clicks:
-        return dash.no_update, dash.no_update
-    
+        return dash.no_update
+
     try:
-        # Convert inputs
-        p0 = float(p0)
-        p2 = float(p2)
-        t0 = float(t0)
-        duration = float(duration)
-        cd = float(cd)
-        
-        # Convert to SI units
-        P0 = (p0 * pressure_units[p0_unit]) + ATM_PRESSURE
-        P2 = (p2 * pressure_units[p2_unit]) + ATM_PRESSURE
-        T0 = temperature_units[t0_unit](t0)
-        duration_seconds = duration * time_units[duration_unit]
-        
-        # Get gas properties
-        props = gas_data[gas]
-        
-        # Calculate required area
-        required_area_m2, error = calculate_required_area(
-            target_tier, release_type, site, duration_seconds, cd, 
-            P0, P2, T0, props['gamma'], props['R'], gas
-        )
-        
-        if error:
-            return dash.no_update, dash.no_update
-        
-        # Convert area to selected units
-        area_conversion = {
-            'mm²': 1e6,
-            'cm²': 1e4,
-            'in²': 1550.0031,
-            'm²': 1,
-        }
-        
-        required_area_display = required_area_m2 * area_conversion[area_unit]
-        
-        # Calculate diameter from area
-        # First convert area to mm²
-        if area_unit == 'cm²':
-            area_mm2 = required_area_display * 100
-        elif area_unit == 'in²':
-            area_mm2 = required_area_display * 645.16
-        elif area_unit == 'm²':
-            area_mm2 = required_area_display * 1e6
-        else:  # mm²
-            area_mm2 = required_area_display
-            
-        # Calculate diameter in mm
-        diameter_mm = 2 * np.sqrt(area_mm2 / np.pi)
-        
-        # Convert to selected diameter unit
-        if diameter_unit == 'inch':
-            diameter_display = diameter_mm / 25.4
-        else:
-            diameter_display = diameter_mm
-        
-        return round(required_area_display, 4), round(diameter_display, 4)
-        
-    except:
-        return dash.no_update, dash.no_update
+        # Convert to SI units (gauge pressures become absolute) rounded to 10
+        # significant digits, so equivalent scenarios entered in different units
+        # share one cached solution
+        si = [float(f"{float(to_si(float(value), unit)):.10g}")
+              for value, unit in ((p0, p0_unit), (p2, p2_unit), (t0, t0_unit), (duration, duration_unit))]
+        solution = reverse_area_solution(gas, release_type, site, *si, float(cd))
+    except Exception:
+        return dash.no_update
+
+    # The inputs it was solved for; the clientside callback ignores a stale solution
+    inputs = [gas, release_type, site, p0, p0_unit, p2, p2_unit, t0, t0_unit, duration, duration_unit, cd]
+    return dict(solution, inputs=inputs)
 
 # Save calculation callback
 @app.callback(
@@ -1790,11 +1340,10 @@ def save_calculation(n_clicks, stored_data, user_name, calc_title, gas, release_
         'cd': cd
     }
     
-    # Add to stored data
-    updated_data = stored_data + [new_calc]
-    
-    # Save to file
-    if save_calculations_to_file(updated_data):
+    # Merge into the file with its computed results, keeping what other sessions saved meanwhile
+    record = with_results(new_calc, stored_data)
+    updated_data = update_calculations_file(added=[record])
+    if updated_data is not None:
         notification = dmc.Notification(
             title="Success",
             message="Calculation saved successfully!",
@@ -1812,6 +1361,7 @@ def save_calculation(n_clicks, stored_data, user_name, calc_title, gas, release_
             autoClose=4000,
             icon=DashIconify(icon="tabler:alert-triangle", width=20)
         )
+        updated_data = stored_data + [record]
     
     return updated_data, notification
 
@@ -1834,19 +1384,19 @@ def display_calculations_table(data):
             "0 calculations"
         )
     
-    # Prepare data for AG Grid
-    df = pd.DataFrame(data)
-    
     # Define column definitions with advanced features
     column_defs = [
         {
             "headerName": "Date",
             "field": "timestamp",
+            "checkboxSelection": True,
+            "headerCheckboxSelection": True,
+            "headerCheckboxSelectionFilteredOnly": True,
             "filter": "agDateColumnFilter",
             "floatingFilter": True,
             "sortable": True,
             "resizable": True,
-            "width": 180,
+            "width": 210,
             "cellClassName": "ag-cell-small"
         },
         {
@@ -1898,13 +1448,44 @@ def display_calculations_table(data):
             "resizable": True,
             "width": 100,
             "cellClassName": "ag-cell-small"
+        },
+        {
+            "headerName": "Flow (MSCF/hr)",
+            "field": "results.flow_mscf",
+            "filter": "agNumberColumnFilter",
+            "sortable": True,
+            "resizable": True,
+            "width": 140,
+            "valueFormatter": {"function": "params.value == null ? '' : d3.format(',.3f')(params.value)"},
+            "cellClassName": "ag-cell-small"
+        },
+        {
+            "headerName": "Total (MSCF)",
+            "field": "results.total_mscf",
+            "filter": "agNumberColumnFilter",
+            "sortable": True,
+            "resizable": True,
+            "width": 140,
+            "valueFormatter": {"function": "params.value == null ? '' : d3.format(',.3f')(params.value)"},
+            "cellClassName": "ag-cell-small"
+        },
+        {
+            "headerName": "Tier",
+            "field": "results.release_tier",
+            "filter": "agSetColumnFilter",
+            "floatingFilter": True,
+            "sortable": True,
+            "resizable": True,
+            "width": 110,
+            "cellClassName": "ag-cell-small"
         }
     ]
     
     # Create the AG Grid component
+    dag = get_ag_grid()
     grid = dag.AgGrid(
         id='calc-table',
-        rowData=df.to_dict('records'),
+        rowData=data,
         columnDefs=column_defs,
         defaultColDef={
             "sortable": True,
@@ -1918,7 +1499,7 @@ def display_calculations_table(data):
             "pagination": True,
             "paginationPageSize": 10,
             "domLayout": "autoHeight",
-            "rowSelection": "single",
+            "rowSelection": "multiple",
             "animateRows": True,
             "rowHeight": 42,
             "headerHeight": 48,
@@ -1945,6 +1526,40 @@ def display_calculations_table(data):
                 color="red",
                 size="sm",
                 leftSection=DashIconify(icon="tabler:trash", width=16)
+            ),
+            dmc.Button(
+                "Compare",
+                id="compare-calc-btn",
+                variant="light",
+                size="sm",
+                leftSection=DashIconify(icon="tabler:chart-bar", width=16)
+            ),
+            dmc.Button(
+                "PDF Report",
+                id="report-pdf-btn",
+                variant="light",
+                size="sm",
+                leftSection=DashIconify(icon="tabler:file-type-pdf", width=16)
+            ),
+            # Streamed by the server as each report renders, so it bypasses the callback payload
+            html.A(
+                dmc.Button(
+                    "All Reports (ZIP)",
+                    variant="subtle",
+                    size="sm",
+                    leftSection=DashIconify(icon="tabler:file-zip", width=16)
+                ),
+                href="/reports/calculations.zip"
+            ),
+            # Bulk export for the gas loss database; loaders can use /export/changes instead
+            html.A(
+                dmc.Button(
+                    "Export CSV",
+                    variant="subtle",
+                    size="sm",
+                    leftSection=DashIconify(icon="tabler:file-spreadsheet", width=16)
+                ),
+                href="/export/calculations.csv"
             )
         ]
     )
@@ -1996,11 +1611,36 @@ def view_calculation(n_clicks, selected_rows, data):
         float(selected_calc.get('area', 10)),
         selected_calc.get('area_unit', 'mm²'),
         float(selected_calc.get('duration', 10)),
-        selected_calc.get('duration_unit', 'minutes'),
+        normalize_unit(selected_calc.get('duration_unit', 'min')),
         selected_calc.get('cd', '0.61'),
         'calculator'  # Switch to calculator tab
     )
 
+# Download PDF report callback
+@app.callback(
+    Output('report-download', 'data'),
+    [Input('report-pdf-btn', 'n_clicks')],
+    [State('calc-table', 'selectedRows')],
+    prevent_initial_call=True
+)
+def download_report(n_clicks, selected_rows):
+    if not n_clicks or not selected_rows:
+        return dash.no_update
+    record = selected_rows[0]
+    return dcc.send_bytes(calculation_report(record), report_filename(record))
+
+# Compare calculations callback - recomputes every selected calculation in one batch
+@app.callback(
+    Output('compare-content', 'children'),
+    [Input('compare-calc-btn', 'n_clicks')],
+    [State('calc-table', 'selectedRows')],
+    prevent_initial_call=True
+)
+def compare_calculations(n_clicks, selected_rows):
+    if not n_clicks:
+        return dash.no_update
+    return create_comparison(selected_rows or [], get_ag_grid())
+
 # Delete calculation callback
 @app.callback(
     [Output('calculations-store', 'data', allow_duplicate=True),
@@ -2014,17 +1654,16 @@ def delete_calculation(n_clicks, selected_rows, data):
     if not n_clicks or not selected_rows or not data:
         return data, ""
     
-    # Get selected calculation ID
-    selected_id = selected_rows[0]['id']
+    # Get selected calculation IDs
+    selected_ids = {row['id'] for row in selected_rows}
     
-    # Remove calculation
-    updated_data = [calc for calc in data if calc['id'] != selected_id]
-    
-    # Save to file
-    if save_calculations_to_file(updated_data):
+    # Remove them from the file, keeping what other sessions saved meanwhile
+    updated_data = update_calculations_file(deleted_ids=selected_ids)
+    if updated_data is not None:
         notification = dmc.Notification(
             title="Deleted",
-            message="Calculation deleted successfully!",
+            message=("Calculation deleted successfully!" if len(selected_ids) == 1
+                     else f"{len(selected_ids)} calculations deleted successfully!"),
             color="red",
             action="show",
             autoClose=3000,
@@ -2039,11 +1678,27 @@ def delete_calculation(n_clicks, selected_rows, data):
             autoClose=4000,
             icon=DashIconify(icon="tabler:alert-triangle", width=20)
         )
+        updated_data = [calc for calc in data if calc['id'] not in selected_ids]
     
     return updated_data, notification
 
-# Combined callback for orifice input handling
+# Information tab callback - renders the tab content the first time it is opened
 @app.callback(
+    [Output('info-tab-content', 'children'),
+     Output('info-tab-loaded', 'data')],
+    [Input('main-tabs', 'value')],
+    [State('info-tab-loaded', 'data')]
+)
+def render_info_tab(tab, loaded):
+    if tab != 'info' or loaded:
+        return dash.no_update, dash.no_update
+    return info_tab_tree(), True
+
+# Combined orifice input handling, run in the browser (assets/clientside.js):
+# area <-> diameter conversion, and target tier / unit switches looked up in
+# the reverse solution without a server round trip
+app.clientside_callback(
+    ClientsideFunction(namespace='pse', function_name='orifice'),
     [Output('area', 'disabled'),
      Output('area-unit', 'disabled'),
      Output('diameter', 'disabled'),
@@ -2054,102 +1709,25 @@ def delete_calculation(n_clicks, selected_rows, data):
      Input('diameter', 'value'),
      Input('diameter-unit', 'value'),
      Input('area', 'value'),
-     Input('area-unit', 'value')],
-    [State('area', 'value'),
-     State('diameter', 'value')],
+     Input('area-unit', 'value'),
+     Input('reverse-solution-store', 'data'),
+     Input('target-tier-dropdown', 'value')],
+    [State('orifice-units', 'data'),
+     State('gas-dropdown', 'value'),
+     State('release-type-dropdown', 'value'),
+     State('site-dropdown', 'value'),
+     State('p0', 'value'), State('p0-unit', 'value'),
+     State('p2', 'value'), State('p2-unit', 'value'),
+     State('t0', 'value'), State('t0-unit', 'value'),
+     State('duration', 'value'), State('duration-unit', 'value'),
+     State('cd-dropdown', 'value')],
     prevent_initial_call=True
 )
-def handle_orifice_inputs(input_type, diameter, diameter_unit, area, area_unit, 
-                         current_area, current_diameter):
-    ctx = callback_context
-    if not ctx.triggered:
-        return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
-    
-    trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
-    
-    # Initialize return values
-    area_disabled = False
-    area_unit_disabled = False
-    diameter_disabled = True
-    diameter_unit_disabled = True
-    new_area = current_area
-    new_diameter = current_diameter
-    
-    # Handle input type toggle
-    if trigger_id == 'orifice-input-type':
-        if input_type == 'area':
-            # Enable area, disable diameter
-            area_disabled = False
-            area_unit_disabled = False
-            diameter_disabled = True
-            diameter_unit_disabled = True
-        else:
-            # Enable diameter, disable area
-            area_disabled = True
-            area_unit_disabled = True
-            diameter_disabled = False
-            diameter_unit_disabled = False
-    else:
-        # Maintain current disabled states based on input_type
-        if input_type == 'area':
-            area_disabled = False
-            area_unit_disabled = False
-            diameter_disabled = True
-            diameter_unit_disabled = True
-        else:
-            area_disabled = True
-            area_unit_disabled = True
-            diameter_disabled = False
-            diameter_unit_disabled = False
-    
-    # Handle diameter to area conversion
-    if trigger_id in ['diameter', 'diameter-unit'] and input_type == 'diameter':
-        if diameter is not None and diameter > 0:
-            # Convert diameter to mm
-            if diameter_unit == 'inch':
-                diameter_mm = diameter * 25.4
-            else:
-                diameter_mm = diameter
-            
-            # Calculate area in mm²
-            area_mm2 = np.pi * (diameter_mm / 2) ** 2
-            
-            # Convert to selected area unit
-            if area_unit == 'cm²':
-                new_area = round(area_mm2 / 100, 4)
-            elif area_unit == 'in²':
-                new_area = round(area_mm2 / 645.16, 4)
-            elif area_unit == 'm²':
-                new_area = round(area_mm2 / 1e6, 4)
-            else:  # mm²
-                new_area = round(area_mm2, 4)
-    
-    # Handle area to diameter conversion
-    elif trigger_id in ['area', 'area-unit'] and input_type == 'area':
-        if area is not None and area > 0:
-            # Convert area to mm²
-            if area_unit == 'cm²':
-                area_mm2 = area * 100
-            elif area_unit == 'in²':
-                area_mm2 = area * 645.16
-            elif area_unit == 'm²':
-                area_mm2 = area * 1e6
-            else:  # mm²
-                area_mm2 = area
-            
-            # Calculate diameter in mm
-            diameter_mm = 2 * np.sqrt(area_mm2 / np.pi)
-            
-            # Convert to selected diameter unit
-            if diameter_unit == 'inch':
-                new_diameter = round(diameter_mm / 25.4, 4)
-            else:
-                new_diameter = round(diameter_mm, 4)
-    
-    return area_disabled, area_unit_disabled, diameter_disabled, diameter_unit_disabled, new_area, new_diameter
 
 # For deployment
 server = app.server
 
+mark('callbacks')
+
 if __name__ == '__main__':
     app.run(debug=True, port=8052)
\ No newline at end of file
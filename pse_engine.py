@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Gas data, orifice flow physics and output unit conversions for the PSE calculator.
+
+Kept free of Dash imports so batch jobs and exports can use it directly.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from unit_conversions import LB_PER_KG, FT3_PER_M3, convert_to_all
+from tier_classification import get_tier_entry, target_flows
+
+# Gas properties: gamma (γ), R (J/kg·K), molecular weight (g/mol) and the
+# service fluid class whose tier thresholds apply (see tier_classification.FLUID_CLASSES)
+gas_data = {
+    'Air': {'gamma': 1.4, 'R': 287, 'MW': 28.96, 'fluid_class': 'non_flammable'},
+    'Nitrogen': {'gamma': 1.4, 'R': 296.8, 'MW': 28.01, 'fluid_class': 'non_flammable'},
+    'Oxygen': {'gamma': 1.4, 'R': 259.8, 'MW': 32.0, 'fluid_class': 'oxidizer'},
+    'Helium': {'gamma': 1.66, 'R': 2077, 'MW': 4.0, 'fluid_class': 'non_flammable'},
+    'Hydrogen': {'gamma': 1.41, 'R': 4124, 'MW': 2.02, 'fluid_class': 'flammable'},
+    'CO2': {'gamma': 1.29, 'R': 188.9, 'MW': 44.01, 'fluid_class': 'non_flammable'},
+    'Natural Gas': {'gamma': 1.32, 'R': 518.3, 'MW': 16.04, 'fluid_class': 'flammable'},
+    'Argon': {'gamma': 1.67, 'R': 208.1, 'MW': 39.95, 'fluid_class': 'non_flammable'},
+}
+
+R_UNIVERSAL = 8314.5      # J/(kmol·K)
+STD_PRESSURE = 101325     # Pa (1 atm)
+STD_TEMP_SCF = 288.71     # K (60°F) - basis for MSCF
+STD_TEMP_METRIC = 288.15  # K (15°C) - basis for st m³
+
+@lru_cache(maxsize=None)
+def gas_table():
+    """Per-gas property arrays, indexed in the order of gas_data"""
+    names = list(gas_data.keys())
+    mw = np.array([gas_data[name]['MW'] for name in names], dtype=float)
+    gamma = np.array([gas_data[name]['gamma'] for name in names], dtype=float)
+    return {
+        'names': names,
+        'index': {name: i for i, name in enumerate(names)},
+        'gamma': gamma,
+        'R': np.array([gas_data[name]['R'] for name in names], dtype=float),
+        'MW': mw,
+        'fluid_class': np.array([gas_data[name]['fluid_class'] for name in names], dtype=str),
+        # Standard densities (kg/m³) at the MSCF and st m³ reference conditions
+        'density_scf': STD_PRESSURE * mw / (R_UNIVERSAL * STD_TEMP_SCF),
+        'density_metric': STD_PRESSURE * mw / (R_UNIVERSAL * STD_TEMP_METRIC),
+        # Choked-flow pressure ratio, which depends on gamma only
+        'critical_ratio': critical_pressure_ratio(gamma),
+    }
+
+
+def gas_indices(gases):
+    """Map a gas name or sequence of gas names to indices into gas_table()"""
+    index = gas_table()['index']
+    if isinstance(gases, str):
+        return index[gases]
+    return np.fromiter((index[g] for g in gases), dtype=np.intp, count=len(gases))
+
+
+def gas_property(gases, key):
+    """Look up a gas_table() column for one gas name or an array of names"""
+    return gas_table()[key][gas_indices(gases)]
+
+
+def critical_pressure_ratio(gamma):
+    """Downstream/upstream pressure ratio below which the flow is choked"""
+    return (2 / (gamma + 1)) ** (gamma / (gamma - 1))
+
+
+def mass_flow_rate(Cd, A, P0, P2, T0, gamma, R):
+    # Sonic (choked) condition
+    critical_ratio = critical_pressure_ratio(gamma)
+    if P2 / P0 <= critical_ratio:
+        mdot = (
+            Cd * A * P0 * np.sqrt(gamma / (R * T0)) *
+            ((2 / (gamma + 1)) ** ((gamma + 1) / (2 * (gamma - 1))))
+        )
+    else:
+        mdot = (
+            Cd * A * P0 * np.sqrt(
+                2 * gamma / (R * T0 * (gamma - 1)) *
+                ((P2 / P0) ** (2 / gamma) - (P2 / P0) ** ((gamma + 1) / gamma))
+            )
+        )
+    return mdot
+
+
+def mass_flow_rate_batch(Cd, A, P0, P2, T0, gamma, R):
+    """Vectorized mass_flow_rate: every argument may be a scalar or an array"""
+    Cd, A, P0, P2, T0, gamma, R = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (Cd, A, P0, P2, T0, gamma, R))
+    )
+    ratio = P2 / P0
+    choked = ratio <= critical_pressure_ratio(gamma)
+    with np.errstate(invalid='ignore'):
+        sonic_term = np.sqrt(gamma / (R * T0)) * (
+            (2 / (gamma + 1)) ** ((gamma + 1) / (2 * (gamma - 1)))
+        )
+        subsonic_term = np.sqrt(
+            2 * gamma / (R * T0 * (gamma - 1)) *
+            (ratio ** (2 / gamma) - ratio ** ((gamma + 1) / gamma))
+        )
+    return Cd * A * P0 * np.where(choked, sonic_term, subsonic_term)
+
+
+def convert_flow_all_units(mdot_kgs, gas, duration_seconds):
+    """Convert mass flow (kg/s) to every output unit, plus release totals, in one pass.
+
+    mdot_kgs and duration_seconds may be scalars or arrays; gas is a name or a
+    sequence of names (one per element). Returns a dict of flow rates and totals.
+    """
+    idx = gas_indices(gas)
+    table = gas_table()
+    mdot_kgs = np.asarray(mdot_kgs, dtype=float)
+    hours = np.asarray(duration_seconds, dtype=float) / 3600
+
+    flow_kgs = mdot_kgs
+    flow_lbs = mdot_kgs * LB_PER_KG
+    flow_mscf = mdot_kgs / table['density_scf'][idx] * (FT3_PER_M3 * 3600 / 1000)
+    flow_stm3 = mdot_kgs / table['density_metric'][idx] * 3600
+
+    return {
+        'flow_kgs': flow_kgs,
+        'flow_lbs': flow_lbs,
+        'flow_mscf': flow_mscf,
+        'flow_stm3': flow_stm3,
+        'total_kg': flow_kgs * 3600 * hours,
+        'total_lb': flow_lbs * 3600 * hours,
+        'total_mscf': flow_mscf * hours,
+        'total_stm3': flow_stm3 * hours,
+    }
+
+
+def mscf_per_hour_to_kgs(flow_mscf, gas):
+    """Inverse of the MSCF/hr output conversion"""
+    return (np.asarray(flow_mscf, dtype=float) * 1000 / 3600) / FT3_PER_M3 * gas_property(gas, 'density_scf')
+
+
+def flow_to_kgs(field, value, gas):
+    """Inverse of one per-hour output conversion of convert_flow_all_units"""
+    if field == 'flow_kgs':
+        return np.asarray(value, dtype=float)
+    if field == 'flow_mscf':
+        return mscf_per_hour_to_kgs(value, gas)
+    if field == 'flow_stm3':
+        return np.asarray(value, dtype=float) / 3600 * gas_property(gas, 'density_metric')
+    raise ValueError(f"Unknown flow field: {field}")
+
+
+def calculate_required_area(target_tier, release_type, site, duration_seconds, Cd, P0, P2, T0, gamma, R, gas):
+    """Calculate the required orifice area to achieve a target tier"""
+    # Target flows come from the same threshold table used for classification
+    targets, error = target_flows(target_tier, site, release_type, duration_seconds,
+                                  gas_data[gas]['fluid_class'])
+    if error:
+        return None, error
+
+    # Whichever criterion is reached first sets the mass flow (kg/s) needed
+    target_mdot_kgs = min(float(flow_to_kgs(field, value, gas)) for field, value in targets.items())
+
+    # Calculate required area by rearranging mass flow equation
+    critical_ratio = critical_pressure_ratio(gamma)
+
+    if P2 / P0 <= critical_ratio:  # Sonic flow
+        denominator = Cd * P0 * np.sqrt(gamma / (R * T0)) * ((2 / (gamma + 1)) ** ((gamma + 1) / (2 * (gamma - 1))))
+        required_area = target_mdot_kgs / denominator
+    else:  # Subsonic flow
+        flow_term = np.sqrt(2 * gamma / (R * T0 * (gamma - 1)) * ((P2 / P0) ** (2 / gamma) - (P2 / P0) ** ((gamma + 1) / gamma)))
+        denominator = Cd * P0 * flow_term
+        required_area = target_mdot_kgs / denominator
+
+    return required_area, None
+
+
+@lru_cache(maxsize=1024)
+def reverse_area_solution(gas, release_type, site, P0, P2, T0, duration_seconds, Cd):
+    """Required orifice area and equivalent diameter for every tier, in every unit.
+
+    Inputs are SI, so the same scenario entered in different units shares one
+    cache entry. Returns a JSON-ready dict:
+        {'tiers': {'1': {'area': {'mm²': ..., ...}, 'diameter': {'mm': ..., ...}}, ...},
+         'errors': {'<tier>': message}}
+    Switching target tier or display unit is then a lookup in this result.
+    """
+    entry = get_tier_entry(site, release_type, gas_data[gas]['fluid_class'])
+    tiers = sorted(entry['thresholds']) if entry else [1, 2]
+    props = gas_data[gas]
+    solution = {'tiers': {}, 'errors': {}}
+    for tier in tiers:
+        area_m2, error = calculate_required_area(str(tier), release_type, site, duration_seconds, Cd,
+                                                 P0, P2, T0, props['gamma'], props['R'], gas)
+        if error:
+            solution['errors'][str(tier)] = error
+            continue
+        diameter_m = 2 * np.sqrt(area_m2 / np.pi)
+        solution['tiers'][str(tier)] = {
+            'area': convert_to_all(area_m2, 'm²'),
+            'diameter': convert_to_all(diameter_m, 'm'),
+        }
+    return solution
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the PSE calculator.
+
+Covers the flow physics, pipe rupture blowdown, output conversions, time-series
+replay, the results callback, the saved calculations table, file persistence
+and PDF reports. Each run is appended to a JSON history file; --compare checks
+the new run against the previous one and exits non-zero when any benchmark
+slowed down by more than --threshold. Before timing, the vectorized paths are
+checked against the scalar ones on random inputs; a mismatch fails the run.
+
+    python run_benchmarks.py                 # run everything, append to history
+    python run_benchmarks.py --check         # only check vectorized results against the scalar path
+    python run_benchmarks.py --quick         # smaller sizes, fewer repeats
+    python run_benchmarks.py -k table        # only benchmarks whose name contains 'table'
+    python run_benchmarks.py --compare       # run, then flag regressions vs the last run
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+HISTORY_FILE = 'benchmark_history.json'
+DEFAULT_THRESHOLD = 0.10  # 10% slower than the previous run counts as a regression
+
+# Representative calculator inputs (same defaults as the UI)
+SCENARIO = {
+    'gas': 'Natural Gas', 'release_type': 'Outdoor', 'site': 'GTM US',
+    'p0': 100, 'p0_unit': 'psi(g)', 'p2': 0, 'p2_unit': 'psi(g)',
+    't0': 20, 't0_unit': '°C', 'area': 10, 'area_unit': 'mm²',
+    'duration': 10, 'duration_unit': 'min', 'cd': '0.61',
+}
+
+BENCHMARKS = []
+CHECKS = []
+CHECK_ROWS = 500
+
+
+def benchmark(name, sizes=(None,), quick_sizes=None):
+    """Register a benchmark; sizes parametrize it (e.g. number of records)"""
+    def decorator(func):
+        BENCHMARKS.append({'name': name, 'func': func, 'sizes': sizes,
+                           'quick_sizes': quick_sizes or sizes})
+        return func
+    return decorator
+
+
+def check(name):
+    """Register a result check; it raises AssertionError when the paths disagree"""
+    def decorator(func):
+        CHECKS.append({'name': name, 'func': func})
+        return func
+    return decorator
+
+
+def time_call(func, repeat, min_time=0.05):
+    """Time func; returns per-call seconds for each of `repeat` samples"""
+    # Calibrate the loop count so each sample runs for at least min_time
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    return samples
+
+
+def synthetic_records(n):
+    """n saved-calculation records with varied inputs and computed results"""
+    from calculation_store import recalculate_all
+    rng = np.random.default_rng(42)
+    gases = ['Natural Gas', 'Hydrogen', 'Air', 'Nitrogen']
+    records = []
+    for i in range(n):
+        record = dict(SCENARIO)
+        record.update({
+            'id': f'bench-{i}',
+            'timestamp': '2025-07-04 17:46:27',
+            'user_name': f'user{i % 50}',
+            'calculation_title': f'Benchmark {i}',
+            'gas': gases[i % len(gases)],
+            'release_type': 'Indoor' if i % 3 == 0 else 'Outdoor',
+            'p0': float(rng.uniform(10, 1000)),
+            'area': float(rng.uniform(0.1, 250)),
+        })
+        records.append(record)
+    records, _ = recalculate_all(records)
+    return records
+
+
+# Physics and conversions
+
+@benchmark('mass_flow_rate.scalar')
+def bench_mass_flow_rate_scalar(size):
+    from pse_engine import mass_flow_rate
+    return lambda: mass_flow_rate(0.61, 1e-5, 790801.0, 101325.0, 293.15, 1.32, 518.3)
+
+
+@benchmark('mass_flow_rate.batch', sizes=(10_000, 1_000_000), quick_sizes=(10_000,))
+def bench_mass_flow_rate_batch(size):
+    from pse_engine import mass_flow_rate_batch
+    rng = np.random.default_rng(0)
+    P0 = rng.uniform(2e5, 5e6, size)
+    P2 = P0 * rng.uniform(0.1, 0.99, size)
+    T0 = rng.uniform(250, 350, size)
+    return lambda: mass_flow_rate_batch(0.61, 1e-5, P0, P2, T0, 1.32, 518.3)
+
+
+@benchmark('calculate_required_area')
+def bench_calculate_required_area(size):
+    from pse_engine import calculate_required_area
+    return lambda: calculate_required_area('2', 'Outdoor', 'GTM US', 600.0, 0.61,
+                                           790801.0, 101325.0, 293.15, 1.32, 518.3, 'Natural Gas')
+
+
+@benchmark('classify_tiers.batch', sizes=(10_000, 1_000_000), quick_sizes=(10_000,))
+def bench_classify_tiers_batch(size):
+    from pse_engine import convert_flow_all_units, gas_data, gas_property
+    from tier_classification import classify_tiers
+    rng = np.random.default_rng(0)
+    duration = rng.uniform(60, 36_000, size)
+    gases = rng.choice(list(gas_data), size)
+    flows = convert_flow_all_units(rng.uniform(0, 5, size), gases, duration)
+    sites = rng.choice(['GTM US', 'GTM Canada'], size)
+    release_types = rng.choice(['Indoor', 'Outdoor'], size)
+    fluid_classes = gas_property(gases, 'fluid_class')
+    return lambda: classify_tiers(flows, duration, sites, release_types, fluid_classes)
+
+
+@benchmark('convert_flow_all_units.scalar')
+def bench_convert_flow_all_units_scalar(size):
+    from pse_engine import convert_flow_all_units
+    return lambda: convert_flow_all_units(0.0083, 'Natural Gas', 3600.0)
+
+
+@benchmark('convert_flow_all_units.batch', sizes=(10_000, 1_000_000), quick_sizes=(10_000,))
+def bench_convert_flow_all_units_batch(size):
+    from pse_engine import convert_flow_all_units, gas_data
+    rng = np.random.default_rng(0)
+    gases = rng.choice(list(gas_data), size)
+    mdot = rng.uniform(0, 5, size)
+    duration = rng.uniform(60, 36_000, size)
+    return lambda: convert_flow_all_units(mdot, gases, duration)
+
+
+@benchmark('pipeline_release.batch', sizes=(1_000, 10_000), quick_sizes=(1_000,))
+def bench_pipeline_release_batch(size):
+    from pipeline_release import pipeline_release_batch
+    rng = np.random.default_rng(0)
+    gases = rng.choice(['Natural Gas', 'Hydrogen', 'Nitrogen'], size)
+    P0 = rng.uniform(5e5, 1e7, size)
+    diameter = rng.uniform(0.05, 1.0, size)
+    length = rng.uniform(100, 50_000, size)
+    ends = rng.integers(1, 3, size)
+    return lambda: pipeline_release_batch(gases, P0, 101325, 288.15, diameter, length, 3600,
+                                          'GTM US', 'Outdoor', ends)
+
+
+# Vectorized results against the scalar path
+
+@check('mass_flow_rate_batch')
+def check_mass_flow_rate_batch():
+    from pse_engine import gas_data, mass_flow_rate, mass_flow_rate_batch
+    rng = np.random.default_rng(1)
+    gases = rng.choice(list(gas_data), CHECK_ROWS)
+    gamma = np.array([gas_data[gas]['gamma'] for gas in gases])
+    R = np.array([gas_data[gas]['R'] for gas in gases])
+    P0 = rng.uniform(2e5, 5e6, CHECK_ROWS)
+    P2 = P0 * rng.uniform(0.05, 0.99, CHECK_ROWS)  # spans choked and subsonic
+    T0 = rng.uniform(250, 350, CHECK_ROWS)
+    expected = [mass_flow_rate(0.61, 1e-5, *row) for row in zip(P0, P2, T0, gamma, R)]
+    np.testing.assert_allclose(mass_flow_rate_batch(0.61, 1e-5, P0, P2, T0, gamma, R), expected, rtol=1e-12)
+
+
+@check('convert_flow_all_units')
+def check_convert_flow_all_units():
+    from pse_engine import convert_flow_all_units, gas_data
+    rng = np.random.default_rng(2)
+    gases = rng.choice(list(gas_data), CHECK_ROWS)
+    mdot = rng.uniform(0, 5, CHECK_ROWS)
+    duration = rng.uniform(60, 36_000, CHECK_ROWS)
+    batch = convert_flow_all_units(mdot, gases, duration)
+    for i, row in enumerate(zip(mdot, gases, duration)):
+        scalar = convert_flow_all_units(*row)
+        for field, value in scalar.items():
+            np.testing.assert_allclose(batch[field][i], value, rtol=1e-12, err_msg=f"{field}, row {i}")
+
+
+@check('classify_tiers')
+def check_classify_tiers():
+    from pse_engine import convert_flow_all_units, gas_data, gas_property
+    from tier_classification import classify_tiers
+    rng = np.random.default_rng(3)
+    gases = rng.choice(list(gas_data), CHECK_ROWS)
+    duration = rng.uniform(60, 36_000, CHECK_ROWS)
+    flows = convert_flow_all_units(10 ** rng.uniform(-4, 1, CHECK_ROWS), gases, duration)
+    sites = rng.choice(['GTM US', 'GTM Canada'], CHECK_ROWS)
+    release_types = rng.choice(['Indoor', 'Outdoor'], CHECK_ROWS)
+    fluid_classes = gas_property(gases, 'fluid_class')
+    tiers, criteria = classify_tiers(flows, duration, sites, release_types, fluid_classes)
+    # One row at a time takes the single-table path instead of the grouped one
+    for i in range(CHECK_ROWS):
+        row_flows = {field: values[i] for field, values in flows.items()}
+        tier, criterion = classify_tiers(row_flows, duration[i], str(sites[i]), str(release_types[i]),
+                                         str(fluid_classes[i]))
+        assert (tiers[i], criteria[i]) == (tier[0], criterion[0]), f"row {i}: {gases[i]}, {sites[i]}"
+
+
+@check('pipeline_release_batch')
+def check_pipeline_release_batch():
+    from pipeline_release import pipeline_release, pipeline_release_batch
+    from tier_classification import TIER_LABELS
+    rng = np.random.default_rng(4)
+    size = CHECK_ROWS // 10
+    gases = rng.choice(['Natural Gas', 'Hydrogen', 'Nitrogen'], size)
+    P0 = rng.uniform(5e5, 1e7, size)
+    diameter = rng.uniform(0.05, 1.0, size)
+    length = rng.uniform(100, 50_000, size)
+    ends = rng.integers(1, 3, size)
+    batch = pipeline_release_batch(gases, P0, 101325, 288.15, diameter, length, 3600, 'GTM US', 'Outdoor', ends)
+    for i in range(size):
+        scalar = pipeline_release(str(gases[i]), 'Outdoor', 'GTM US', P0[i], 101325, 288.15,
+                                  diameter[i], length[i], 3600, ends=ends[i])
+        for field in ('flow_kgs', 'total_kg', 'line_pack_kg', 'blowdown_seconds'):
+            np.testing.assert_allclose(batch[field][i], scalar[field], rtol=1e-9, err_msg=f"{field}, row {i}")
+        assert TIER_LABELS[batch['tiers'][i]] == scalar['release_tier'], f"tier, row {i}"
+
+
+@benchmark('replay_release', sizes=(100_000, 1_000_000), quick_sizes=(100_000,))
+def bench_replay_release(size):
+    from timeseries_replay import replay_release
+    s = SCENARIO
+    t = np.arange(size) * 0.5
+    path = os.path.join(tempfile.mkdtemp(prefix='pse-bench-'), 'pressure.csv')
+    np.savetxt(path, np.column_stack([t, 300 * np.exp(-t / (size / 4))]), delimiter=',',
+               header='time,pressure', comments='', fmt='%.6g')
+    return lambda: replay_release(path, s['gas'], s['release_type'], s['site'], s['area'], s['area_unit'],
+                                  s['cd'], method='simpson')
+
+
+# Callbacks
+
+@benchmark('update_results')
+def bench_update_results(size):
+    import plotly
+    from pse_calculator_enbridge import RESULTS_INITIAL_DISPLAY, update_results
+    s = SCENARIO
+    args = (1, s['gas'], s['release_type'], s['site'], s['p0'], s['p0_unit'], s['p2'], s['p2_unit'],
+            s['t0'], s['t0_unit'], s['area'], s['area_unit'], s['duration'], s['duration_unit'], s['cd'],
+            RESULTS_INITIAL_DISPLAY)
+
+    def run():
+        # Include serialization, as Dash does before sending the response
+        json.dumps(update_results(*args), cls=plotly.utils.PlotlyJSONEncoder)
+    return run
+
+
+@benchmark('live_results')
+def bench_live_results(size):
+    import plotly
+    from pse_calculator_enbridge import live_results, results_display, shown_results
+    s = SCENARIO
+    scenario = [s['gas'], s['release_type'], s['site'], s['p0'], s['p0_unit'], s['p2'], s['p2_unit'],
+                s['t0'], s['t0_unit'], s['area'], s['area_unit'], s['duration'], s['duration_unit'], s['cd']]
+    previous = shown_results(results_display(*scenario), "Live", "green")
+    # A keystroke-rate edit sequence: each update changes one input
+    edits = [scenario[:3] + [s['p0'] + i % 10] + scenario[4:] for i in range(10)]
+
+    def run():
+        for edit in edits:
+            json.dumps(live_results(edit, previous), cls=plotly.utils.PlotlyJSONEncoder)
+    return run
+
+
+@benchmark('calculate_reverse_area')
+def bench_calculate_reverse_area(size):
+    from pse_calculator_enbridge import calculate_reverse_area
+    s = SCENARIO
+    args = (1, s['gas'], s['release_type'], s['site'], s['p0'], s['p0_unit'], s['p2'], s['p2_unit'],
+            s['t0'], s['t0_unit'], s['duration'], s['duration_unit'], s['cd'])
+
+    def run():
+        # Repeat clicks for one scenario hit the per-scenario solution cache
+        json.dumps(calculate_reverse_area(*args))
+    return run
+
+
+@benchmark('display_calculations_table', sizes=(1_000, 10_000, 100_000), quick_sizes=(1_000,))
+def bench_display_calculations_table(size):
+    import plotly
+    from pse_calculator_enbridge import display_calculations_table
+    records = synthetic_records(size)
+
+    def run():
+        json.dumps(display_calculations_table(records), cls=plotly.utils.PlotlyJSONEncoder)
+    return run
+
+
+@benchmark('compare_calculations', sizes=(100, 1_000), quick_sizes=(100,))
+def bench_compare_calculations(size):
+    import plotly
+    from pse_calculator_enbridge import compare_calculations
+    records = synthetic_records(size)
+
+    def run():
+        json.dumps(compare_calculations(1, records), cls=plotly.utils.PlotlyJSONEncoder)
+    return run
+
+
+# Persistence
+
+@benchmark('save_calculations_to_file', sizes=(100, 1_000, 10_000, 100_000), quick_sizes=(100, 1_000))
+def bench_save_calculations_to_file(size):
+    import calculation_store
+    records = synthetic_records(size)
+    directory = tempfile.mkdtemp(prefix='pse-bench-')
+
+    def run():
+        original = calculation_store.CALCULATIONS_FILE
+        calculation_store.CALCULATIONS_FILE = os.path.join(directory, 'saved_calculations.json')
+        try:
+            calculation_store.save_calculations_to_file(copy.copy(records))
+        finally:
+            calculation_store.CALCULATIONS_FILE = original
+    return run
+
+
+@benchmark('update_calculations_file', sizes=(100, 1_000, 10_000), quick_sizes=(100, 1_000))
+def bench_update_calculations_file(size):
+    import calculation_store
+    records = synthetic_records(size)
+    directory = tempfile.mkdtemp(prefix='pse-bench-')
+    path = os.path.join(directory, 'saved_calculations.json')
+    # One session saving a calculation into a store of `size` entries (the id repeats, so it stays that size)
+    added = [calculation_store.with_results(dict(records[0], id='bench-added'))]
+
+    def run():
+        original = calculation_store.CALCULATIONS_FILE
+        calculation_store.CALCULATIONS_FILE = path
+        try:
+            if not os.path.exists(path):
+                calculation_store.save_calculations_to_file(copy.copy(records))
+            calculation_store.update_calculations_file(added=added)
+        finally:
+            calculation_store.CALCULATIONS_FILE = original
+    return run
+
+
+# Reports
+
+@benchmark('calculation_report')
+def bench_calculation_report(size):
+    from pdf_reports import calculation_report
+    record = synthetic_records(1)[0]
+    return lambda: calculation_report(record)
+
+
+def git_commit():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_checks(pattern=None):
+    """Run the registered result checks; returns the names of those that failed"""
+    failures = []
+    for item in CHECKS:
+        if pattern and pattern not in item['name']:
+            continue
+        try:
+            item['func']()
+        except AssertionError as e:
+            failures.append(item['name'])
+            print(f"{'check ' + item['name']:45s} {'FAIL':>12s}\n{e}")
+        else:
+            print(f"{'check ' + item['name']:45s} {'ok':>12s}")
+    return failures
+
+
+def run_suite(pattern=None, quick=False, repeat=5):
+    """Run the registered benchmarks; returns a history entry"""
+    results = {}
+    for bench in BENCHMARKS:
+        for size in (bench['quick_sizes'] if quick else bench['sizes']):
+            key = bench['name'] if size is None else f"{bench['name']}[{size}]"
+            if pattern and pattern not in key:
+                continue
+            func = bench['func'](size)
+            samples = time_call(func, repeat=2 if quick else repeat)
+            results[key] = {
+                'median_s': statistics.median(samples),
+                'min_s': min(samples),
+                'samples': len(samples),
+            }
+            print(f"{key:45s} {format_seconds(results[key]['median_s']):>12s}")
+    return {
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'quick': quick,
+        'results': results,
+    }
+
+
+def format_seconds(seconds):
+    """Human-readable duration"""
+    for unit, factor in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def load_history(path):
+    """Previous runs, oldest first"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare_runs(previous, current, threshold):
+    """Print a comparison table; returns the names of regressed benchmarks"""
+    regressions = []
+    print(f"\nComparison against {previous.get('commit')} ({previous['timestamp']}):")
+    for key, result in current['results'].items():
+        before = previous['results'].get(key)
+        if before is None:
+            print(f"{key:45s} {'new':>12s}")
+            continue
+        change = result['median_s'] / before['median_s'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        print(f"{key:45s} {change:+11.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', dest='pattern', help="only run benchmarks whose name contains this text")
+    parser.add_argument('--quick', action='store_true', help="smaller sizes and fewer repeats")
+    parser.add_argument('--repeat', type=int, default=5, help="timing samples per benchmark")
+    parser.add_argument('--compare', action='store_true', help="flag regressions against the previous run")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    parser.add_argument('--history', default=HISTORY_FILE, help="history file (default benchmark_history.json)")
+    parser.add_argument('--no-save', action='store_true', help="do not append this run to the history")
+    parser.add_argument('--check', action='store_true', help="only check results, do not time anything")
+    args = parser.parse_args(argv)
+
+    failures = run_checks(args.pattern)
+    if failures:
+        print(f"\n{len(failures)} check(s) failed: {', '.join(failures)}")
+        return 1
+    if args.check:
+        return 0
+
+    history = load_history(args.history)
+    current = run_suite(args.pattern, quick=args.quick, repeat=args.repeat)
+
+    regressions = []
+    if args.compare:
+        # Compare with the latest run made in the same mode
+        previous = next((run for run in reversed(history) if run.get('quick') == current['quick']), None)
+        if previous is None:
+            print("\nNo previous run to compare against")
+        else:
+            regressions = compare_runs(previous, current, args.threshold)
+
+    if not args.no_save:
+        history.append(current)
+        with open(args.history, 'w') as f:
+            json.dump(history, f, indent=2)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Startup-time profiling for the PSE calculator.
+
+Set PSE_PROFILE_STARTUP=1 to log how long each startup phase of the app module
+takes (imports, app creation, layout construction). Run this module directly to
+profile a cold import of the app with `python -X importtime`:
+
+    python startup_profile.py [--top 25] [--module pse_calculator_enbridge]
+"""
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger('pse.startup')
+
+_start = time.perf_counter()
+_last = _start
+timings = []
+
+
+def profiling_enabled():
+    """Phase timings are recorded when PSE_PROFILE_STARTUP is set"""
+    return os.environ.get('PSE_PROFILE_STARTUP', '').lower() in ('1', 'true', 'on')
+
+
+def mark(label):
+    """Record the time since the previous mark as the phase `label`"""
+    global _last
+    now = time.perf_counter()
+    elapsed = now - _last
+    _last = now
+    timings.append((label, elapsed))
+    if profiling_enabled():
+        logger.warning(f"startup phase {label}: {elapsed * 1000:.1f} ms")
+
+
+@contextmanager
+def profile_phase(label):
+    """Time a block that may run after import, such as deferred layout construction"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings.append((label, elapsed))
+        if profiling_enabled():
+            logger.warning(f"startup phase {label}: {elapsed * 1000:.1f} ms")
+
+
+def importtime_report(module, top=25):
+    """Cumulative import times (µs) of the slowest modules in a cold import"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        # Lines look like "import time:   self_us | cumulative_us | module"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile a cold import of the app")
+    parser.add_argument('--module', default='pse_calculator_enbridge')
+    parser.add_argument('--top', type=int, default=25)
+    args = parser.parse_args()
+
+    print(f"{'cumulative ms':>14s} {'self ms':>9s}  module")
+    for cumulative_us, self_us, name in importtime_report(args.module, args.top):
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
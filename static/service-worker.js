@@ -0,0 +1,150 @@
+/*
+ * Service worker for the PSE calculator (served at /service-worker.js).
+ *
+ * The upper-case placeholders below are filled in by offline_support.py.
+ *
+ * - install: pre-caches the app shell. That is the index page, every script and
+ *   stylesheet it links, the layout and callback graph, the manifest and the
+ *   pre-rendered equations.
+ * - fingerprinted files (?m= assets, versioned bundles, /equations/, /offline/) are
+ *   served cache-first; they never change under the same URL.
+ * - the page, layout and Information tab callback are fetched network-first,
+ *   falling back to the cached copy when offline or slow.
+ */
+
+const CACHE_VERSION = '__CACHE_VERSION__';
+const CACHE_NAME = 'pse-calculator-' + CACHE_VERSION;
+const PRECACHE_URLS = __PRECACHE_URLS__;
+
+// Callback outputs whose responses depend only on their inputs and can be replayed offline
+const OFFLINE_CALLBACK_OUTPUTS = __OFFLINE_CALLBACK_OUTPUTS__;
+
+// Precached responses (by output id) used when such a callback has never been cached
+const OFFLINE_FALLBACKS = __OFFLINE_FALLBACKS__;
+
+// How long to wait for the network before answering from the cache
+const NETWORK_TIMEOUT_MS = 4000;
+
+function isImmutable(url) {
+    return url.pathname.startsWith('/_dash-component-suites/') ||
+        url.pathname.startsWith('/equations/') ||
+        url.pathname.startsWith('/offline/') ||
+        (url.pathname.startsWith('/assets/') && url.searchParams.has('m'));
+}
+
+function isShell(url) {
+    return url.pathname === '/' ||
+        url.pathname === '/_dash-layout' ||
+        url.pathname === '/_dash-dependencies' ||
+        url.pathname.startsWith('/assets/');
+}
+
+async function precache() {
+    const cache = await caches.open(CACHE_NAME);
+    const index = await fetch('/', {cache: 'no-cache'});
+    const html = await index.clone().text();
+    await cache.put('/', index);
+    // Scripts and stylesheets linked by the index page, as Dash generated them
+    const linked = [...html.matchAll(/(?:src|href)="(\/[^"]+)"/g)].map(match => match[1].replace(/&amp;/g, '&'));
+    const urls = [...new Set([...PRECACHE_URLS, ...linked])];
+    await Promise.all(urls.map(url => cache.add(url).catch(() => null)));
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(
+                keys.filter(key => key.startsWith('pse-calculator-') && key !== CACHE_NAME)
+                    .map(key => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+function withTimeout(promise, ms) {
+    return new Promise((resolve, reject) => {
+        const timer = setTimeout(() => reject(new Error('timeout')), ms);
+        promise.then(
+            value => { clearTimeout(timer); resolve(value); },
+            error => { clearTimeout(timer); reject(error); }
+        );
+    });
+}
+
+async function cacheFirst(request) {
+    const cached = await caches.match(request);
+    if (cached) {
+        return cached;
+    }
+    const response = await fetch(request);
+    if (response.ok) {
+        const cache = await caches.open(CACHE_NAME);
+        cache.put(request, response.clone());
+    }
+    return response;
+}
+
+async function networkFirst(request, cacheKey, fallbackKey) {
+    const cache = await caches.open(CACHE_NAME);
+    const network = fetch(request).then(response => {
+        if (response.ok) {
+            cache.put(cacheKey, response.clone());
+        }
+        return response;
+    });
+    try {
+        return await withTimeout(network, NETWORK_TIMEOUT_MS);
+    } catch (error) {
+        const cached = await cache.match(cacheKey) || (fallbackKey && await cache.match(fallbackKey));
+        if (cached) {
+            return cached;
+        }
+        // Slow but not failed: keep waiting for the network
+        return network;
+    }
+}
+
+async function handleCallback(request) {
+    const body = await request.clone().text();
+    let output;
+    try {
+        output = JSON.parse(body).output || '';
+    } catch (error) {
+        return fetch(request);
+    }
+    const id = OFFLINE_CALLBACK_OUTPUTS.find(id => output.includes('.' + id + '.'));
+    if (!id) {
+        return fetch(request);
+    }
+    // The Cache API only stores GET requests, so key callbacks by a hash of their body
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(body));
+    const hex = [...new Uint8Array(digest)].map(b => b.toString(16).padStart(2, '0')).join('');
+    const cacheKey = new Request('/_dash-update-component?offline=' + hex);
+    return networkFirst(request, cacheKey, OFFLINE_FALLBACKS[id]);
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) {
+        return;
+    }
+    if (request.method === 'POST' && url.pathname === '/_dash-update-component') {
+        event.respondWith(handleCallback(request));
+        return;
+    }
+    if (request.method !== 'GET') {
+        return;
+    }
+    if (isImmutable(url)) {
+        event.respondWith(cacheFirst(request));
+    } else if (request.mode === 'navigate') {
+        event.respondWith(networkFirst(request, '/'));
+    } else if (isShell(url)) {
+        event.respondWith(networkFirst(request, request));
+    }
+});
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Release tier classification driven by the threshold table in tier_thresholds.json.
+
+Thresholds are set per site, release type and service fluid class (each gas
+in pse_engine.gas_data names its class). Each tier lists one or more criteria
+(standard m³, MSCF, kg); a release reaches a tier when it meets any of them.
+The same table serves forward classification (release -> tier and the
+criterion that triggered it), the inverse problem (tier -> release needed to
+reach it) and the Information tab, so all three always agree.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+TIER_THRESHOLDS_FILE = os.environ.get(
+    'PSE_TIER_THRESHOLDS',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tier_thresholds.json')
+)
+
+# Tier number -> display label and badge colour; 0 means not classified
+TIER_LABELS = {0: "N/A", 1: "Tier 1", 2: "Tier 2", 3: "Tier 3"}
+TIER_COLORS = {0: "gray", 1: "red", 2: "grape", 3: "green"}
+
+# Threshold criteria by unit: the per-hour flow field of convert_flow_all_units
+# it is measured on, and the factor from that field to units per hour
+TIER_CRITERIA = {
+    'm³': {'field': 'flow_stm3', 'per_hour': 1.0},
+    'MSCF': {'field': 'flow_mscf', 'per_hour': 1.0},
+    'kg': {'field': 'flow_kgs', 'per_hour': 3600.0},
+}
+CRITERIA_UNITS = list(TIER_CRITERIA)
+
+# Service fluid classes, in table order, with their display labels. A class with
+# no entry in tier_thresholds.json is not classified (tier 0, "N/A").
+FLUID_CLASSES = {'flammable': "Flammable Gases", 'non_flammable': "Non-Flammable Gases",
+                 'oxidizer': "Oxidizing Gases"}
+# Class of entries written without a class level (the original flammable-only table)
+DEFAULT_FLUID_CLASS = 'flammable'
+
+# Margin used when solving for the release that just reaches a tier
+TARGET_MARGIN = 1.0001
+
+
+def _entry_thresholds(entry):
+    """Tier -> {unit: threshold}; accepts the older single-unit form ("unit": "MSCF")"""
+    thresholds = {}
+    for tier, value in entry['thresholds'].items():
+        criteria = value if isinstance(value, dict) else {entry['unit']: value}
+        for unit in criteria:
+            if unit not in TIER_CRITERIA:
+                raise ValueError(f"Unknown threshold unit {unit!r}; expected one of {', '.join(CRITERIA_UNITS)}")
+        thresholds[int(tier)] = {unit: float(criteria[unit]) for unit in CRITERIA_UNITS if unit in criteria}
+    return thresholds
+
+
+def _build_entry(entry, name):
+    """Threshold table entry with its tier x criterion matrix"""
+    thresholds = _entry_thresholds(entry)
+    # Rows from the most severe tier (Tier 1); NaN where a tier has no such criterion
+    tiers = sorted(thresholds)
+    units = [unit for unit in CRITERIA_UNITS if any(unit in thresholds[tier] for tier in tiers)]
+    matrix = np.array([[thresholds[tier].get(unit, np.nan) for unit in units] for tier in tiers], dtype=float)
+    for column, unit in enumerate(units):
+        edges = matrix[:, column][~np.isnan(matrix[:, column])]
+        if np.any(np.diff(edges) >= 0):
+            raise ValueError(f"{unit} thresholds for {name} must decrease from Tier 1")
+    return {
+        'window_seconds': entry.get('window_seconds'),
+        'thresholds': thresholds,
+        'units': units,
+        'matrix': matrix,
+        'tier_numbers': np.array(tiers, dtype=np.int8),
+        # Tier of a release that meets no threshold
+        'base_tier': tiers[-1] + 1,
+        # Column of each criterion in CRITERIA_UNITS order
+        'criterion_codes': np.array([CRITERIA_UNITS.index(unit) for unit in units], dtype=np.int8),
+    }
+
+
+@lru_cache(maxsize=None)
+def load_tier_thresholds(path=TIER_THRESHOLDS_FILE):
+    """Load the threshold table and build a tier x criterion matrix for each entry.
+
+    Keys are (site, release_type, fluid_class).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+
+    table = {}
+    for site, release_types in raw.items():
+        if site.startswith('_'):
+            continue
+        for release_type, classes in release_types.items():
+            # An entry without a class level applies to the default class
+            if 'thresholds' in classes:
+                classes = {DEFAULT_FLUID_CLASS: classes}
+            for fluid_class, entry in classes.items():
+                if fluid_class not in FLUID_CLASSES:
+                    raise ValueError(f"Unknown fluid class {fluid_class!r} for {site} ({release_type})")
+                table[(site, release_type, fluid_class)] = _build_entry(
+                    entry, f"{site} ({release_type}, {FLUID_CLASSES[fluid_class]})")
+    return table
+
+
+def tier_sites():
+    """Sites that have a threshold table, in config order"""
+    return list(dict.fromkeys(site for site, _, _ in load_tier_thresholds()))
+
+
+def tier_release_types():
+    """Release types that have a threshold table, in config order"""
+    return list(dict.fromkeys(release_type for _, release_type, _ in load_tier_thresholds()))
+
+
+def tier_fluid_classes():
+    """Fluid classes that have a threshold table, in FLUID_CLASSES order"""
+    configured = {fluid_class for _, _, fluid_class in load_tier_thresholds()}
+    return [fluid_class for fluid_class in FLUID_CLASSES if fluid_class in configured]
+
+
+def get_tier_entry(site, release_type, fluid_class=DEFAULT_FLUID_CLASS):
+    """Threshold table entry for a site, release type and fluid class, or None if not configured"""
+    return load_tier_thresholds().get((site, release_type, fluid_class))
+
+
+def counted_hours(duration_seconds, window_seconds):
+    """Hours of release counted toward the threshold"""
+    duration_seconds = np.asarray(duration_seconds, dtype=float)
+    if window_seconds is not None:
+        duration_seconds = np.minimum(duration_seconds, window_seconds)
+    return duration_seconds / 3600
+
+
+def format_threshold(value, unit):
+    """Threshold as shown in the tables, e.g. '≥ 8,500 m³'"""
+    return f"≥ {value:,g} {unit}"
+
+
+def _classify_group(entry, flows, duration_seconds):
+    """Classify rows that all share one threshold table entry; returns (tiers, criterion codes)"""
+    hours = counted_hours(duration_seconds, entry['window_seconds'])
+    # Released amount per criterion, one column per unit of the entry
+    release = np.column_stack([
+        np.asarray(flows[TIER_CRITERIA[unit]['field']], dtype=float) * TIER_CRITERIA[unit]['per_hour'] * hours
+        for unit in entry['units']
+    ])
+    # rows x tiers x criteria; NaN thresholds never compare as met
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = release[:, None, :] / entry['matrix'][None, :, :]
+    met = ratio >= 1
+    tier_met = met.any(axis=2)
+    reached = tier_met.any(axis=1)
+    # Most severe tier with any criterion met, then the criterion exceeded most there
+    first = tier_met.argmax(axis=1)
+    rows = np.arange(release.shape[0])
+    trigger = np.where(met[rows, first], ratio[rows, first], -np.inf).argmax(axis=1)
+    tiers = np.where(reached, entry['tier_numbers'][first], entry['base_tier']).astype(np.int8)
+    criteria = np.where(reached, entry['criterion_codes'][trigger], -1).astype(np.int8)
+    return tiers, criteria
+
+
+def classify_tiers(flows, duration_seconds, site, release_type, fluid_class=DEFAULT_FLUID_CLASS):
+    """Vectorized tier classification against every criterion of the threshold table.
+
+    flows maps the per-hour flow fields of convert_flow_all_units (flow_stm3,
+    flow_mscf, flow_kgs) to scalars or arrays; site, release_type and
+    fluid_class are strings or arrays of strings. Rows are grouped by
+    (site, release_type, fluid_class), so a mixed-gas batch applies each
+    threshold table in a single pass. Returns int arrays of tier numbers (0
+    where no threshold table is configured) and of the triggering criterion as
+    an index into CRITERIA_UNITS (-1 where no threshold was met).
+    """
+    flows = {field: np.atleast_1d(np.asarray(flows[field], dtype=float))
+             for field in {criterion['field'] for criterion in TIER_CRITERIA.values()}}
+    n = max(values.shape[0] for values in flows.values())
+    flows = {field: np.broadcast_to(values, (n,)) for field, values in flows.items()}
+    duration_seconds = np.broadcast_to(np.asarray(duration_seconds, dtype=float), (n,))
+    keys = (site, release_type, fluid_class)
+
+    tiers = np.zeros(n, dtype=np.int8)
+    criteria = np.full(n, -1, dtype=np.int8)
+    if all(np.ndim(key) == 0 for key in keys):
+        entry = get_tier_entry(*keys)
+        if entry is not None:
+            tiers[:], criteria[:] = _classify_group(entry, flows, duration_seconds)
+        return tiers, criteria
+
+    # Factorize each key column, then combine the integer codes into one group key
+    columns = [np.broadcast_to(np.asarray(key, dtype=str), (n,)) for key in keys]
+    group_codes = np.zeros(n, dtype=np.intp)
+    for column in columns:
+        names, codes = np.unique(column, return_inverse=True)
+        group_codes = group_codes * len(names) + codes
+    for code in np.unique(group_codes):
+        mask = group_codes == code
+        # Every row of a group has the same key; read it from the first
+        row = mask.argmax()
+        entry = get_tier_entry(*(str(column[row]) for column in columns))
+        if entry is None:
+            continue
+        group_flows = {field: values[mask] for field, values in flows.items()}
+        tiers[mask], criteria[mask] = _classify_group(entry, group_flows, duration_seconds[mask])
+    return tiers, criteria
+
+
+def criterion_label(site, release_type, tier, criterion, fluid_class=DEFAULT_FLUID_CLASS):
+    """Threshold that triggered a tier, e.g. '≥ 25 kg'; None when no threshold was met"""
+    entry = get_tier_entry(site, release_type, fluid_class)
+    if entry is None or criterion is None or criterion < 0:
+        return None
+    unit = CRITERIA_UNITS[criterion]
+    return format_threshold(entry['thresholds'][int(tier)][unit], unit)
+
+
+def classify_tier(flows, duration_seconds, site, release_type, fluid_class=DEFAULT_FLUID_CLASS):
+    """Classify a single release; returns (label, badge colour, triggering threshold or None)"""
+    tiers, criteria = classify_tiers(flows, duration_seconds, site, release_type, fluid_class)
+    tier = int(tiers[0])
+    trigger = criterion_label(site, release_type, tier, int(criteria[0]), fluid_class)
+    return TIER_LABELS[tier], TIER_COLORS[tier], trigger
+
+
+def target_flows(target_tier, site, release_type, duration_seconds, fluid_class=DEFAULT_FLUID_CLASS):
+    """Flow that just reaches the target tier through each of its criteria.
+
+    Returns ({flow field: rate in that field's unit}, error); error is a message
+    when no threshold applies. The caller takes the smallest as the target.
+    """
+    entry = get_tier_entry(site, release_type, fluid_class)
+    name = f"{site} ({release_type}, {FLUID_CLASSES.get(fluid_class, fluid_class)})"
+    if entry is None:
+        return None, f"Tier calculation not configured for {name}"
+    thresholds = entry['thresholds'].get(int(target_tier))
+    if not thresholds:
+        return None, f"Tier {target_tier} has no threshold for {name}"
+    hours = counted_hours(duration_seconds, entry['window_seconds'])
+    return {
+        TIER_CRITERIA[unit]['field']: threshold * TARGET_MARGIN / (hours * TIER_CRITERIA[unit]['per_hour'])
+        for unit, threshold in thresholds.items()
+    }, None
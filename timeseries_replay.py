@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Release estimation from recorded pressure data (SCADA logs).
+
+A CSV of samples (time, upstream pressure and optionally temperature) is read
+in chunks; the orifice mass flow is computed per sample, choked or subsonic as
+each sample's pressure ratio dictates, and integrated over time with the
+trapezoidal or composite Simpson rule (irregular spacing allowed). Memory is
+bounded by the chunk size and the tier window, so logs with millions of
+samples stream through. The tier is classified from the integrated release;
+for thresholds counted over a window (e.g. any one hour) the largest release
+in any such window is used.
+
+    time,pressure[,temperature]
+    0,850
+    1,848.5
+    ...
+
+Time is in seconds (or --time-unit) from any origin, or ISO timestamps.
+
+    POST /replay?gas=Natural Gas&site=GTM US&release_type=Outdoor&area=10&area_unit=mm²
+         &pressure_unit=psi(g)&method=simpson      (CSV as the request body or a 'file' upload)
+
+Run as a script:
+    python timeseries_replay.py log.csv --gas "Natural Gas" --site "GTM US" --area 10 --area-unit mm²
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from pse_engine import convert_flow_all_units, gas_data, gas_table, mass_flow_rate_batch
+from tier_classification import classify_tier, get_tier_entry
+from unit_conversions import to_si
+
+INTEGRATION_METHODS = ['trapezoid', 'simpson']
+
+# Samples read per chunk
+CHUNK_ROWS = 200_000
+
+TIME_COLUMN = 'time'
+PRESSURE_COLUMN = 'pressure'
+TEMPERATURE_COLUMN = 'temperature'
+
+
+def _trapezoid(t, m):
+    """Trapezoid areas of each interval"""
+    return 0.5 * (m[1:] + m[:-1]) * np.diff(t)
+
+
+def _simpson_pairs(t, m):
+    """Composite Simpson integral over consecutive interval pairs (irregular spacing).
+
+    Integrates the first 2k intervals of the samples; returns (integral, k).
+    """
+    pairs = (len(t) - 1) // 2
+    if pairs == 0:
+        return 0.0, 0
+    h = np.diff(t[:2 * pairs + 1])
+    h0, h1 = h[0::2], h[1::2]
+    f0, f1, f2 = m[0:2 * pairs:2], m[1:2 * pairs:2], m[2:2 * pairs + 1:2]
+    hs = h0 + h1
+    area = hs / 6 * ((2 - h1 / h0) * f0 + hs * hs / (h0 * h1) * f1 + (2 - h0 / h1) * f2)
+    return float(area.sum()), pairs
+
+
+def _sample_times(column, time_unit, origin):
+    """Sample times in seconds from the first sample; numeric in time_unit or timestamps"""
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(column):
+        seconds = to_si(column.to_numpy(dtype=float), time_unit)
+    else:
+        stamps = pd.to_datetime(column, utc=True)
+        seconds = (stamps - pd.Timestamp(0, tz='UTC')).dt.total_seconds().to_numpy()
+    if origin is None:
+        origin = seconds[0]
+    return seconds - origin, origin
+
+
+class ReleaseIntegrator:
+    """Streaming integral of orifice mass flow over pressure samples"""
+
+    def __init__(self, gas, area, area_unit, cd, p2=0, p2_unit='psi(g)', t0=20, t0_unit='°C',
+                 pressure_unit='psi(g)', temperature_unit='°C', time_unit='sec', method='trapezoid',
+                 window_seconds=None):
+        if gas not in gas_data:
+            raise ValueError(f"Unknown gas: {gas}")
+        if method not in INTEGRATION_METHODS:
+            raise ValueError(f"Unknown integration method {method!r}; expected one of {', '.join(INTEGRATION_METHODS)}")
+        table = gas_table()
+        i = table['index'][gas]
+        self.gamma, self.R = table['gamma'][i], table['R'][i]
+        self.area = to_si(float(area), area_unit)
+        self.cd = float(cd)
+        self.P2 = to_si(float(p2), p2_unit)
+        self.T0 = to_si(float(t0), t0_unit)
+        self.units = {'pressure': pressure_unit, 'temperature': temperature_unit, 'time': time_unit}
+        self.method = method
+        self.window = window_seconds
+
+        self.origin = None
+        self.samples = 0
+        self.choked = 0
+        self.no_flow = 0
+        self.total_kg = 0.0
+        self.peak_kgs = 0.0
+        # Last sample so far, which starts the first interval of the next chunk
+        self.last_t = np.empty(0)
+        self.last_m = np.empty(0)
+        # Samples not yet integrated by Simpson's rule (one or two)
+        self.pending_t = np.empty(0)
+        self.pending_m = np.empty(0)
+        # Trapezoid cumulative release at the samples of the last window, for the window maximum
+        self.cumulative = 0.0
+        self.tail_t = np.empty(0)
+        self.tail_c = np.empty(0)
+        self.window_kg = 0.0
+
+    def mass_flow(self, P0, T0):
+        """Mass flow (kg/s) per sample; zero where the pressure does not exceed downstream"""
+        mdot = mass_flow_rate_batch(self.cd, self.area, P0, self.P2, T0, self.gamma, self.R)
+        return np.where(P0 > self.P2, np.nan_to_num(mdot), 0.0)
+
+    def add(self, frame):
+        """Integrate one chunk of samples (a DataFrame with time and pressure columns)"""
+        t, self.origin = _sample_times(frame[TIME_COLUMN], self.units['time'], self.origin)
+        P0 = to_si(frame[PRESSURE_COLUMN].to_numpy(dtype=float), self.units['pressure'])
+        if TEMPERATURE_COLUMN in frame:
+            T0 = to_si(frame[TEMPERATURE_COLUMN].to_numpy(dtype=float), self.units['temperature'])
+        else:
+            T0 = self.T0
+        if not (np.isfinite(t).all() and np.isfinite(P0).all() and np.isfinite(T0).all()):
+            raise ValueError(f"Non-numeric or missing values in samples {self.samples + 1}-{self.samples + len(t)}")
+        m = self.mass_flow(P0, T0)
+
+        # Intervals span chunk edges: start from the last sample of the previous chunk
+        tt = np.concatenate([self.last_t, t])
+        mm = np.concatenate([self.last_m, m])
+        if np.any(np.diff(tt) <= 0):
+            raise ValueError("Sample times must strictly increase")
+
+        sonic_ratio = (2 / (self.gamma + 1)) ** (self.gamma / (self.gamma - 1))
+        flowing = P0 > self.P2
+        self.choked += int(np.count_nonzero(flowing & (self.P2 / P0 <= sonic_ratio)))
+        self.no_flow += int(np.count_nonzero(~flowing))
+        self.samples += len(P0)
+        self.peak_kgs = max(self.peak_kgs, float(m.max(initial=0.0)))
+
+        trapezoids = _trapezoid(tt, mm)
+        if self.method == 'simpson':
+            ts = np.concatenate([self.pending_t, t])
+            ms = np.concatenate([self.pending_m, m])
+            area, pairs = _simpson_pairs(ts, ms)
+            self.total_kg += area
+            self.pending_t, self.pending_m = ts[2 * pairs:], ms[2 * pairs:]
+        else:
+            self.total_kg += float(trapezoids.sum())
+        self._track_window(tt, trapezoids)
+        self.last_t, self.last_m = tt[-1:], mm[-1:]
+
+    def _track_window(self, t, trapezoids):
+        """Update the largest release over any window, from the trapezoid cumulative release"""
+        if self.window is None or len(trapezoids) == 0:
+            return
+        # t[0] is the carried sample whose cumulative value is already in the tail
+        c = self.cumulative + np.cumsum(trapezoids)
+        self.cumulative = float(c[-1])
+        times = np.concatenate([self.tail_t, t[1:]]) if len(self.tail_t) else t
+        cumulative = np.concatenate([self.tail_c, c]) if len(self.tail_c) else np.concatenate([[0.0], c])
+        # Cumulative release at each window start (zero before the first sample)
+        starts = np.interp(t[1:] - self.window, times, cumulative, left=0.0)
+        self.window_kg = max(self.window_kg, float((c - starts).max()))
+        # Keep the samples a later window can still start in
+        first = max(np.searchsorted(times, times[-1] - self.window, side='right') - 1, 0)
+        self.tail_t, self.tail_c = times[first:], cumulative[first:]
+
+    def finish(self):
+        """Integrate what remains; returns (total kg, duration seconds, window kg or None)"""
+        if self.method == 'simpson' and len(self.pending_t) > 1:
+            # A final odd interval is integrated with the trapezoid rule
+            self.total_kg += float(_trapezoid(self.pending_t, self.pending_m).sum())
+            self.pending_t, self.pending_m = self.pending_t[-1:], self.pending_m[-1:]
+        # Times count from the first sample
+        duration = float(self.last_t[-1]) if len(self.last_t) else 0.0
+        if self.window is None or duration <= self.window:
+            return self.total_kg, duration, None
+        return self.total_kg, duration, self.window_kg
+
+
+def read_samples(source, chunksize=CHUNK_ROWS):
+    """Chunks of time/pressure(/temperature) samples from a CSV path or file object"""
+    import pandas as pd
+
+    header = None
+
+    def usecols(name):
+        return name.strip().lower() in (TIME_COLUMN, PRESSURE_COLUMN, TEMPERATURE_COLUMN)
+
+    for chunk in pd.read_csv(source, chunksize=chunksize, usecols=usecols, skipinitialspace=True):
+        if header is None:
+            header = {column: column.strip().lower() for column in chunk.columns}
+            missing = {TIME_COLUMN, PRESSURE_COLUMN} - set(header.values())
+            if missing:
+                raise ValueError(f"CSV is missing the {', '.join(sorted(missing))} column(s)")
+        yield chunk.rename(columns=header)
+
+
+def replay_release(source, gas, release_type, site, area, area_unit, cd=0.61, method='trapezoid',
+                   chunksize=CHUNK_ROWS, **units):
+    """Integrated release and tier of a recorded pressure series.
+
+    units are the ReleaseIntegrator keywords (p2, p2_unit, t0, t0_unit,
+    pressure_unit, temperature_unit, time_unit). Raises ValueError on bad input.
+    """
+    fluid_class = gas_data.get(gas, {}).get('fluid_class')
+    entry = get_tier_entry(site, release_type, fluid_class)
+    integrator = ReleaseIntegrator(gas, area, area_unit, cd, method=method,
+                                   window_seconds=entry['window_seconds'] if entry else None, **units)
+    for chunk in read_samples(source, chunksize):
+        integrator.add(chunk)
+    if integrator.samples < 2:
+        raise ValueError("At least two samples are needed")
+    total_kg, duration, window_kg = integrator.finish()
+
+    # Totals are linear in the flow, so the mean flow over the record reproduces them
+    outputs = convert_flow_all_units(total_kg / duration, gas, duration)
+    # Tier on the counted release: the whole record, or the worst window when it is longer
+    basis_seconds = duration if window_kg is None else entry['window_seconds']
+    basis_kg = total_kg if window_kg is None else window_kg
+    release_tier, tier_color, tier_trigger = classify_tier(
+        convert_flow_all_units(basis_kg / basis_seconds, gas, basis_seconds), basis_seconds,
+        site, release_type, fluid_class)
+
+    result = {
+        'samples': integrator.samples,
+        'duration_seconds': duration,
+        'method': method,
+        'choked_samples': integrator.choked,
+        'subsonic_samples': integrator.samples - integrator.choked - integrator.no_flow,
+        'no_flow_samples': integrator.no_flow,
+        'peak_flow_kgs': integrator.peak_kgs,
+        'mean_flow_kgs': total_kg / duration,
+        'tier_basis_seconds': basis_seconds,
+        'tier_basis_kg': basis_kg,
+        'release_tier': release_tier,
+        'tier_color': tier_color,
+        'tier_trigger': tier_trigger,
+    }
+    for field in ('total_kg', 'total_lb', 'total_mscf', 'total_stm3'):
+        result[field] = float(outputs[field])
+    return result
+
+
+REPLAY_FIELDS = ['gas', 'release_type', 'site', 'area', 'area_unit']
+REPLAY_OPTIONS = ['cd', 'method', 'p2', 'p2_unit', 't0', 't0_unit', 'pressure_unit', 'temperature_unit', 'time_unit']
+
+
+def register_replay_routes(server):
+    """Serve POST /replay from the Flask server; the CSV body is streamed, not buffered"""
+    import flask
+
+    @server.route('/replay', methods=['POST'])
+    def replay():
+        args = flask.request.args
+        missing = [field for field in REPLAY_FIELDS if not args.get(field)]
+        if missing:
+            flask.abort(400, f"Missing parameters: {', '.join(missing)}")
+        upload = flask.request.files.get('file')
+        source = upload.stream if upload else flask.request.stream
+        options = {key: args[key] for key in REPLAY_OPTIONS if args.get(key)}
+        try:
+            result = replay_release(source, *(args[field] for field in REPLAY_FIELDS), **options)
+        except (ValueError, KeyError) as e:
+            # pandas' ParserError and EmptyDataError are ValueErrors
+            flask.abort(400, f"Replay failed: {e}")
+        response = flask.jsonify(result)
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Release totals and tier from a recorded pressure series")
+    parser.add_argument('csv', help="CSV with time, pressure and optional temperature columns")
+    parser.add_argument('--gas', default='Natural Gas', choices=sorted(gas_data))
+    parser.add_argument('--release-type', default='Outdoor')
+    parser.add_argument('--site', default='GTM US')
+    parser.add_argument('--area', type=float, required=True)
+    parser.add_argument('--area-unit', default='mm²')
+    parser.add_argument('--cd', type=float, default=0.61)
+    parser.add_argument('--method', choices=INTEGRATION_METHODS, default='trapezoid')
+    parser.add_argument('--pressure-unit', default='psi(g)')
+    parser.add_argument('--temperature-unit', default='°C')
+    parser.add_argument('--t0', type=float, default=20, help="temperature when the CSV has none")
+    parser.add_argument('--p2', type=float, default=0)
+    parser.add_argument('--p2-unit', default='psi(g)')
+    parser.add_argument('--time-unit', default='sec')
+    args = parser.parse_args()
+
+    try:
+        result = replay_release(
+            args.csv, args.gas, args.release_type, args.site, args.area, args.area_unit, args.cd, args.method,
+            p2=args.p2, p2_unit=args.p2_unit, t0=args.t0, t0_unit=args.temperature_unit,
+            pressure_unit=args.pressure_unit, temperature_unit=args.temperature_unit, time_unit=args.time_unit)
+    except (ValueError, KeyError) as e:
+        print(f"Error replaying {args.csv}: {e}")
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Unit conversion engine for the PSE calculator.
+
+Every unit is described by an affine map to the SI base unit of its dimension:
+    si_value = value * scale + offset
+Linear units (area, time, length, mass) have a zero offset. Temperatures and gauge
+pressures are affine; gauge pressures convert straight to absolute pascals.
+All converters accept Python scalars or NumPy arrays. CONVERSION_MATRIX holds
+the unit-to-unit factors of each dimension, precomputed at import, so a value
+is expressed in every unit of its dimension with one row (convert_to_all).
+"""
+
+import numpy as np
+
+ATM_PRESSURE = 101325  # Pa (standard atmospheric pressure)
+
+LB_PER_KG = 2.20462
+FT3_PER_M3 = 35.3147
+MM_PER_INCH = 25.4
+
+# (scale, offset) to SI for each unit, grouped by dimension
+UNITS = {
+    'pressure': {
+        'bar(g)': (1e5, ATM_PRESSURE),       # to Pa abs
+        'psi(g)': (6894.76, ATM_PRESSURE),   # to Pa abs
+        'kPa(g)': (1e3, ATM_PRESSURE),       # to Pa abs
+        'MPa(g)': (1e6, ATM_PRESSURE),       # to Pa abs
+    },
+    'temperature': {
+        '°C': (1.0, 273.15),                 # to K
+        '°F': (5 / 9, 273.15 - 32 * 5 / 9),  # to K
+        'K': (1.0, 0.0),                     # already K
+    },
+    'area': {
+        'mm²': (1e-6, 0.0),                  # to m²
+        'cm²': (1e-4, 0.0),                  # to m²
+        'in²': (6.4516e-4, 0.0),             # to m²
+        'm²': (1.0, 0.0),                    # already m²
+    },
+    'time': {
+        'sec': (1.0, 0.0),                   # to seconds
+        'min': (60.0, 0.0),                  # to seconds
+        'hr': (3600.0, 0.0),                 # to seconds
+    },
+    'length': {
+        'mm': (1e-3, 0.0),                   # to m
+        'inch': (MM_PER_INCH * 1e-3, 0.0),   # to m
+        'm': (1.0, 0.0),                     # already m
+        'ft': (0.3048, 0.0),                 # to m
+        'km': (1e3, 0.0),                    # to m
+    },
+    'mass': {
+        'kg': (1.0, 0.0),                    # already kg
+        'lb': (1 / LB_PER_KG, 0.0),          # to kg
+    },
+}
+
+# Legacy spellings found in saved records and older clients
+UNIT_ALIASES = {
+    'minutes': 'min',
+    'minute': 'min',
+    'seconds': 'sec',
+    's': 'sec',
+    'hours': 'hr',
+    'hour': 'hr',
+    'in': 'inch',
+    'feet': 'ft',
+    'degC': '°C',
+    'degF': '°F',
+}
+
+# Lookup tables built once at import
+UNIT_DIMENSION = {}
+UNIT_INDEX = {}
+SCALES = {}
+OFFSETS = {}
+INVERSE_SCALES = {}
+CONVERSION_MATRIX = {}
+
+for _dimension, _units in UNITS.items():
+    _names = list(_units.keys())
+    _scales = np.array([_units[name][0] for name in _names], dtype=float)
+    _offsets = np.array([_units[name][1] for name in _names], dtype=float)
+    SCALES[_dimension] = _scales
+    OFFSETS[_dimension] = _offsets
+    INVERSE_SCALES[_dimension] = 1.0 / _scales
+    # CONVERSION_MATRIX[dim][i, j] is the factor taking unit i to unit j
+    CONVERSION_MATRIX[_dimension] = _scales[:, None] / _scales[None, :]
+    for _i, _name in enumerate(_names):
+        UNIT_DIMENSION[_name] = _dimension
+        UNIT_INDEX[_name] = _i
+
+
+def normalize_unit(unit):
+    """Return the canonical spelling of a unit, resolving legacy aliases"""
+    unit = UNIT_ALIASES.get(unit, unit)
+    if unit not in UNIT_DIMENSION:
+        raise KeyError(f"Unknown unit: {unit}")
+    return unit
+
+
+def unit_options(dimension):
+    """List the unit names for a dimension, in display order"""
+    return list(UNITS[dimension].keys())
+
+
+def _as_numeric(value):
+    """Turn lists/tuples into float arrays; leave scalars and arrays alone"""
+    if isinstance(value, (list, tuple)):
+        return np.asarray(value, dtype=float)
+    return value
+
+
+def to_si(value, unit):
+    """Convert a value (scalar or array) in the given unit to SI"""
+    unit = normalize_unit(unit)
+    scale, offset = UNITS[UNIT_DIMENSION[unit]][unit]
+    return _as_numeric(value) * scale + offset
+
+
+def from_si(value, unit):
+    """Convert a value (scalar or array) in SI to the given unit"""
+    unit = normalize_unit(unit)
+    dimension = UNIT_DIMENSION[unit]
+    i = UNIT_INDEX[unit]
+    return (_as_numeric(value) - OFFSETS[dimension][i]) * INVERSE_SCALES[dimension][i]
+
+
+def convert_to_all(value, unit):
+    """A scalar in one unit expressed in every unit of its dimension, as {unit: value}"""
+    unit = normalize_unit(unit)
+    dimension = UNIT_DIMENSION[unit]
+    i = UNIT_INDEX[unit]
+    offsets = OFFSETS[dimension]
+    # Row i of the matrix, plus the offset shift for affine units (zero for linear ones)
+    values = float(value) * CONVERSION_MATRIX[dimension][i] + (offsets[i] - offsets) * INVERSE_SCALES[dimension]
+    return dict(zip(UNITS[dimension], values.tolist()))
+
+
+def to_si_many(values, units):
+    """Convert an array of values with a per-element unit array to SI in one pass"""
+    values = np.asarray(values, dtype=float)
+    units = [normalize_unit(u) for u in units]
+    dimension = UNIT_DIMENSION[units[0]] if units else None
+    if any(UNIT_DIMENSION[u] != dimension for u in units):
+        raise ValueError("Mixed dimensions in unit array")
+    if dimension is None:
+        return values
+    index = np.fromiter((UNIT_INDEX[u] for u in units), dtype=np.intp, count=len(units))
+    return values * SCALES[dimension][index] + OFFSETS[dimension][index]
+
+
+def unit_scales(dimension):
+    """Unit name -> factor to SI for a linear dimension (for clientside conversions)"""
+    return {name: scale for name, (scale, offset) in UNITS[dimension].items()}
+
+
+if __name__ == "__main__":
+    # Quick sanity check of the tables
+    for dimension in UNITS:
+        print(dimension, unit_options(dimension))
+    print("100 psi(g) =", to_si(100, 'psi(g)'), "Pa abs")
+    print("68 °F =", convert_to_all(68, '°F'))
+    print("10 minutes =", to_si(10, 'minutes'), "s")